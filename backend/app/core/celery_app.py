@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Queue
 from app.core.config import settings
 from app.core.system_info import autoscale_bounds
 
@@ -14,10 +15,29 @@ celery_app.conf.update(
     result_serializer="json",
     accept_content=["json"],
     task_acks_late=True,
+    # with acks_late alone, a task whose child is killed (OOM, or replaced by
+    # worker_max_memory_per_child) is acked and lost; requeue it so large
+    # ingests resume from their checkpoint
+    task_reject_on_worker_lost=True,
     worker_max_tasks_per_child=100,
+    # KiB; a child that ends a task above this resident size is replaced
+    worker_max_memory_per_child=settings.worker_max_memory_per_child_mb * 1024,
+    # used when the worker runs with --autoscale
+    worker_autoscaler="app.core.system_info:MemoryAwareAutoscaler",
+    # A worker started without -Q consumes both queues; run_stack.py can
+    # start one worker per queue instead.
+    task_default_queue=settings.celery_light_queue,
+    task_queues=(Queue(settings.celery_light_queue), Queue(settings.celery_heavy_queue)),
 )
 
 
+def queue_for(size_bytes: int | None = None, rows: int | None = None) -> str:
+    """Pick the light or heavy queue for a task over ``size_bytes`` / ``rows`` of data."""
+    if (size_bytes or 0) >= settings.celery_heavy_min_bytes or (rows or 0) >= settings.celery_heavy_min_rows:
+        return settings.celery_heavy_queue
+    return settings.celery_light_queue
+
+
 def autoscale_args():
     min_w, max_w = autoscale_bounds()
     return max_w, min_w
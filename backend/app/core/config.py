@@ -34,9 +34,93 @@ class Settings(BaseSettings):
     visualization_bucket: str = Field(
         default="visualizations", alias="MINIO_VISUALIZATION_BUCKET"
     )
+    # tile levels (bins); coarser levels are merged from the finest, which
+    # every other level must divide
+    visualization_lod_levels: list[int] = Field(
+        default=[64, 256, 1024, 4096, 16384, 65536, 262144], alias="VISUALIZATION_LOD_LEVELS"
+    )
+    # x-axis bounds for tiles come from Parquet statistics or ingestion stats;
+    # without either, "scan" reads the data once more for them and "grow"
+    # bins in a single pass, doubling the range as new values appear
+    visualization_bounds_fallback: str = Field(default="scan", alias="VISUALIZATION_BOUNDS_FALLBACK")
+    # threads binning a Parquet file's row groups in parallel
+    # (0 = the CPUs divided by the tasks that can run at once, at least 1)
+    visualization_scan_workers: int = Field(default=0, alias="VISUALIZATION_SCAN_WORKERS")
+    # GET /api/visualizations/{id}/zoom re-bins processed Parquet for any x window
+    visualization_zoom_max_bins: int = Field(default=20_000, alias="VISUALIZATION_ZOOM_MAX_BINS")
     # ---------- Redis / Celery (Option 2 standard stack) ----------
     redis_url: str = Field(default="redis://127.0.0.1:6379/0", alias="REDIS_URL")
     celery_task_prefix: str = Field(default="flightdata", alias="CELERY_TASK_PREFIX")
+    # tasks touching at least this much raw data (or this many rows) go to the
+    # heavy queue so small files never wait behind multi-GB jobs
+    celery_light_queue: str = Field(default="light", alias="CELERY_LIGHT_QUEUE")
+    celery_heavy_queue: str = Field(default="heavy", alias="CELERY_HEAVY_QUEUE")
+    celery_heavy_min_bytes: int = Field(default=256 * 1024 ** 2, alias="CELERY_HEAVY_MIN_BYTES")
+    celery_heavy_min_rows: int = Field(default=5_000_000, alias="CELERY_HEAVY_MIN_ROWS")
+    # per-queue worker settings used by scripts/run_stack.py --queues split
+    celery_light_prefetch: int = Field(default=4, alias="CELERY_LIGHT_PREFETCH")
+    celery_heavy_prefetch: int = Field(default=1, alias="CELERY_HEAVY_PREFETCH")
+    celery_heavy_concurrency: int = Field(default=2, alias="CELERY_HEAVY_CONCURRENCY")
+
+    # ---------- Worker autoscaling (MemoryAwareAutoscaler in app/core/system_info.py) ----------
+    # share of total memory that worker processes may use; the rest is left to the OS
+    autoscale_memory_fraction: float = Field(default=0.8, alias="AUTOSCALE_MEMORY_FRACTION")
+    # estimated task memory: a per-process baseline plus raw bytes x factor, capped
+    autoscale_task_base_mb: int = Field(default=300, alias="AUTOSCALE_TASK_BASE_MB")
+    autoscale_task_bytes_factor: float = Field(default=0.5, alias="AUTOSCALE_TASK_BYTES_FACTOR")
+    autoscale_task_max_mb: int = Field(default=2048, alias="AUTOSCALE_TASK_MAX_MB")
+    # a child process is replaced after a task leaves it above this resident size;
+    # also bounds how many processes the host's memory can hold
+    worker_max_memory_per_child_mb: int = Field(default=2048, alias="WORKER_MAX_MEMORY_PER_CHILD_MB")
+
+    # ---------- Worker memory (chunk sizes for ingestion and tiling) ----------
+    # share of available memory given to in-flight chunks, split across the
+    # tasks that can run at once (0 = the autoscale maximum)
+    task_memory_fraction: float = Field(default=0.5, alias="TASK_MEMORY_FRACTION")
+    task_memory_tasks: int = Field(default=0, alias="TASK_MEMORY_TASKS")
+    # while less than this share of total memory is available, chunks shrink
+    task_memory_low_fraction: float = Field(default=0.1, alias="TASK_MEMORY_LOW_FRACTION")
+    task_chunk_min_rows: int = Field(default=5_000, alias="TASK_CHUNK_MIN_ROWS")
+    task_chunk_max_rows: int = Field(default=1_000_000, alias="TASK_CHUNK_MAX_ROWS")
+
+    # ---------- Ingestion ----------
+    # concurrent raw-object uploads per API process (batch endpoint)
+    ingestion_upload_concurrency: int = Field(default=4, alias="INGESTION_UPLOAD_CONCURRENCY")
+    # presigned multipart uploads (browser -> MinIO): preferred part size and URL lifetime
+    ingestion_multipart_part_bytes: int = Field(default=64 * 1024 ** 2, alias="INGESTION_MULTIPART_PART_BYTES")
+    ingestion_multipart_url_expiry_seconds: int = Field(default=6 * 3600, alias="INGESTION_MULTIPART_URL_EXPIRY_SECONDS")
+    # "arrow" (multithreaded pyarrow.csv) or "pandas" (chunked read_csv)
+    ingestion_csv_engine: str = Field(default="arrow", alias="INGESTION_CSV_ENGINE")
+    # "stream" (openpyxl read-only row groups) or "pandas" (whole-sheet read_excel)
+    ingestion_excel_engine: str = Field(default="stream", alias="INGESTION_EXCEL_ENGINE")
+    # CSVs at least this large are parsed as parallel newline-aligned byte ranges
+    ingestion_parallel_min_bytes: int = Field(default=1024 ** 3, alias="INGESTION_PARALLEL_MIN_BYTES")
+    ingestion_parallel_range_bytes: int = Field(default=64 * 1024 ** 2, alias="INGESTION_PARALLEL_RANGE_BYTES")
+    # 0 = one thread per CPU
+    ingestion_parallel_workers: int = Field(default=0, alias="INGESTION_PARALLEL_WORKERS")
+    # CSVs at least this large (and at least INGESTION_PARALLEL_MIN_BYTES) are
+    # written as checkpointed segments so a redelivered task resumes instead
+    # of starting over
+    ingestion_checkpoint_min_bytes: int = Field(default=1024 ** 3, alias="INGESTION_CHECKPOINT_MIN_BYTES")
+    ingestion_checkpoint_bytes: int = Field(default=256 * 1024 ** 2, alias="INGESTION_CHECKPOINT_BYTES")
+    # Processed Parquet layout (see ParquetLayout in app/tasks/ingestion.py)
+    ingestion_parquet_row_group_rows: int = Field(default=250_000, alias="INGESTION_PARQUET_ROW_GROUP_ROWS")
+    ingestion_parquet_compression: str = Field(default="zstd", alias="INGESTION_PARQUET_COMPRESSION")
+    ingestion_parquet_compression_level: int = Field(default=3, alias="INGESTION_PARQUET_COMPRESSION_LEVEL")
+    # dictionary-encode columns whose distinct/rows ratio in the first row group is at most this
+    ingestion_parquet_dictionary_ratio: float = Field(default=0.1, alias="INGESTION_PARQUET_DICTIONARY_RATIO")
+    ingestion_parquet_page_index: bool = Field(default=True, alias="INGESTION_PARQUET_PAGE_INDEX")
+    # column to sort each row group by ("" = keep file order, "auto" = first numeric column)
+    ingestion_parquet_sort_column: str = Field(default="", alias="INGESTION_PARQUET_SORT_COLUMN")
+    # narrower numeric storage types: "off", "int" (lossless) or "float32";
+    # per dataset type e.g. INGESTION_PRECISION_BY_DATASET_TYPE='{"flight": "float32"}'
+    ingestion_precision: str = Field(default="off", alias="INGESTION_PRECISION")
+    ingestion_precision_by_dataset_type: dict[str, str] = Field(
+        default_factory=dict, alias="INGESTION_PRECISION_BY_DATASET_TYPE"
+    )
+    ingestion_float32_max_rel_error: float = Field(default=1e-6, alias="INGESTION_FLOAT32_MAX_REL_ERROR")
+    # per-job worker lock, renewed while the task runs
+    ingestion_lock_ttl_seconds: int = Field(default=60, alias="INGESTION_LOCK_TTL_SECONDS")
 
     model_config = SettingsConfigDict(
         env_file=".env", extra="allow", populate_by_name=True
@@ -0,0 +1,385 @@
+"""Streaming helpers between MinIO objects and file-like readers/writers.
+
+Celery tasks use these to parse raw uploads straight from ``get_object``
+responses and to upload Parquet output while it is being written, instead of
+staging both on local disk.
+"""
+
+import io
+import math
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from minio.datatypes import Part
+
+UPLOAD_PART_SIZE = 16 * 1024 * 1024
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10_000
+_CHUNK_BYTES = 4 * 1024 * 1024
+_QUEUE_CHUNKS = 8
+_EOF = object()
+
+
+class UploadAborted(Exception):
+    """Raised inside the uploader to make MinIO abort a multipart upload."""
+
+
+@contextmanager
+def open_object(minio, bucket_name: str, object_name: str, offset: int = 0, length: int = 0):
+    """Yield a readable ``get_object`` response and always release its connection."""
+    response = minio.get_object(bucket_name, object_name, offset=offset, length=length)
+    try:
+        yield response
+    finally:
+        try:
+            response.close()
+        except Exception:
+            pass
+        try:
+            response.release_conn()
+        except Exception:
+            pass
+
+
+def object_range_reader(minio, bucket_name: str, object_name: str):
+    """Return ``read_range(offset, length) -> bytes`` backed by ranged GETs."""
+
+    def read_range(offset: int, length: int) -> bytes:
+        with open_object(minio, bucket_name, object_name, offset=offset, length=length) as response:
+            return response.read()
+
+    return read_range
+
+
+class ObjectRangeFile(io.RawIOBase):
+    """Read-only, seekable file over a MinIO object using ranged GETs.
+
+    Lets readers that need random access (e.g. ``pyarrow.parquet`` reading a
+    footer and then selected column chunks) work on an object without
+    downloading it first. ``requests`` and ``bytes_read`` count the GETs.
+    """
+
+    def __init__(self, minio, bucket_name: str, object_name: str, size: int | None = None):
+        super().__init__()
+        self._read_range = object_range_reader(minio, bucket_name, object_name)
+        self.size = size if size is not None else minio.stat_object(bucket_name, object_name).size
+        self._position = 0
+        self.requests = 0
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self._position = max(0, offset)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), self.size - self._position)
+        if length <= 0:
+            return 0
+        data = self._read_range(self._position, length)
+        self.requests += 1
+        self.bytes_read += len(data)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class _QueueReader:
+    # Read side handed to put_object: returns exactly `size` bytes per read
+    # (until EOF) so MinIO assembles each part with a single call.
+    def __init__(self, chunks: queue.Queue):
+        self._chunks = chunks
+        self._pending = b""
+        self._eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        parts = [self._pending]
+        have = len(self._pending)
+        while not self._eof and (size < 0 or have < size):
+            item = self._chunks.get()
+            if item is _EOF:
+                self._eof = True
+                break
+            if isinstance(item, BaseException):
+                raise item
+            parts.append(item)
+            have += len(item)
+        data = b"".join(parts)
+        if size < 0:
+            self._pending = b""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+class ObjectUploadStream:
+    """Writable, non-seekable file object that uploads to MinIO as it is written.
+
+    Bytes are handed through a bounded queue to a background ``put_object``
+    call with ``length=-1``, which uploads ``part_size`` multipart parts as
+    they fill up. Memory is bounded by the queue plus one part, and nothing
+    is staged on local disk. ``close()`` completes the upload; ``abort()``
+    (or leaving a ``with`` block with an exception) cancels it so no partial
+    object becomes visible.
+    """
+
+    def __init__(
+        self,
+        minio,
+        bucket_name: str,
+        object_name: str,
+        content_type: str = "application/octet-stream",
+        part_size: int = UPLOAD_PART_SIZE,
+    ):
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.closed = False
+        self.result = None
+        self._chunks: queue.Queue = queue.Queue(maxsize=_QUEUE_CHUNKS)
+        self._buffer = bytearray()
+        self._position = 0
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._upload,
+            args=(minio, content_type, part_size),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _upload(self, minio, content_type: str, part_size: int):
+        try:
+            self.result = minio.put_object(
+                bucket_name=self.bucket_name,
+                object_name=self.object_name,
+                data=_QueueReader(self._chunks),
+                length=-1,
+                part_size=part_size,
+                content_type=content_type,
+            )
+        except BaseException as exc:  # noqa: BLE001 - surfaced to the writer
+            self._error = exc
+
+    def _put(self, item):
+        while True:
+            if self._error is not None:
+                raise self._error
+            try:
+                self._chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def writable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed upload stream")
+        before = len(self._buffer)
+        self._buffer += data
+        written = len(self._buffer) - before
+        self._position += written
+        if len(self._buffer) >= _CHUNK_BYTES:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return written
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """Finish the upload and re-raise any error from the uploader."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._buffer:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        self._put(_EOF)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def abort(self):
+        """Cancel the upload; safe to call after a failure or after close()."""
+        if not self._thread.is_alive():
+            self.closed = True
+            return
+        self.closed = True
+        self._buffer.clear()
+        try:
+            self._put(UploadAborted(f"upload of {self.object_name} aborted"))
+        except BaseException:  # noqa: BLE001 - uploader already failed
+            pass
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+# ---------- Presigned multipart uploads ----------
+# The SDK has no public multipart API, so the helpers below wrap its
+# underscore methods in one place. Clients PUT each part straight to MinIO
+# with a presigned URL; the API only starts, completes or aborts the upload.
+
+
+def multipart_part_size(size_bytes: int, preferred: int) -> int:
+    """Part size within S3 limits (>= 5 MiB, at most 10,000 parts), in whole MiB."""
+    part_size = max(preferred, MIN_PART_SIZE, math.ceil(size_bytes / MAX_PARTS))
+    mib = 1024 * 1024
+    return math.ceil(part_size / mib) * mib
+
+
+def create_multipart_upload(minio, bucket_name: str, object_name: str, content_type: str | None = None) -> str:
+    return minio._create_multipart_upload(
+        bucket_name, object_name, {"Content-Type": content_type or "application/octet-stream"}
+    )
+
+
+def presign_upload_parts(
+    minio, bucket_name: str, object_name: str, upload_id: str, part_count: int, expires: timedelta
+) -> list[dict]:
+    return [
+        {
+            "part_number": part_number,
+            "url": minio.get_presigned_url(
+                "PUT",
+                bucket_name,
+                object_name,
+                expires=expires,
+                extra_query_params={"uploadId": upload_id, "partNumber": str(part_number)},
+            ),
+        }
+        for part_number in range(1, part_count + 1)
+    ]
+
+
+def list_uploaded_parts(minio, bucket_name: str, object_name: str, upload_id: str) -> list:
+    parts = []
+    marker = None
+    while True:
+        result = minio._list_parts(bucket_name, object_name, upload_id, max_parts=1000, part_number_marker=marker)
+        parts.extend(result.parts)
+        if not result.is_truncated:
+            return parts
+        marker = str(result.next_part_number_marker)
+
+
+def complete_multipart_upload(minio, bucket_name: str, object_name: str, upload_id: str, parts=None) -> int:
+    """Complete an upload from the parts MinIO received; return the object size."""
+    if parts is None:
+        parts = list_uploaded_parts(minio, bucket_name, object_name, upload_id)
+    parts = sorted(parts, key=lambda p: p.part_number)
+    if not parts:
+        raise ValueError("No uploaded parts found for this upload")
+    minio._complete_multipart_upload(bucket_name, object_name, upload_id, parts)
+    return sum(p.size or 0 for p in parts)
+
+
+def abort_multipart_upload(minio, bucket_name: str, object_name: str, upload_id: str):
+    minio._abort_multipart_upload(bucket_name, object_name, upload_id)
+
+
+class MultipartUploadWriter:
+    """Append-only writer over one explicit multipart upload that can be resumed.
+
+    ``ObjectUploadStream`` keeps its upload inside ``put_object``, so a task
+    that is killed loses everything it wrote. Here the upload id and the
+    parts MinIO acknowledged are plain data: ``state`` describes every byte
+    uploaded so far, and a writer built from a saved ``state`` appends after
+    those bytes. Parts are uploaded from ``write`` while more than two are
+    buffered; ``flush_parts()`` uploads the rest once it is large enough to
+    be a part (all parts but the last must be at least ``MIN_PART_SIZE``).
+    """
+
+    def __init__(
+        self,
+        minio,
+        bucket_name: str,
+        object_name: str,
+        state: dict | None = None,
+        content_type: str = "application/octet-stream",
+        part_size: int = UPLOAD_PART_SIZE,
+    ):
+        self._minio = minio
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.part_size = part_size
+        if state:
+            self.upload_id = state["upload_id"]
+            self.parts = [list(part) for part in state["parts"]]
+        else:
+            self.upload_id = create_multipart_upload(minio, bucket_name, object_name, content_type)
+            self.parts = []  # [part_number, etag, size]
+        self._position = sum(size for _, _, size in self.parts)
+        self._buffer = bytearray()
+
+    @property
+    def state(self) -> dict:
+        return {"object_name": self.object_name, "upload_id": self.upload_id, "parts": self.parts}
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        before = len(self._buffer)
+        self._buffer += data
+        written = len(self._buffer) - before
+        self._position += written
+        while len(self._buffer) >= 2 * self.part_size:
+            self._upload_part(self.part_size)
+        return written
+
+    def flush_parts(self) -> bool:
+        """Upload what is buffered if it can be a part; return whether nothing is left buffered."""
+        if len(self._buffer) >= MIN_PART_SIZE:
+            self._upload_part(len(self._buffer))
+        return not self._buffer
+
+    def _upload_part(self, size: int):
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        part_number = len(self.parts) + 1
+        etag = self._minio._upload_part(self.bucket_name, self.object_name, data, None, self.upload_id, part_number)
+        self.parts.append([part_number, etag, len(data)])
+
+    def complete(self) -> int:
+        """Upload the last part and complete the upload; return the object size."""
+        if self._buffer or not self.parts:
+            self._upload_part(len(self._buffer))
+        parts = [Part(number, etag, size=size) for number, etag, size in self.parts]
+        return complete_multipart_upload(self._minio, self.bucket_name, self.object_name, self.upload_id, parts)
@@ -1,6 +1,21 @@
+import json
 import os
+import time
+from collections import deque
 from math import ceil
 import psutil
+from celery.utils.log import get_logger
+from celery.worker import state
+from celery.worker.autoscale import Autoscaler
+
+from app.core.config import settings
+from app.core.redis_client import get_sync_redis
+
+MB = 1024 ** 2
+AUTOSCALE_DECISIONS_KEY = "autoscale:decisions"
+AUTOSCALE_DECISIONS_KEPT = 50
+
+logger = get_logger(__name__)
 
 
 def detect_resources():
@@ -9,34 +24,272 @@ def detect_resources():
     return total_gb, cpu_count
 
 
+def memory_worker_cap(total_gb: float | None = None) -> int:
+    """Processes the host's memory can hold, each up to ``WORKER_MAX_MEMORY_PER_CHILD_MB``."""
+    if total_gb is None:
+        total_gb, _cpu = detect_resources()
+    usable_mb = total_gb * 1024 * settings.autoscale_memory_fraction
+    return max(1, int(usable_mb // settings.worker_max_memory_per_child_mb))
+
+
 def autoscale_bounds():
     """Return Celery autoscale bounds.
 
     We target eight workers so large ingestion jobs (including multi-GB files)
-    can be processed concurrently without manual tuning.
+    can be processed concurrently without manual tuning, but never more than
+    the host's memory can hold (``memory_worker_cap``). Within these bounds
+    ``MemoryAwareAutoscaler`` decides how many processes actually run.
     """
 
-    _total_gb, cpu_count = detect_resources()
-    # Honour host resources but never drop below an 8-worker ceiling requested
-    # for heavy workloads. When CPUs are fewer than 8 we still cap at 8 to
-    # favour throughput; Celery/OS scheduling will share cores as needed.
-    max_workers = max(8, cpu_count)
-    min_workers = max(4, max_workers // 2)
+    total_gb, cpu_count = detect_resources()
+    # When CPUs are fewer than 8 we still allow 8 to favour throughput;
+    # Celery/OS scheduling will share cores as needed. Memory is the hard limit.
+    max_workers = min(max(8, cpu_count), memory_worker_cap(total_gb))
+    min_workers = max(1, max_workers // 2)
     return min_workers, max_workers
 
 
-def describe_autoscale():
+def estimate_task_memory(size_bytes: int | None = None) -> int:
+    """Rough peak memory (bytes) of a task working on ``size_bytes`` of raw data.
+
+    Sent with each queued task as the ``memory_estimate`` header.
+    """
+    scaled = (size_bytes or 0) * settings.autoscale_task_bytes_factor
+    return settings.autoscale_task_base_mb * MB + int(min(scaled, settings.autoscale_task_max_mb * MB))
+
+
+def recent_autoscale_decisions(redis, limit: int = 10) -> list[dict]:
+    return [json.loads(item) for item in redis.lrange(AUTOSCALE_DECISIONS_KEY, 0, limit - 1)]
+
+
+def describe_autoscale(redis=None):
+    """Autoscale bounds for this host; with ``redis``, also the latest autoscaler decisions."""
     min_w, max_w = autoscale_bounds()
     total_gb, cpu = detect_resources()
-    return {
+    description = {
         "ram_gb": round(total_gb, 2),
         "cpus": cpu,
         "autoscale_min": min_w,
         "autoscale_max": max_w,
+        "memory_worker_cap": memory_worker_cap(total_gb),
+        "max_memory_per_child_mb": settings.worker_max_memory_per_child_mb,
     }
+    if redis is not None:
+        try:
+            description["decisions"] = recent_autoscale_decisions(redis)
+        except Exception:  # Redis down; bounds are still useful
+            description["decisions"] = []
+    return description
 
 
-if __name__ == "__main__":
-    import json
+class MemoryAwareAutoscaler(Autoscaler):
+    """Celery autoscaler that only adds processes the host has memory for.
+
+    Demand is the tasks this worker has reserved plus the messages still
+    waiting in its queues (the first few are read from the Redis broker).
+    Each waiting task carries a ``memory_estimate`` header
+    (``estimate_task_memory``). The pool is sized to the running tasks plus
+    the waiting tasks, in order, whose estimates fit in available memory above
+    the ``AUTOSCALE_MEMORY_FRACTION`` reserve. Idle processes beyond that are
+    stopped right away (an idle process would start a task that does not
+    fit); other scale-downs wait for the keepalive as usual.
+
+    Decisions that change the pool, or the reason for keeping it, are logged
+    and pushed to Redis for ``describe_autoscale``.
+    """
+
+    BACKLOG_TTL = 2.0  # seconds between broker reads
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decisions = deque(maxlen=AUTOSCALE_DECISIONS_KEPT)
+        self._backlog: list[int] = []
+        self._backlog_at = 0.0
+        self._last_reason = None
+
+    def _maybe_scale(self, req=None):
+        procs = self.processes
+        decision = self.decide(procs)
+        target = decision["target"]
+        if target > procs:
+            self.scale_up(target - procs)
+        elif target < procs:
+            if decision["reason"] == "memory":
+                self._shrink(procs - target)
+            else:
+                self.scale_down(procs - target)
+        if target != procs or decision["reason"] != self._last_reason:
+            self._record(decision)
+        return target != procs
+
+    def decide(self, procs: int) -> dict:
+        active = len(state.active_requests)
+        waiting = [
+            _request_estimate(req) for req in state.reserved_requests if req not in state.active_requests
+        ]
+        estimates = (waiting + self.backlog())[: self.max_concurrency]
+        memory = psutil.virtual_memory()
+        spare = memory.available - memory.total * (1 - settings.autoscale_memory_fraction)
+        decision = {
+            "at": time.time(),
+            "processes": procs,
+            "active": active,
+            "waiting": len(estimates),
+            "available_mb": round(memory.available / MB),
+            "spare_mb": round(spare / MB),
+        }
+
+        # waiting tasks start in order, so stop at the first one that does not fit
+        fit = 0
+        for estimate in estimates:
+            if estimate > spare:
+                break
+            spare -= estimate
+            fit += 1
+        decision["fit"] = fit
+
+        wanted = min(active + len(estimates), self.max_concurrency)
+        target = max(self.min_concurrency, min(wanted, active + fit))
+        if target > procs:
+            return decision | {"target": target, "reason": "queue"}
+        if target < procs:
+            # idle processes would start tasks the host has no memory for
+            return decision | {"target": target, "reason": "memory" if target < wanted else "idle"}
+        return decision | {"target": procs, "reason": "memory-limited" if target < wanted else "steady"}
+
+    def backlog(self) -> list[int]:
+        """Memory estimates of the oldest messages waiting in this worker's queues."""
+        now = time.monotonic()
+        if now - self._backlog_at < self.BACKLOG_TTL:
+            return self._backlog
+        self._backlog_at = now
+        try:
+            redis = get_sync_redis()
+            estimates = []
+            for queue in self._queue_names():
+                # kombu pushes on the left and workers pop on the right
+                for raw in reversed(redis.lrange(queue, -self.max_concurrency, -1)):
+                    headers = json.loads(raw).get("headers") or {}
+                    estimates.append(headers.get("memory_estimate") or estimate_task_memory())
+            self._backlog = estimates
+        except Exception as exc:
+            logger.debug("Autoscaler could not read the queue backlog: %r", exc)
+            self._backlog = []
+        return self._backlog
 
-    print(json.dumps(describe_autoscale(), indent=2))
+    def _queue_names(self) -> list[str]:
+        try:
+            return [queue.name for queue in self.worker.consumer.task_consumer.queues]
+        except AttributeError:  # consumer not started yet
+            return [settings.celery_light_queue, settings.celery_heavy_queue]
+
+    def _record(self, decision: dict):
+        self._last_reason = decision["reason"]
+        decision["worker"] = getattr(self.worker, "hostname", None)
+        self.decisions.append(decision)
+        logger.info(
+            "Autoscaler: %s -> %s processes (%s; %s waiting, %s MB spare)",
+            decision["processes"], decision["target"], decision["reason"], decision["waiting"], decision["spare_mb"],
+        )
+        try:
+            redis = get_sync_redis()
+            pipe = redis.pipeline()
+            pipe.lpush(AUTOSCALE_DECISIONS_KEY, json.dumps(decision))
+            pipe.ltrim(AUTOSCALE_DECISIONS_KEY, 0, AUTOSCALE_DECISIONS_KEPT - 1)
+            pipe.execute()
+        except Exception as exc:
+            logger.debug("Autoscaler could not store its decision: %r", exc)
+
+    def info(self):
+        return super().info() | {"decisions": list(self.decisions)[-5:]}
+
+
+def _request_estimate(req) -> int:
+    return req.request_dict.get("memory_estimate") or estimate_task_memory()
+
+
+class MemoryBudget:
+    """Memory one task may spend on in-flight chunks, from live ``psutil`` readings.
+
+    ``TASK_MEMORY_FRACTION`` of the memory available when the task starts is
+    split evenly across the tasks that can run at once on this host.
+    ``rows`` turns a share of that budget into a chunk size once ``observe``
+    has measured the bytes per row for that kind of chunk. While available memory is below
+    ``TASK_MEMORY_LOW_FRACTION`` of the total, every call halves the size
+    (down to ``TASK_CHUNK_MIN_ROWS``); it grows back once the pressure is gone.
+    The sizes handed out are kept for job metadata (``describe``).
+    """
+
+    # a chunk is parsed, converted and buffered for writing at the same time
+    CHUNK_SHARE = 4
+
+    def __init__(self, fraction: float | None = None, tasks: int | None = None):
+        memory = psutil.virtual_memory()
+        self.fraction = fraction if fraction is not None else settings.task_memory_fraction
+        self.tasks = tasks or settings.task_memory_tasks or autoscale_bounds()[1]
+        self.total_bytes = memory.total
+        self.budget_bytes = int(memory.available * self.fraction / self.tasks)
+        self.reserved_bytes = 0
+        self.bytes_per_row: dict[str, float] = {}
+        self.scale = 1.0
+        self.pressure_events = 0
+        self.chosen: dict[str, list[int]] = {}
+
+    def observe(self, name: str, rows: int, nbytes: int):
+        """Record the in-memory size of ``rows`` rows of ``name`` chunks; the widest rows seen win."""
+        if rows:
+            self.bytes_per_row[name] = max(self.bytes_per_row.get(name, 0.0), float(nbytes) / rows)
+
+    def reserve(self, nbytes: int):
+        """Take memory the task holds throughout (e.g. accumulators) out of the chunk budget."""
+        self.reserved_bytes += nbytes
+        self.budget_bytes = max(self.budget_bytes - nbytes, 0)
+
+    def under_pressure(self) -> bool:
+        return psutil.virtual_memory().available < self.total_bytes * settings.task_memory_low_fraction
+
+    def _update_scale(self):
+        if self.under_pressure():
+            self.scale = max(self.scale / 2, 1 / 64)
+            self.pressure_events += 1
+        elif self.scale < 1:
+            self.scale = min(self.scale * 2, 1.0)
+
+    def rows(self, name: str, default: int, share: int = CHUNK_SHARE) -> int:
+        """Rows per chunk for ``name``: ``default`` until a row size is known."""
+        self._update_scale()
+        if self.bytes_per_row.get(name):
+            rows = self.budget_bytes / share / self.bytes_per_row[name]
+            rows = min(max(rows, settings.task_chunk_min_rows), settings.task_chunk_max_rows)
+        else:
+            rows = default
+        rows = max(int(rows * self.scale), min(settings.task_chunk_min_rows, default))
+        self._record(name, rows)
+        return rows
+
+    def bytes(self, name: str, floor: int, ceiling: int, share: int = CHUNK_SHARE) -> int:
+        """Bytes per read for ``name`` (e.g. a CSV block), between ``floor`` and ``ceiling``."""
+        self._update_scale()
+        size = max(int(min(max(self.budget_bytes / share, floor), ceiling) * self.scale), floor)
+        self._record(name, size)
+        return size
+
+    def _record(self, name: str, value: int):
+        values = self.chosen.setdefault(name, [])
+        if not values or values[-1] != value:
+            values.append(value)
+            del values[:-20]  # keep the latest changes only
+
+    def describe(self) -> dict:
+        return {
+            "budget_bytes": self.budget_bytes,
+            "reserved_bytes": self.reserved_bytes,
+            "tasks": self.tasks,
+            "bytes_per_row": {name: round(size, 1) for name, size in self.bytes_per_row.items()},
+            "pressure_events": self.pressure_events,
+            "chosen": self.chosen,
+        }
+
+
+if __name__ == "__main__":
+    print(json.dumps(describe_autoscale(get_sync_redis()), indent=2))
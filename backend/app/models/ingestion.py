@@ -42,7 +42,7 @@
 #     message: Optional[str] = None
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class IngestionJobOut(BaseModel):
@@ -58,6 +58,9 @@ class IngestionJobOut(BaseModel):
 
     content_type: Optional[str] = None
     size_bytes: Optional[int] = None
+    content_hash: Optional[str] = None  # sha256 of the raw upload
+    artifact_id: Optional[str] = None  # set when raw/processed objects are shared
+    precision: Optional[str] = None  # off/int/float32; chosen types are in metadata.column_types
 
     header_mode: Optional[str] = None
     custom_headers: Optional[List[str]] = None
@@ -88,15 +91,68 @@ class IngestionCreateResponse(BaseModel):
     autoscale: dict
 
 
+class IngestionBatchFailure(BaseModel):
+    filename: str
+    error: str
+
+
 class IngestionBatchCreateResponse(BaseModel):
     batch_id: str
     project_id: str
     dataset_type: str
     tag_name: str
     jobs: List[IngestionCreateResponse]
+    # files that could not be stored; they count as failed jobs of the batch
+    failed: List[IngestionBatchFailure] = []
+
+
+class IngestionBatchStatus(BaseModel):
+    batch_id: str
+    project_id: str
+    dataset_type: Optional[str] = None
+    tag_name: Optional[str] = None
+    status: str
+    progress: int = 0
+    message: Optional[str] = None
+    jobs_total: int = 0
+    jobs_succeeded: int = 0
+    jobs_failed: int = 0
+    bytes_total: int = 0
+    bytes_done: int = 0
+    job_ids: List[str] = []
+    created_at: datetime
+    finished_at: Optional[datetime] = None
 
 
 class IngestionStatus(BaseModel):
     status: str
     progress: int
     message: Optional[str] = None
+
+
+class IngestionUploadInit(BaseModel):
+    """Start a direct-to-MinIO multipart upload for one dataset file."""
+
+    filename: str
+    size_bytes: int = Field(..., gt=0)
+    content_type: Optional[str] = None
+    dataset_type: str  # cfd/wind/flight
+    tag_name: str
+    header_mode: str = "file"
+    custom_headers: Optional[List[str]] = None
+    visualize: bool = False
+    precision: Optional[str] = None  # off/int/float32; default per dataset type
+
+
+class IngestionUploadPart(BaseModel):
+    part_number: int
+    url: str
+
+
+class IngestionUploadInitResponse(BaseModel):
+    upload_id: str
+    storage_key: str
+    part_size: int
+    parts: List[IngestionUploadPart]
+    expires_in: int
+
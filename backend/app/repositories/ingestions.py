@@ -4,6 +4,7 @@
 from datetime import datetime
 from typing import List, Optional
 from bson import ObjectId
+from pymongo import ReturnDocument
 from app.db.mongo import get_db
 
 
@@ -24,6 +25,10 @@ class IngestionRepository:
         processed_key: str | None = None,
         content_type: str | None = None,
         size_bytes: int | None = None,
+        content_hash: str | None = None,
+        parse_flavor: str | None = None,
+        batch_id: str | None = None,
+        precision: str | None = None,
     ) -> str:
         db = await get_db()
         now = datetime.utcnow()
@@ -39,6 +44,10 @@ class IngestionRepository:
             "size_bytes": size_bytes,
             "header_mode": header_mode,
             "custom_headers": custom_headers,
+            "content_hash": content_hash,
+            "parse_flavor": parse_flavor,
+            "batch_id": batch_id,
+            "precision": precision,
             "status": "queued",
             "progress": 0,
             "owner_email": owner_email,
@@ -90,3 +99,101 @@ class IngestionRepository:
             {"$set": fields},
         )
 
+
+class IngestionArtifactRepository:
+    """Reference-counted processed outputs shared by jobs with identical input.
+
+    An artifact is keyed by project, content hash of the raw upload, parser
+    flavor, header options and precision mode; jobs that reuse it point at its raw and
+    processed objects, which are only removed when the last job is deleted.
+    """
+
+    collection_name = "ingestion_artifacts"
+
+    async def acquire(
+        self,
+        project_id: str,
+        content_hash: str,
+        parse_flavor: str,
+        header_mode: str | None,
+        custom_headers: list[str] | None,
+        precision: str | None = None,
+    ) -> Optional[dict]:
+        db = await get_db()
+        doc = await db[self.collection_name].find_one_and_update(
+            {
+                "project_id": project_id,
+                "content_hash": content_hash,
+                "parse_flavor": parse_flavor,
+                "header_mode": header_mode,
+                "custom_headers": custom_headers,
+                "precision": precision,
+                # an artifact at zero is being removed by release()
+                "refcount": {"$gt": 0},
+            },
+            {"$inc": {"refcount": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc:
+            return None
+        doc["artifact_id"] = str(doc.pop("_id"))
+        return doc
+
+    async def release(self, artifact_id: str) -> Optional[dict]:
+        """Drop one reference; return the artifact if it is no longer used."""
+        db = await get_db()
+        doc = await db[self.collection_name].find_one_and_update(
+            {"_id": ObjectId(artifact_id)},
+            {"$inc": {"refcount": -1}, "$set": {"updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc or doc.get("refcount", 0) > 0:
+            return None
+        await db[self.collection_name].delete_one({"_id": doc["_id"], "refcount": {"$lte": 0}})
+        return doc
+
+
+class IngestionBatchRepository:
+    collection_name = "ingestion_batches"
+
+    async def create_batch(
+        self,
+        batch_id: str,
+        project_id: str,
+        owner_email: str,
+        dataset_type: str,
+        tag_name: str,
+        file_count: int,
+        bytes_total: int,
+    ):
+        db = await get_db()
+        now = datetime.utcnow()
+        await db[self.collection_name].insert_one({
+            "_id": batch_id,
+            "project_id": project_id,
+            "owner_email": owner_email,
+            "dataset_type": dataset_type,
+            "tag_name": tag_name,
+            "file_count": file_count,
+            "bytes_total": bytes_total,
+            "job_ids": [],
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    async def set_job_ids(self, batch_id: str, job_ids: list[str]):
+        db = await get_db()
+        await db[self.collection_name].update_one(
+            {"_id": batch_id},
+            {"$set": {"job_ids": job_ids, "updated_at": datetime.utcnow()}},
+        )
+
+    async def get_batch(self, batch_id: str) -> Optional[dict]:
+        db = await get_db()
+        doc = await db[self.collection_name].find_one({"_id": batch_id})
+        if not doc:
+            return None
+        doc["batch_id"] = doc.pop("_id")
+        return doc
+
@@ -1,33 +1,75 @@
+import asyncio
+import hashlib
 import json
+import logging
+import math
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from functools import partial
 from uuid import uuid4
 from typing import Dict
 
+from celery import states
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status, Response
 from sse_starlette.sse import EventSourceResponse
 
 from app.core.auth import CurrentUser, get_current_user
+from app.core.celery_app import queue_for
 from app.core.config import settings
 from app.core.minio_client import get_minio_client
-from app.core.redis_client import get_async_redis
-from app.core.system_info import describe_autoscale
-from app.models.ingestion import IngestionBatchCreateResponse, IngestionCreateResponse, IngestionJobOut, IngestionStatus
-from app.repositories.ingestions import IngestionRepository
+from app.core.minio_streams import (
+    abort_multipart_upload,
+    complete_multipart_upload,
+    create_multipart_upload,
+    list_uploaded_parts,
+    multipart_part_size,
+    presign_upload_parts,
+)
+from app.core.redis_client import get_async_redis, get_sync_redis
+from app.core.system_info import describe_autoscale, estimate_task_memory
+from app.models.ingestion import (
+    IngestionBatchCreateResponse,
+    IngestionBatchFailure,
+    IngestionBatchStatus,
+    IngestionCreateResponse,
+    IngestionJobOut,
+    IngestionStatus,
+    IngestionUploadInit,
+    IngestionUploadInitResponse,
+)
+from app.repositories.ingestions import IngestionArtifactRepository, IngestionBatchRepository, IngestionRepository
 from app.repositories.projects import ProjectRepository
-from app.tasks.ingestion import ingest_file
+from app.tasks.ingestion import ingest_file, init_batch_progress, parse_flavor, precision_mode, record_batch_job
 # for the processed data view 
 import pyarrow as pa
 import pyarrow.parquet as pq
 import io
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/ingestion", tags=["ingestion"])
 repo = IngestionRepository()
+artifacts = IngestionArtifactRepository()
+batches = IngestionBatchRepository()
 projects = ProjectRepository()
 
 TABULAR_EXTS = {".csv", ".xlsx", ".xls",'.txt'}
 
+# Object-store writes and upload hashing are blocking; they run on this
+# bounded pool so large batches neither stall the event loop nor starve
+# Starlette's shared threadpool.
+_upload_pool = ThreadPoolExecutor(
+    max_workers=settings.ingestion_upload_concurrency,
+    thread_name_prefix="ingestion-upload",
+)
+
+
+async def _run_blocking(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_upload_pool, partial(fn, *args, **kwargs))
+
 
 def _safe_slug(value: str) -> str:
     value = (value or "").strip()
@@ -77,6 +119,135 @@ def _parse_custom_headers(custom_headers: str | None, header_mode: str) -> list[
     return parsed_headers
 
 
+def _validate_header_mode(header_mode: str | None) -> str:
+    header_mode = header_mode or "file"
+    valid_header_modes = {"file", "none", "custom"}
+    if header_mode not in valid_header_modes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"header_mode must be one of {', '.join(sorted(valid_header_modes))}",
+        )
+    return header_mode
+
+
+def _validate_precision(dataset_type: str | None, precision: str | None) -> str:
+    try:
+        return precision_mode(dataset_type, precision)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def _object_keys(
+    project_folder: str, dataset_folder: str, tag_folder: str, original_name: str, visualize_enabled: bool
+) -> tuple[str, str | None]:
+    raw_key = f"{project_folder}/{dataset_folder}/{tag_folder}/raw/{uuid4()}_{original_name}"
+    processed_key = None
+    if visualize_enabled:
+        stem = os.path.splitext(original_name)[0]
+        processed_key = f"{project_folder}/{dataset_folder}/{tag_folder}/processed/{uuid4()}_{stem}.parquet"
+    return raw_key, processed_key
+
+
+async def _register_job(
+    project_id: str,
+    user: CurrentUser,
+    bucket: str,
+    original_name: str,
+    raw_key: str,
+    processed_key: str | None,
+    dataset_type: str,
+    tag_folder: str,
+    header_mode: str,
+    parsed_headers: list[str] | None,
+    visualize_enabled: bool,
+    content_type: str | None,
+    size_bytes: int | None,
+    content_hash: str | None = None,
+    artifact: dict | None = None,
+    batch_id: str | None = None,
+    precision: str | None = None,
+) -> IngestionCreateResponse:
+    """Create the job for a stored raw object and queue (or reuse) its processing."""
+    job_id = await repo.create_job(
+        project_id=project_id,
+        filename=original_name,
+        storage_key=raw_key,
+        owner_email=user.email,
+        dataset_type=dataset_type,
+        header_mode=header_mode,
+        custom_headers=parsed_headers,
+        tag_name=tag_folder,
+        visualize_enabled=visualize_enabled,
+        processed_key=processed_key,
+        content_type=content_type,
+        size_bytes=size_bytes,
+        content_hash=content_hash,
+        parse_flavor=parse_flavor(original_name, dataset_type),
+        batch_id=batch_id,
+        precision=precision,
+    )
+
+    autoscale = describe_autoscale()
+    try:
+        if artifact:
+            await repo.update_job(
+                job_id,
+                status=states.SUCCESS,
+                progress=100,
+                message="Reused processed data from an identical upload",
+                artifact_id=artifact["artifact_id"],
+                columns=artifact.get("columns"),
+                rows_seen=artifact.get("rows_seen"),
+                sample_rows=artifact.get("sample_rows"),
+                metadata=artifact.get("metadata"),
+            )
+            status_value = states.SUCCESS
+        # If visualize enabled, materialize parquet during ingestion
+        elif visualize_enabled:
+            ingest_file.apply_async(
+                (
+                    job_id,
+                    bucket,
+                    raw_key,
+                    processed_key,
+                    original_name,
+                    header_mode,
+                    parsed_headers,
+                    dataset_type,
+                    tag_folder,
+                ),
+                queue=queue_for(size_bytes),
+                headers={"memory_estimate": estimate_task_memory(size_bytes)},
+            )
+            status_value = "queued"
+        else:
+            # stored raw only
+            await repo.update_job(job_id, status="stored", progress=100)
+
+            status_value = "stored"
+    except Exception as exc:
+        # the job exists but will never be processed
+        await repo.update_job(job_id, status=states.FAILURE, progress=100, message=str(exc))
+        raise
+
+    response = IngestionCreateResponse(
+        job_id=job_id,
+        project_id=project_id,
+        filename=original_name,
+        storage_key=raw_key,
+        dataset_type=dataset_type,
+        tag_name=tag_folder,
+        visualize_enabled=visualize_enabled,
+        header_mode=header_mode,
+        status=status_value,
+        autoscale=autoscale,
+    )
+    if batch_id and status_value != "queued":
+        # nothing left to process for this file; last, so a failure above is counted only once
+        await _run_blocking(record_batch_job, get_sync_redis(), batch_id, size_bytes, True)
+    return response
+
+
 @router.post("/{project_id}/batch", response_model=IngestionBatchCreateResponse)
 async def start_ingestion_batch(
     project_id: str,
@@ -85,21 +256,15 @@ async def start_ingestion_batch(
     tag_name: str = Form(...),
     header_mode: str = Form("file"),
     custom_headers: str | None = Form(None),
-    manifest: str | None = Form(None),      # JSON list aligned with files order: [{visualize:true/false}]
+    manifest: str | None = Form(None),      # JSON list aligned with files order: [{visualize:true/false, precision?}]
+    precision: str | None = Form(None),     # off/int/float32; default per dataset type
     user: CurrentUser = Depends(get_current_user),
 ):
     project = await _ensure_project_member(project_id, user)
     project_name = project.get("project_name") or "Project"
     project_folder = _safe_slug(project_name)
 
-    header_mode = header_mode or "file"
-    valid_header_modes = {"file", "none", "custom"}
-    if header_mode not in valid_header_modes:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"header_mode must be one of {', '.join(sorted(valid_header_modes))}",
-        )
-
+    header_mode = _validate_header_mode(header_mode)
     parsed_headers = _parse_custom_headers(custom_headers, header_mode)
     tag_folder = _safe_slug(tag_name)
     dataset_folder = _dataset_folder(dataset_type)
@@ -117,16 +282,39 @@ async def start_ingestion_batch(
     if manifest_items and len(manifest_items) != len(files):
         raise HTTPException(status_code=400, detail="manifest length must match files length")
 
+    # a manifest entry may override the batch-level precision for its file
+    precisions = [
+        _validate_precision(dataset_type, (item or {}).get("precision") or precision)
+        for item in (manifest_items or [{}] * len(files))
+    ]
+
     minio = get_minio_client()
     bucket = settings.ingestion_bucket
-    if not minio.bucket_exists(bucket):
-        minio.make_bucket(bucket)
+    if not await _run_blocking(minio.bucket_exists, bucket):
+        await _run_blocking(minio.make_bucket, bucket)
 
     batch_id = str(uuid4())
-    responses: list[IngestionCreateResponse] = []
+    bytes_total = sum(getattr(file, "size", None) or 0 for file in files)
+    await batches.create_batch(batch_id, project_id, user.email, dataset_type, tag_folder, len(files), bytes_total)
+    await _run_blocking(init_batch_progress, get_sync_redis(), batch_id, len(files), bytes_total)
 
-    for idx, file in enumerate(files):
+    async def store_file(idx: int, file: UploadFile) -> IngestionCreateResponse | IngestionBatchFailure:
         original_name = file.filename or f"file_{idx}"
+        try:
+            return await _store_file(idx, file, original_name)
+        except Exception as exc:  # noqa: BLE001 - one bad file must not strand the batch
+            logger.exception("Storing %s for batch %s failed", original_name, batch_id)
+            try:
+                await file.close()
+            except Exception:  # noqa: BLE001
+                pass
+            # counted as a finished, failed job so the batch still reaches jobs_total
+            await _run_blocking(
+                record_batch_job, get_sync_redis(), batch_id, getattr(file, "size", None), False
+            )
+            return IngestionBatchFailure(filename=original_name, error=str(exc))
+
+    async def _store_file(idx: int, file: UploadFile, original_name: str) -> IngestionCreateResponse:
         ext = os.path.splitext(original_name.lower())[-1]
         requested_visualize = False
 
@@ -136,73 +324,61 @@ async def start_ingestion_batch(
         # force OFF for non-tabular
         visualize_enabled = bool(requested_visualize and ext in TABULAR_EXTS)
 
-        raw_key = f"{project_folder}/{dataset_folder}/{tag_folder}/raw/{uuid4()}_{original_name}"
-        processed_key = None
+        # the upload is already spooled locally; hash it before deciding to store it
+        await file.seek(0)
+        content_hash = (await _run_blocking(hashlib.file_digest, file.file, "sha256")).hexdigest()
+        flavor = parse_flavor(original_name, dataset_type)
+        artifact = None
         if visualize_enabled:
-            stem = os.path.splitext(original_name)[0]
-            processed_key = f"{project_folder}/{dataset_folder}/{tag_folder}/processed/{uuid4()}_{stem}.parquet"
+            artifact = await artifacts.acquire(
+                project_id, content_hash, flavor, header_mode, parsed_headers, precisions[idx]
+            )
 
-        await file.seek(0)
-        minio.put_object(
-            bucket_name=bucket,
-            object_name=raw_key,
-            data=file.file,
-            length=-1,
-            part_size=10 * 1024 * 1024,
-            content_type=file.content_type or "application/octet-stream",
-        )
+        if artifact:
+            # identical content already processed with the same options: reuse it
+            raw_key = artifact["storage_key"]
+            processed_key = artifact["processed_key"]
+        else:
+            raw_key, processed_key = _object_keys(
+                project_folder, dataset_folder, tag_folder, original_name, visualize_enabled
+            )
+            await file.seek(0)
+            await _run_blocking(
+                minio.put_object,
+                bucket_name=bucket,
+                object_name=raw_key,
+                data=file.file,
+                length=-1,
+                part_size=10 * 1024 * 1024,
+                content_type=file.content_type or "application/octet-stream",
+            )
         size_bytes = getattr(file, "size", None)
         await file.close()
 
-        job_id = await repo.create_job(
-            project_id=project_id,
-            filename=original_name,
-            storage_key=raw_key,
-            owner_email=user.email,
-            dataset_type=dataset_type,
-            header_mode=header_mode,
-            custom_headers=parsed_headers,
-            tag_name=tag_folder,
-            visualize_enabled=visualize_enabled,
-            processed_key=processed_key,
-            content_type=file.content_type,
-            size_bytes=size_bytes,
+        return await _register_job(
+            project_id,
+            user,
+            bucket,
+            original_name,
+            raw_key,
+            processed_key,
+            dataset_type,
+            tag_folder,
+            header_mode,
+            parsed_headers,
+            visualize_enabled,
+            file.content_type,
+            size_bytes,
+            content_hash=content_hash,
+            artifact=artifact,
+            batch_id=batch_id,
+            precision=precisions[idx],
         )
 
-        # If visualize enabled, materialize parquet during ingestion
-        if visualize_enabled:
-            ingest_file.delay(
-                job_id,
-                bucket,
-                raw_key,
-                processed_key,
-                original_name,
-                header_mode,
-                parsed_headers,
-                dataset_type,
-                tag_folder,
-            )
-            status_value = "queued"
-        else:
-            # stored raw only
-            await repo.update_job(job_id, status="stored", progress=100)
-
-            status_value = "stored"
-
-        responses.append(
-            IngestionCreateResponse(
-                job_id=job_id,
-                project_id=project_id,
-                filename=original_name,
-                storage_key=raw_key,
-                dataset_type=dataset_type,
-                tag_name=tag_folder,
-                visualize_enabled=visualize_enabled,
-                header_mode=header_mode,
-                status=status_value,
-                autoscale=describe_autoscale(),
-            )
-        )
+    # files upload concurrently; each job is queued as soon as its own upload lands
+    results = await asyncio.gather(*(store_file(idx, file) for idx, file in enumerate(files)))
+    responses = [r for r in results if isinstance(r, IngestionCreateResponse)]
+    await batches.set_job_ids(batch_id, [r.job_id for r in responses])
 
     return IngestionBatchCreateResponse(
         batch_id=batch_id,
@@ -210,9 +386,200 @@ async def start_ingestion_batch(
         dataset_type=dataset_type,
         tag_name=tag_folder,
         jobs=responses,
+        failed=[r for r in results if isinstance(r, IngestionBatchFailure)],
+    )
+
+
+async def _get_batch_for_member(batch_id: str, user: CurrentUser) -> dict:
+    doc = await batches.get_batch(batch_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    await _ensure_project_member(doc["project_id"], user)
+    return doc
+
+
+@router.get("/batches/{batch_id}", response_model=IngestionBatchStatus)
+async def batch_status(batch_id: str, user: CurrentUser = Depends(get_current_user)):
+    """Aggregate progress of a batch, from its Redis hash while it is running."""
+    doc = await _get_batch_for_member(batch_id, user)
+    mapping = await get_async_redis().hgetall(f"ingestion:batch:{batch_id}:status")
+
+    def counter(field: str, default: int = 0) -> int:
+        return int(mapping.get(field) or doc.get(field) or default)
+
+    return IngestionBatchStatus(
+        batch_id=batch_id,
+        project_id=doc["project_id"],
+        dataset_type=doc.get("dataset_type"),
+        tag_name=doc.get("tag_name"),
+        status=mapping.get("status") or doc.get("status", "queued"),
+        progress=counter("progress"),
+        message=mapping.get("message") or doc.get("message"),
+        jobs_total=counter("jobs_total", doc.get("file_count", 0)),
+        jobs_succeeded=counter("jobs_succeeded"),
+        jobs_failed=counter("jobs_failed"),
+        bytes_total=counter("bytes_total"),
+        bytes_done=counter("bytes_done"),
+        job_ids=doc.get("job_ids") or [],
+        created_at=doc["created_at"],
+        finished_at=doc.get("finished_at"),
+    )
+
+
+@router.get("/batches/{batch_id}/stream")
+async def stream_batch_progress(batch_id: str, user: CurrentUser = Depends(get_current_user)):
+    await _get_batch_for_member(batch_id, user)
+    return EventSourceResponse(_channel_events(f"ingestion:batch:{batch_id}:events"))
+
+
+# --- Direct-to-MinIO multipart uploads (init -> PUT parts -> complete) ---
+
+def _upload_state_key(upload_id: str) -> str:
+    return f"ingestion:upload:{upload_id}"
+
+
+async def _load_upload(project_id: str, upload_id: str, user: CurrentUser) -> dict:
+    await _ensure_project_member(project_id, user)
+    raw = await get_async_redis().get(_upload_state_key(upload_id))
+    state = json.loads(raw) if raw else None
+    if not state or state["project_id"] != project_id or state["owner_email"] != user.email:
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    return state
+
+
+@router.post("/{project_id}/uploads/init", response_model=IngestionUploadInitResponse)
+async def init_multipart_upload(
+    project_id: str,
+    payload: IngestionUploadInit,
+    user: CurrentUser = Depends(get_current_user),
+):
+    """Start a multipart upload and return one presigned PUT URL per part.
+
+    The browser uploads the parts straight to MinIO (in parallel, in any
+    order) and then calls ``complete``; no file bytes pass through the API.
+    """
+    project = await _ensure_project_member(project_id, user)
+    project_folder = _safe_slug(project.get("project_name") or "Project")
+    header_mode = _validate_header_mode(payload.header_mode)
+    if header_mode == "custom" and not payload.custom_headers:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide custom_headers when header_mode is 'custom'",
+        )
+    precision = _validate_precision(payload.dataset_type, payload.precision)
+    tag_folder = _safe_slug(payload.tag_name)
+    ext = os.path.splitext(payload.filename.lower())[-1]
+    # force OFF for non-tabular
+    visualize_enabled = bool(payload.visualize and ext in TABULAR_EXTS)
+    raw_key, processed_key = _object_keys(
+        project_folder, _dataset_folder(payload.dataset_type), tag_folder, payload.filename, visualize_enabled
+    )
+
+    part_size = multipart_part_size(payload.size_bytes, settings.ingestion_multipart_part_bytes)
+    part_count = math.ceil(payload.size_bytes / part_size)
+    expires = timedelta(seconds=settings.ingestion_multipart_url_expiry_seconds)
+
+    minio = get_minio_client()
+    bucket = settings.ingestion_bucket
+    try:
+        if not await _run_blocking(minio.bucket_exists, bucket):
+            await _run_blocking(minio.make_bucket, bucket)
+        upload_id = await _run_blocking(create_multipart_upload, minio, bucket, raw_key, payload.content_type)
+        parts = await _run_blocking(presign_upload_parts, minio, bucket, raw_key, upload_id, part_count, expires)
+    except Exception as exc:  # pragma: no cover - network dependent
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Storage backend is unavailable. Please try again later.",
+        ) from exc
+
+    state = {
+        "project_id": project_id,
+        "owner_email": user.email,
+        "storage_key": raw_key,
+        "processed_key": processed_key,
+        "filename": payload.filename,
+        "content_type": payload.content_type,
+        "dataset_type": payload.dataset_type,
+        "tag_name": tag_folder,
+        "header_mode": header_mode,
+        "custom_headers": payload.custom_headers,
+        "visualize_enabled": visualize_enabled,
+        "precision": precision,
+        "part_count": part_count,
+    }
+    # keep the state a little longer than the URLs so a late complete still works
+    await get_async_redis().set(
+        _upload_state_key(upload_id), json.dumps(state), ex=settings.ingestion_multipart_url_expiry_seconds + 3600
+    )
+
+    return IngestionUploadInitResponse(
+        upload_id=upload_id,
+        storage_key=raw_key,
+        part_size=part_size,
+        parts=parts,
+        expires_in=settings.ingestion_multipart_url_expiry_seconds,
     )
 
 
+@router.post("/{project_id}/uploads/{upload_id}/complete", response_model=IngestionCreateResponse)
+async def complete_upload(project_id: str, upload_id: str, user: CurrentUser = Depends(get_current_user)):
+    """Assemble the uploaded parts, then create the job and queue ingestion."""
+    state = await _load_upload(project_id, upload_id, user)
+    minio = get_minio_client()
+    bucket = settings.ingestion_bucket
+    raw_key = state["storage_key"]
+
+    parts = await _run_blocking(list_uploaded_parts, minio, bucket, raw_key, upload_id)
+    received = sorted(p.part_number for p in parts)
+    if received != list(range(1, state["part_count"] + 1)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Upload incomplete: {len(received)} of {state['part_count']} parts received",
+        )
+
+    redis = get_async_redis()
+    # deleting the state claims the upload, so a repeated complete cannot create two jobs
+    if not await redis.delete(_upload_state_key(upload_id)):
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    try:
+        size_bytes = await _run_blocking(complete_multipart_upload, minio, bucket, raw_key, upload_id, parts)
+    except Exception as exc:
+        await redis.set(_upload_state_key(upload_id), json.dumps(state), ex=3600)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not complete the upload. Please try again.",
+        ) from exc
+
+    return await _register_job(
+        project_id,
+        user,
+        bucket,
+        state["filename"],
+        raw_key,
+        state["processed_key"],
+        state["dataset_type"],
+        state["tag_name"],
+        state["header_mode"],
+        state["custom_headers"],
+        state["visualize_enabled"],
+        state["content_type"],
+        size_bytes,
+        precision=state.get("precision"),
+    )
+
+
+@router.delete("/{project_id}/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(project_id: str, upload_id: str, user: CurrentUser = Depends(get_current_user)):
+    state = await _load_upload(project_id, upload_id, user)
+    minio = get_minio_client()
+    try:
+        await _run_blocking(abort_multipart_upload, minio, settings.ingestion_bucket, state["storage_key"], upload_id)
+    except Exception:
+        pass
+    await get_async_redis().delete(_upload_state_key(upload_id))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 # --- Existing endpoints kept as-is below (job detail/status/download/list/stream/delete) ---
 
 @router.get("/jobs/{job_id}", response_model=IngestionJobOut)
@@ -249,13 +616,19 @@ async def delete_job(job_id: str, user: CurrentUser = Depends(get_current_user))
         raise HTTPException(status_code=404, detail="Job not found")
     await _ensure_project_member(doc["project_id"], user)
 
+    object_keys = [doc["storage_key"], doc.get("processed_key")]
+    if doc.get("artifact_id"):
+        # shared objects go away with the last job referencing them
+        artifact = await artifacts.release(doc["artifact_id"])
+        object_keys = [artifact["storage_key"], artifact.get("processed_key")] if artifact else []
+
     minio = get_minio_client()
     bucket = settings.ingestion_bucket
-    if minio.bucket_exists(bucket):
+    if object_keys and minio.bucket_exists(bucket):
         try:
-            minio.remove_object(bucket_name=bucket, object_name=doc["storage_key"])
-            if doc.get("processed_key"):
-                minio.remove_object(bucket_name=bucket, object_name=doc["processed_key"])
+            for object_key in object_keys:
+                if object_key:
+                    minio.remove_object(bucket_name=bucket, object_name=object_key)
         except Exception:
             pass
     await repo.delete_job(job_id)
@@ -270,9 +643,13 @@ async def list_jobs(project_id: str, user: CurrentUser = Depends(get_current_use
 
 
 async def event_generator(job_id: str):
+    async for event in _channel_events(f"ingestion:{job_id}:events"):
+        yield event
+
+
+async def _channel_events(channel_name: str):
     redis = get_async_redis()
     pubsub = redis.pubsub()
-    channel_name = f"ingestion:{job_id}:events"
     await pubsub.subscribe(channel_name)
     try:
         async for message in pubsub.listen():
@@ -460,6 +837,7 @@ async def preview_processed(
         "rows": rows,
         "limit": limit,
         "total_rows": table.num_rows,
+        "stats": (doc.get("metadata") or {}).get("stats"),
     }
 
 # End B : Save rename map (per file)
@@ -1,14 +1,19 @@
+import asyncio
 import io
 import logging
+import math
 from datetime import timedelta
+from functools import partial
 
 import pandas as pd
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import ValidationError
 
 from app.core.auth import CurrentUser, get_current_user
+from app.core.celery_app import queue_for
 from app.core.config import settings
 from app.core.minio_client import get_minio_client
+from app.core.system_info import estimate_task_memory
 from app.models.visualization import (
     VisualizationCreateRequest,
     VisualizationOut,
@@ -17,7 +22,7 @@ from app.models.visualization import (
 from app.repositories.ingestions import IngestionRepository
 from app.repositories.projects import ProjectRepository
 from app.repositories.visualizations import VisualizationRepository
-from app.tasks.visualization import generate_visualization
+from app.tasks.visualization import generate_visualization, overview_level, rebin_window
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +104,7 @@ async def create_visualization(
         )
 
     series_docs = []
+    source_jobs: dict[str, dict] = {}
     for idx, item in enumerate(payload.series, start=1):
         job = await ingestions.get_job(item.job_id)
         if not job or job["project_id"] != payload.project_id:
@@ -129,6 +135,7 @@ async def create_visualization(
         "dataset_type": job.get("dataset_type"),
         }
     )
+        source_jobs[item.job_id] = job
 
 
     primary_filename = series_docs[0]["filename"] if series_docs else "dataset"
@@ -141,7 +148,12 @@ async def create_visualization(
         series_docs,
         filename=primary_filename,
     )
-    generate_visualization.delay(viz_id)
+    source_bytes = sum(job.get("size_bytes") or 0 for job in source_jobs.values())
+    generate_visualization.apply_async(
+        (viz_id,),
+        queue=queue_for(source_bytes, sum(job.get("rows_seen") or 0 for job in source_jobs.values())),
+        headers={"memory_estimate": estimate_task_memory(source_bytes)},
+    )
     doc = _with_series(await repo.get(viz_id))
     return VisualizationOut(**doc)
 
@@ -188,7 +200,7 @@ async def get_visualization_tile(
     viz_id: str,
     user: CurrentUser = Depends(get_current_user),
     series: int = Query(default=0, ge=0, description="Series index to retrieve"),
-    level: int | None = Query(default=None, description="Tile level (bins) to read"),
+    level: int | None = Query(default=None, description="Tile level (bins) to read; defaults to the overview level"),
     x_min: float | None = Query(default=None, description="Lower x bound for filtering"),
     x_max: float | None = Query(default=None, description="Upper x bound for filtering"),
 ):
@@ -203,7 +215,8 @@ async def get_visualization_tile(
         raise HTTPException(status_code=400, detail="Series index out of range")
 
     series_tiles = hydrated["tiles"][series]["tiles"]
-    chosen_level = level or min(tile["level"] for tile in series_tiles)
+    # same level as the figure's overview trace
+    chosen_level = level or overview_level(tile["level"] for tile in series_tiles)
     chosen = next((tile for tile in series_tiles if tile["level"] == chosen_level), None)
     if not chosen:
         raise HTTPException(status_code=404, detail="Requested tile not found")
@@ -232,6 +245,55 @@ async def get_visualization_tile(
     }
 
 
+@router.get("/{viz_id}/zoom")
+async def get_visualization_zoom(
+    viz_id: str,
+    user: CurrentUser = Depends(get_current_user),
+    series: int = Query(default=0, ge=0, description="Series index to retrieve"),
+    x_min: float = Query(..., description="Lower x bound of the window"),
+    x_max: float = Query(..., description="Upper x bound of the window"),
+    bins: int = Query(default=1000, ge=1, le=settings.visualization_zoom_max_bins, description="Bins across the window"),
+):
+    """Re-bin the processed dataset for any x window, instead of filtering a precomputed tile."""
+    if not (math.isfinite(x_min) and math.isfinite(x_max)):
+        raise HTTPException(status_code=400, detail="x_min and x_max must be finite")
+    if x_max <= x_min:
+        raise HTTPException(status_code=400, detail="x_max must be greater than x_min")
+    doc = await repo.get(viz_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Visualization not found")
+    await _ensure_member(doc["project_id"], user)
+    prepared = _with_series(doc)
+    series_list = prepared.get("series") or []
+    if series >= len(series_list):
+        raise HTTPException(status_code=400, detail="Series index out of range")
+    chosen = series_list[series]
+    job = await ingestions.get_job(chosen["job_id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    loop = asyncio.get_running_loop()
+    try:
+        frame, info = await loop.run_in_executor(
+            None,
+            partial(rebin_window, get_minio_client(), job, doc["x_axis"], chosen["y_axis"], x_min, x_max, bins),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except KeyError as exc:
+        raise HTTPException(status_code=400, detail=exc.args[0]) from exc
+
+    return {
+        "series": chosen,
+        "x_min": x_min,
+        "x_max": x_max,
+        "bins": bins,
+        "rows": len(frame),
+        **info,
+        "data": frame.to_dict(orient="records"),
+    }
+
+
 @router.get("/{viz_id}/status", response_model=VisualizationStatus)
 async def visualization_status(
     viz_id: str, user: CurrentUser = Depends(get_current_user)
@@ -1,30 +1,68 @@
 
 
+import io
 import json
+import logging
 import os
 import tempfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
+from itertools import chain, islice
 
+import numpy as np
 import pandas as pd
 from bson import ObjectId
 from celery import states
+from redis.exceptions import LockError
 
 try:
     import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
     import pyarrow.parquet as pq
 except Exception:  # noqa
     pa = None
+    pc = None
+    pacsv = None
     pq = None
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
 from app.core.minio_client import get_minio_client
+from app.core.minio_streams import (
+    UPLOAD_PART_SIZE,
+    MultipartUploadWriter,
+    ObjectRangeFile,
+    ObjectUploadStream,
+    abort_multipart_upload,
+    multipart_part_size,
+    object_range_reader,
+    open_object,
+)
 from app.core.redis_client import get_sync_redis
+from app.core.system_info import MemoryBudget
 from app.db.sync_mongo import get_sync_db
 from app.repositories.notifications import create_sync_notification
+from app.tasks.stats import StatsAccumulator
 
+logger = logging.getLogger(__name__)
 
 TABULAR_EXTS = {".csv", ".xlsx", ".xls",'.txt'}
+# starting sizes; once a chunk has been measured, MemoryBudget takes over
+CSV_CHUNK_ROWS = 200_000
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+CSV_MIN_BLOCK_SIZE = 1024 * 1024
+CSV_MAX_BLOCK_SIZE = 64 * 1024 * 1024
+CSV_ALIGN_WINDOW = 64 * 1024
+EXCEL_ROW_GROUP_ROWS = 50_000
+WIND_TXT_CHUNK_ROWS = 200_000
+# Excel cells and wind text lines are held as Python objects before they
+# become Arrow arrays, which takes several times the Arrow size
+PY_OBJECT_OVERHEAD = 8
 
 
 def _set_status(redis, job_id: str, status: str, progress: int, message: str):
@@ -36,6 +74,55 @@ def _set_status(redis, job_id: str, status: str, progress: int, message: str):
     pipe.execute()
 
 
+def parse_flavor(filename: str, dataset_type: str | None) -> str:
+    """Which parser a file goes through: ``csv``, ``wind_txt`` or ``excel``.
+
+    Part of the dedup key for processed artifacts, since the same bytes give
+    different Parquet output depending on the parser.
+    """
+    ext = os.path.splitext((filename or "").lower())[-1]
+    if ext == ".csv":
+        return "csv"
+    if dataset_type == "wind" and ext == ".txt":
+        return "wind_txt"
+    return "excel"
+
+
+def _register_artifact(db, job_id: str, job_doc: dict, result: dict):
+    # First successful job for a content hash owns the shared artifact; a
+    # concurrent duplicate that lost the race keeps its own objects.
+    if not job_doc.get("content_hash"):
+        return
+    now = datetime.utcnow()
+    res = db.ingestion_artifacts.update_one(
+        {
+            "project_id": job_doc.get("project_id"),
+            "content_hash": job_doc["content_hash"],
+            "parse_flavor": job_doc.get("parse_flavor"),
+            "header_mode": result["header_mode"],
+            "custom_headers": result["custom_headers"],
+            "precision": job_doc.get("precision"),
+        },
+        {"$setOnInsert": {
+            "storage_key": job_doc.get("storage_key"),
+            "processed_key": result["processed_key"],
+            "columns": result["columns"],
+            "rows_seen": result["rows_seen"],
+            "sample_rows": result["sample_rows"],
+            "metadata": result["metadata"],
+            "refcount": 1,
+            "created_at": now,
+            "updated_at": now,
+        }},
+        upsert=True,
+    )
+    if res.upserted_id is not None:
+        db.ingestion_jobs.update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {"artifact_id": str(res.upserted_id)}},
+        )
+
+
 def _publish(job_id: str, status: str, progress: int, message: str = ""):
     redis = get_sync_redis()
     payload = json.dumps({"status": status, "progress": progress, "message": message or status})
@@ -60,82 +147,659 @@ def _clean_excel_df(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _apply_header_mode(df: pd.DataFrame, header_mode: str, custom_headers: list[str] | None):
+def _header_names(detected: list, header_mode: str, custom_headers: list[str] | None) -> list:
+    # Resolve final column names for a header_mode, given the detected ones.
     if header_mode == "none" and not custom_headers:
-        df.columns = [f"column_{i+1}" for i in range(len(df.columns))]
-    elif header_mode == "custom":
+        return [f"column_{i+1}" for i in range(len(detected))]
+    if header_mode == "custom":
         if not custom_headers:
             raise ValueError("custom_headers required when header_mode=custom")
-        if len(custom_headers) != len(df.columns):
+        if len(custom_headers) != len(detected):
             raise ValueError("Number of custom headers does not match detected columns")
-        df.columns = custom_headers
+        return list(custom_headers)
+    return list(detected)
+
+
+def _apply_header_mode(df: pd.DataFrame, header_mode: str, custom_headers: list[str] | None):
+    df.columns = _header_names(list(df.columns), header_mode, custom_headers)
     return df
 
 
-def _update_numeric_stats(stats: dict, df: pd.DataFrame):
-    # stats[col] = {min, max}
-    for col in df.columns:
-        s = pd.to_numeric(df[col], errors="coerce")
-        if s.notna().any():
-            mn = float(s.min())
-            mx = float(s.max())
-            if col not in stats:
-                stats[col] = {"min": mn, "max": mx}
-            else:
-                stats[col]["min"] = min(stats[col]["min"], mn)
-                stats[col]["max"] = max(stats[col]["max"], mx)
+class PrecisionConflict(Exception):
+    """Values in a later row group do not fit the types chosen for their columns."""
+
+    def __init__(self, columns: list[str]):
+        super().__init__(f"values do not fit the narrowed type of: {', '.join(columns)}")
+        self.columns = columns
+
+
+class _DoesNotFit(Exception):
+    pass
+
+
+_NARROW_INT_TYPES = (("int8", np.int8), ("int16", np.int16), ("int32", np.int32))
+
+
+def _type_name(data_type) -> str:
+    if pa.types.is_floating(data_type):
+        return f"float{data_type.bit_width}"
+    return str(data_type)
+
+
+def precision_mode(dataset_type: str | None, requested: str | None = None) -> str:
+    """Precision mode for a job: the upload's choice, else the dataset type's, else the default."""
+    mode = requested or settings.ingestion_precision_by_dataset_type.get(dataset_type or "") or settings.ingestion_precision
+    if mode not in ColumnPrecision.MODES:
+        raise ValueError(f"precision must be one of: {', '.join(ColumnPrecision.MODES)}")
+    return mode
+
+
+class ColumnPrecision:
+    """Narrower storage types for numeric columns.
+
+    ``off`` keeps the parsed types. ``int`` stores integer columns, and float
+    columns holding only whole numbers, in the narrowest of int8/16/32 that
+    fits; this is lossless. ``float32`` does the same and also stores other
+    float64 columns as float32 when the relative error stays within
+    ``max_rel_error``; the largest error actually seen is recorded.
+
+    Types are chosen from the first row group a writer flushes and then shared
+    by every writer using this object (e.g. all checkpoint segments of a
+    file). A later row group that does not fit raises ``PrecisionConflict``,
+    and the job is converted again with those columns kept as parsed.
+    """
+
+    MODES = ("off", "int", "float32")
+
+    def __init__(self, mode: str | None = None, max_rel_error: float | None = None, keep=()):
+        self.mode = mode or "off"
+        self.max_rel_error = (
+            max_rel_error if max_rel_error is not None else settings.ingestion_float32_max_rel_error
+        )
+        self.keep = set(keep)
+        self.types: dict | None = None  # narrowed columns only; None until chosen
+        self.errors: dict[str, float] = {}
+        self.column_types: dict[str, str] = {}
+
+    def target_schema(self, schema, sample):
+        if self.types is None:
+            self.types = {}
+            for field in schema:
+                if self.mode != "off" and field.name not in self.keep:
+                    self._choose(field, sample.column(field.name))
+        target = pa.schema([field.with_type(self.types.get(field.name, field.type)) for field in schema])
+        self.column_types = {field.name: _type_name(field.type) for field in target}
+        return target
+
+    def _choose(self, field, column):
+        values = None
+        if pa.types.is_floating(field.type):
+            values = column.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+            finite = values[~np.isnan(values)]
+            whole = finite.size and np.isfinite(finite).all() and (finite == np.round(finite)).all()
+            lo, hi = (finite.min(), finite.max()) if whole else (None, None)
+        elif pa.types.is_integer(field.type):
+            bounds = pc.min_max(column)
+            lo, hi = bounds["min"].as_py(), bounds["max"].as_py()
+        else:
+            return
+        if lo is not None:
+            for name, np_type in _NARROW_INT_TYPES:
+                info = np.iinfo(np_type)
+                if info.min <= lo and hi <= info.max and info.bits < field.type.bit_width:
+                    self.types[field.name] = pa.type_for_alias(name)
+                    return
+        if self.mode == "float32" and pa.types.is_float64(field.type):
+            try:
+                self.errors[field.name] = self._float32_error(values)
+            except _DoesNotFit:
+                return
+            self.types[field.name] = pa.float32()
+
+    def _float32_error(self, values) -> float:
+        finite = np.isfinite(values)
+        narrowed = values.astype(np.float32)
+        if not np.isfinite(narrowed[finite]).all():
+            raise _DoesNotFit()
+        nonzero = finite & (values != 0)
+        if not nonzero.any():
+            return 0.0
+        exact = values[nonzero]
+        error = float(np.max(np.abs(narrowed[nonzero].astype(np.float64) - exact) / np.abs(exact)))
+        if error > self.max_rel_error:
+            raise _DoesNotFit()
+        return error
+
+    def cast(self, table):
+        if not self.types:
+            return table
+        columns, conflicts = [], []
+        for name, column in zip(table.column_names, table.columns):
+            target = self.types.get(name, column.type)
+            try:
+                columns.append(column if column.type == target else self._cast_column(name, column, target))
+            except _DoesNotFit:
+                conflicts.append(name)
+        if conflicts:
+            raise PrecisionConflict(conflicts)
+        return pa.Table.from_arrays(columns, names=table.column_names)
+
+    def _cast_column(self, name: str, column, target):
+        if pa.types.is_float32(target):
+            values = column.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+            self.errors[name] = max(self.errors.get(name, 0.0), self._float32_error(values))
+            return column.cast(target, safe=False)
+
+        info = np.iinfo(target.to_pandas_dtype())
+        if pa.types.is_integer(column.type):
+            bounds = pc.min_max(column)
+            lo, hi = bounds["min"].as_py(), bounds["max"].as_py()
+            if lo is not None and (lo < info.min or hi > info.max):
+                raise _DoesNotFit()
+            return column.cast(target)
+
+        values = column.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+        missing = np.isnan(values)
+        present = values[~missing]
+        if present.size and (
+            not np.isfinite(present).all()
+            or (present != np.round(present)).any()
+            or present.min() < info.min
+            or present.max() > info.max
+        ):
+            raise _DoesNotFit()
+        return pa.array(np.where(missing, 0, values).astype(info.dtype), mask=missing, type=target)
+
+    def keep_columns(self, columns):
+        """Keep ``columns`` as parsed and choose all types again."""
+        self.keep.update(columns)
+        self.types = None
+        self.errors = {}
+        self.column_types = {}
+
+    def rename(self, names: dict[str, str]):
+        """Follow a rename of written columns; columns missing from ``names`` were dropped."""
+        self.types = None if self.types is None else {names[k]: v for k, v in self.types.items() if k in names}
+        self.errors = {names[k]: v for k, v in self.errors.items() if k in names}
+        self.column_types = {names[k]: v for k, v in self.column_types.items() if k in names}
+
+    def describe(self) -> dict:
+        return {
+            "mode": self.mode,
+            "max_rel_error": {name: error for name, error in self.errors.items() if name in self.column_types},
+            "kept": sorted(self.keep),
+        }
+
+    def to_state(self) -> dict:
+        return {
+            "mode": self.mode,
+            "keep": sorted(self.keep),
+            "types": None if self.types is None else {k: str(v) for k, v in self.types.items()},
+            "errors": self.errors,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ColumnPrecision":
+        precision = cls(state.get("mode"), keep=state.get("keep") or ())
+        if state.get("types") is not None:
+            precision.types = {k: pa.type_for_alias(v) for k, v in state["types"].items()}
+        precision.errors = dict(state.get("errors") or {})
+        return precision
+
+
+class ParquetLayout:
+    """How processed Parquet files are laid out for later reads.
+
+    Visualization, preview and tile building read processed files by row
+    group, so the layout trades a little write time for files those readers
+    can prune: fixed-size row groups with min/max statistics, a page index
+    (column and offset index), zstd compression, dictionary encoding only for
+    columns that are actually low-cardinality, and optionally each row group
+    sorted by a key column (declared as ``sorting_columns``). Defaults come
+    from the ``INGESTION_PARQUET_*`` settings. ``precision`` narrows numeric
+    column types per job (see ``ColumnPrecision``). ``memory`` sizes the
+    chunks converters read and caps row groups on wide files so the buffered
+    group fits the task's ``MemoryBudget``.
+    """
+
+    def __init__(
+        self,
+        row_group_rows: int | None = None,
+        compression: str | None = None,
+        compression_level: int | None = None,
+        dictionary_ratio: float | None = None,
+        page_index: bool | None = None,
+        sort_column: str | None = None,
+        precision: ColumnPrecision | None = None,
+        memory: MemoryBudget | None = None,
+    ):
+        self.row_group_rows = row_group_rows or settings.ingestion_parquet_row_group_rows
+        self.compression = compression or settings.ingestion_parquet_compression
+        self.compression_level = (
+            compression_level if compression_level is not None else settings.ingestion_parquet_compression_level
+        )
+        self.dictionary_ratio = (
+            dictionary_ratio if dictionary_ratio is not None else settings.ingestion_parquet_dictionary_ratio
+        )
+        self.page_index = page_index if page_index is not None else settings.ingestion_parquet_page_index
+        self.sort_column = sort_column if sort_column is not None else settings.ingestion_parquet_sort_column
+        self.precision = precision or ColumnPrecision()
+        self.memory = memory or MemoryBudget()
+
+    def group_rows(self) -> int:
+        # half the budget: the buffered group plus its sorted/encoded copy
+        return min(self.row_group_rows, self.memory.rows("row_group_rows", self.row_group_rows, share=2))
+
+    def resolve_sort_column(self, schema) -> str | None:
+        if self.sort_column == "auto":
+            return next((f.name for f in schema if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)), None)
+        return self.sort_column if self.sort_column in schema.names else None
+
+    def dictionary_columns(self, table) -> list[str]:
+        rows = max(table.num_rows, 1)
+        return [
+            name for name, column in zip(table.column_names, table.columns)
+            if pc.count_distinct(column).as_py() / rows <= self.dictionary_ratio
+        ]
+
+    def compression_level_for(self, codec: str) -> int | None:
+        return self.compression_level if codec in ("zstd", "gzip", "brotli") else None
+
+
+class LayoutParquetWriter:
+    """``pq.ParquetWriter`` drop-in that applies a ``ParquetLayout``.
+
+    Incoming batches are buffered into row groups of ``row_group_rows`` (fewer
+    when the rows are too wide for the task's memory budget); the
+    underlying writer is opened on the first full row group so dictionary
+    encoding and narrowed column types can be chosen from real data.
+    """
+
+    def __init__(self, where, schema, layout: ParquetLayout | None = None):
+        self.where = where
+        self.schema = schema
+        self.layout = layout or ParquetLayout()
+        self.sort_column = self.layout.resolve_sort_column(schema)
+        self.target_schema = schema
+        self._writer = None
+        self._pending: list = []
+        self._pending_rows = 0
+
+    def write_batch(self, batch):
+        self.write_table(pa.Table.from_batches([batch]))
+
+    def write_table(self, table):
+        if table.num_rows:
+            self._pending.append(table)
+            self._pending_rows += table.num_rows
+            self.layout.memory.observe("row_group_rows", table.num_rows, table.nbytes)
+        group_rows = self.layout.group_rows()
+        while self._pending_rows >= group_rows:
+            self._flush(group_rows)
+
+    def _flush(self, rows: int):
+        table = pa.concat_tables(self._pending)
+        head, rest = table.slice(0, rows), table.slice(rows)
+        self._pending = [rest] if rest.num_rows else []
+        self._pending_rows = rest.num_rows
+        if self.sort_column is not None:
+            head = head.take(pc.sort_indices(head, sort_keys=[(self.sort_column, "ascending")]))
+        self._open(head)
+        head = self.layout.precision.cast(head)
+        self._writer.write_table(head, row_group_size=max(head.num_rows, 1))
+
+    def _open(self, sample):
+        if self._writer is not None:
+            return
+        layout = self.layout
+        self.target_schema = layout.precision.target_schema(self.schema, sample)
+        options = {}
+        if self.sort_column is not None:
+            options["sorting_columns"] = [pq.SortingColumn(self.schema.get_field_index(self.sort_column))]
+        self._writer = pq.ParquetWriter(
+            self.where,
+            self.target_schema,
+            compression=layout.compression,
+            compression_level=layout.compression_level_for(layout.compression),
+            use_dictionary=layout.dictionary_columns(sample),
+            write_statistics=True,
+            write_page_index=layout.page_index,
+            **options,
+        )
+
+    def close(self):
+        try:
+            if self._pending_rows:
+                self._flush(self._pending_rows)
+            self._open(self.schema.empty_table())
+        except BaseException:
+            self.abort()
+            raise
+        self._writer.close()
+
+    @property
+    def metadata(self):
+        """``FileMetaData`` of the written file, once closed."""
+        return self._writer.writer.metadata
+
+    def abort(self):
+        """Drop buffered rows and release the writer without reporting close errors.
+
+        The output is discarded, but the ``pq.ParquetWriter`` must still be
+        closed now; otherwise its ``__del__`` writes a footer into a sink
+        that may already be aborted.
+        """
+        self._pending = []
+        self._pending_rows = 0
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:  # noqa: BLE001 - the original error is what matters
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            # do not convert what is still buffered while an error propagates
+            self.abort()
+        else:
+            self.close()
+        return False
+
+
+def _csv_to_parquet(
+    csv_path: str,
+    parquet_path: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    engine: str | None = None,
+    layout: ParquetLayout | None = None,
+):
+    """Convert a CSV file to Parquet with the configured engine.
+
+    ``arrow`` (default) streams multithreaded pyarrow record batches straight
+    into the Parquet writer. If Arrow rejects the file (e.g. a later block does
+    not fit the types inferred from the first one) we redo it with pandas.
+    """
+    engine = (engine or settings.ingestion_csv_engine).lower()
+    if engine == "arrow" and pacsv is not None:
+        size = os.path.getsize(csv_path)
+        if size >= settings.ingestion_parallel_min_bytes:
+            try:
+                return _csv_to_parquet_parallel(
+                    _file_range_reader(csv_path), size, parquet_path, header_mode, custom_headers, layout=layout
+                )
+            except pa.ArrowInvalid as exc:
+                logger.warning("Parallel CSV ingest failed for %s, retrying serially: %s", csv_path, exc)
+        try:
+            return _csv_to_parquet_arrow(csv_path, parquet_path, header_mode, custom_headers, layout)
+        except pa.ArrowInvalid as exc:
+            logger.warning("Arrow CSV engine failed for %s, falling back to pandas: %s", csv_path, exc)
+    return _csv_to_parquet_pandas(csv_path, parquet_path, header_mode, custom_headers, layout)
+
+
+def _csv_to_parquet_arrow(
+    csv_path: str,
+    parquet_path: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    layout: ParquetLayout | None = None,
+):
+    layout = layout or ParquetLayout()
+    no_header = header_mode in ("none", "custom")
+    # blocks are parsed on every Arrow CPU thread at once
+    block_size = layout.memory.bytes(
+        "csv_block_bytes", CSV_MIN_BLOCK_SIZE, CSV_MAX_BLOCK_SIZE,
+        share=MemoryBudget.CHUNK_SHARE * pa.cpu_count(),
+    )
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(
+            use_threads=True,
+            block_size=block_size,
+            autogenerate_column_names=no_header,
+        ),
+    )
+    # Schema is fixed by the first block; later blocks must convert to it.
+    detected = [str(i) for i in range(len(reader.schema))] if no_header else reader.schema.names
+    columns = _header_names(detected, header_mode, custom_headers)
+    schema = pa.schema([field.with_name(name) for field, name in zip(reader.schema, columns)])
+
+    stats = StatsAccumulator()
+    rows = 0
+    sample_rows = []
+    with LayoutParquetWriter(parquet_path, schema, layout) as writer:
+        for batch in reader:
+            batch = pa.RecordBatch.from_arrays(batch.columns, schema=schema)
+            writer.write_batch(batch)
+            stats.update(batch)
+            if len(sample_rows) < 10:
+                sample_rows.extend(batch.slice(0, 10 - len(sample_rows)).to_pylist())
+            rows += batch.num_rows
+
+    return columns, rows, sample_rows, stats.to_dict()
+
+
+def _file_range_reader(path: str):
+    def read_range(offset: int, length: int) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    return read_range
+
+
+def _align_to_newline(read_range, pos: int, size: int) -> int:
+    # First offset after the newline at or following pos (or size).
+    while pos < size:
+        window = read_range(pos, CSV_ALIGN_WINDOW)
+        idx = window.find(b"\n")
+        if idx >= 0:
+            return pos + idx + 1
+        pos += len(window)
+    return size
+
+
+def _csv_byte_ranges(read_range, start: int, size: int, range_bytes: int) -> list[tuple[int, int]]:
+    if start >= size:
+        return []
+    bounds = [start]
+    nominal = start + range_bytes
+    while nominal < size:
+        boundary = _align_to_newline(read_range, nominal, size)
+        if boundary >= size:
+            break
+        bounds.append(boundary)
+        nominal = boundary + range_bytes
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
 
 
-def _csv_to_parquet(csv_path: str, parquet_path: str, header_mode: str, custom_headers: list[str] | None):
+def _csv_to_parquet_parallel(
+    read_range,
+    size: int,
+    parquet_path: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    range_bytes: int | None = None,
+    workers: int | None = None,
+    layout: ParquetLayout | None = None,
+):
+    """Parse a large CSV as newline-aligned byte ranges on a thread pool.
+
+    ``read_range(offset, length)`` returns raw bytes, so ranges can come from a
+    local file or straight from the object store. Column names and types are
+    fixed from the first block and handed to every range, each range is parsed
+    (and its stats collected) on its own thread, and the resulting parts are
+    written to a single Parquet file in order with merged statistics. Arrow's
+    CSV parser releases the GIL, so this scales across cores without a process
+    pool (Celery prefork children cannot start one).
+
+    Quoted fields containing newlines are not supported; such files raise
+    ``pa.ArrowInvalid`` and callers fall back to the serial reader.
+    """
+    layout = layout or ParquetLayout()
+    workers = workers or settings.ingestion_parallel_workers or os.cpu_count() or 2
+    if range_bytes is None:
+        # two ranges per worker are in flight, each as raw bytes and a parsed table
+        range_bytes = layout.memory.bytes(
+            "parallel_range_bytes", CSV_MIN_BLOCK_SIZE, settings.ingestion_parallel_range_bytes, share=4 * workers
+        )
+    probe = _csv_probe(read_range, size, header_mode, custom_headers)
+    ranges = _csv_byte_ranges(read_range, probe["data_start"], size, range_bytes)
+
+    stats = StatsAccumulator()
+    rows = 0
+    sample_rows = []
+    with LayoutParquetWriter(parquet_path, probe["schema"], layout) as writer:
+        for table, part_stats, _ in _csv_parse_ranges(read_range, ranges, probe, workers):
+            writer.write_table(table)
+            stats.merge(part_stats)
+            if len(sample_rows) < 10:
+                sample_rows.extend(table.slice(0, 10 - len(sample_rows)).to_pylist())
+            rows += table.num_rows
+
+    return probe["columns"], rows, sample_rows, stats.to_dict()
+
+
+def _csv_probe(read_range, size: int, header_mode: str, custom_headers: list[str] | None) -> dict:
+    # Fix names and types from the first block, for parsing ranges independently.
+    no_header = header_mode in ("none", "custom")
+    head = read_range(0, min(size, CSV_BLOCK_SIZE))
+    cut = head.rfind(b"\n") + 1 if size > len(head) else len(head)
+    probe = pacsv.read_csv(
+        pa.py_buffer(head[:cut] if cut else head),
+        read_options=pacsv.ReadOptions(autogenerate_column_names=no_header),
+    )
+    raw_names = [str(i) for i in range(probe.num_columns)] if no_header else probe.schema.names
+    columns = _header_names(raw_names, header_mode, custom_headers)
+    # columns empty in the first block are typed as float (sparse channels)
+    types = [pa.float64() if pa.types.is_null(field.type) else field.type for field in probe.schema]
+    return {
+        "raw_names": raw_names,
+        "columns": columns,
+        "schema": pa.schema(list(zip(columns, types))),
+        "data_start": 0 if no_header else _align_to_newline(read_range, 0, size),
+    }
+
+
+def _csv_parse_ranges(read_range, ranges: list[tuple[int, int]], probe: dict, workers: int | None = None):
+    """Yield ``(table, stats, end_offset)`` for each byte range, in file order."""
+    workers = workers or settings.ingestion_parallel_workers or os.cpu_count() or 2
+    raw_names = probe["raw_names"]
+    schema = probe["schema"]
+    column_types = dict(zip(raw_names, schema.types))
+
+    def parse(bounds: tuple[int, int]):
+        start, end = bounds
+        table = pacsv.read_csv(
+            pa.py_buffer(read_range(start, end - start)),
+            read_options=pacsv.ReadOptions(column_names=raw_names, use_threads=False),
+            convert_options=pacsv.ConvertOptions(column_types=column_types),
+        )
+        table = pa.Table.from_arrays(table.columns, schema=schema)
+        part_stats = StatsAccumulator()
+        part_stats.update(table)
+        return table, part_stats, end
+
+    ranges = deque(ranges)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # keep a bounded window of ranges in flight and hand parts out in order
+        pending = deque()
+        while ranges or pending:
+            while ranges and len(pending) < workers * 2:
+                pending.append(pool.submit(parse, ranges.popleft()))
+            yield pending.popleft().result()
+
+
+def _sized_chunks(reader, memory: MemoryBudget, name: str, default: int):
+    # TextFileReader.get_chunk takes a new size on every call
+    with reader:
+        while True:
+            try:
+                chunk = reader.get_chunk(memory.rows(name, default))
+            except StopIteration:
+                return
+            memory.observe(name, len(chunk), chunk.memory_usage(index=False, deep=True).sum())
+            yield chunk
+
+
+def _csv_to_parquet_pandas(
+    csv_path: str,
+    parquet_path: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    layout: ParquetLayout | None = None,
+):
     # Use chunking to avoid loading the whole file
+    layout = layout or ParquetLayout()
     read_kwargs = {}
     if header_mode in ("none", "custom"):
         read_kwargs["header"] = None
     else:
         read_kwargs["header"] = 0
 
-    chunks = pd.read_csv(csv_path, chunksize=200_000, **read_kwargs)
+    reader = pd.read_csv(csv_path, chunksize=CSV_CHUNK_ROWS, **read_kwargs)
+    chunks = _sized_chunks(reader, layout.memory, "csv_chunk_rows", CSV_CHUNK_ROWS)
 
     writer = None
-    stats = {}
+    stats = StatsAccumulator()
     columns = None
     rows = 0
     sample_rows = None
 
-    for i, chunk in enumerate(chunks):
-        chunk = _apply_header_mode(chunk, header_mode, custom_headers)
-        if columns is None:
-            columns = list(chunk.columns)
-            sample_rows = chunk.head(10).to_dict(orient="records")
-
-        _update_numeric_stats(stats, chunk)
-        rows += len(chunk)
+    # the writer is opened on the first chunk; the stack closes it (or drops it on error)
+    with ExitStack() as stack:
+        for chunk in chunks:
+            chunk = _apply_header_mode(chunk, header_mode, custom_headers)
+            if columns is None:
+                columns = list(chunk.columns)
+                sample_rows = chunk.head(10).to_dict(orient="records")
 
-        if pa and pq:
             table = pa.Table.from_pandas(chunk, preserve_index=False)
             if writer is None:
-                writer = pq.ParquetWriter(parquet_path, table.schema, compression="snappy")
+                writer = stack.enter_context(LayoutParquetWriter(parquet_path, table.schema, layout))
             writer.write_table(table)
-        else:
-            # fallback (less efficient): write once at end
-            # NOTE: if pyarrow missing, this will be memory heavy for big files.
-            pass
+            stats.update(table)
+            rows += len(chunk)
+
+    return columns or [], rows, sample_rows or [], stats.to_dict()
 
-    if writer:
-        writer.close()
-    else:
-        # fallback path: re-read fully (only OK for small files)
-        df = pd.read_csv(csv_path, **read_kwargs)
-        df = _apply_header_mode(df, header_mode, custom_headers)
-        _update_numeric_stats(stats, df)
-        rows = len(df)
-        sample_rows = df.head(10).to_dict(orient="records")
-        df.to_parquet(parquet_path, index=False)
 
-    return columns or [], rows, sample_rows or [], stats
+def _excel_to_parquet(
+    xls_path: str,
+    parquet_path: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    engine: str | None = None,
+    layout: ParquetLayout | None = None,
+):
+    """Convert the first sheet of a workbook to Parquet with the configured engine.
+
+    ``stream`` (default) walks .xlsx rows with openpyxl in read-only mode so
+    memory depends on the row-group size, not the sheet size. Legacy .xls
+    files, and sheets whose later rows do not fit the column types fixed by
+    the first row group, go through ``pd.read_excel`` instead.
+    """
+    engine = (engine or settings.ingestion_excel_engine).lower()
+    if engine == "stream" and pq is not None and zipfile.is_zipfile(xls_path):
+        try:
+            return _excel_to_parquet_stream(xls_path, parquet_path, header_mode, custom_headers, layout=layout)
+        except _ExcelTypeConflict as exc:
+            logger.warning("Streaming Excel reader failed for %s, falling back to pandas: %s", xls_path, exc)
+    return _excel_to_parquet_pandas(xls_path, parquet_path, header_mode, custom_headers, layout)
 
 
-def _excel_to_parquet(xls_path: str, parquet_path: str, header_mode: str, custom_headers: list[str] | None):
+def _excel_to_parquet_pandas(
+    xls_path: str,
+    parquet_path: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    layout: ParquetLayout | None = None,
+):
     # Always first sheet
     read_kwargs = {"sheet_name": 0}
     if header_mode in ("none", "custom"):
@@ -147,14 +811,205 @@ def _excel_to_parquet(xls_path: str, parquet_path: str, header_mode: str, custom
     df = _clean_excel_df(df)
     df = _apply_header_mode(df, header_mode, custom_headers)
 
-    stats = {}
-    _update_numeric_stats(stats, df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    stats = StatsAccumulator()
+    stats.update(table)
     columns = list(df.columns)
     rows = len(df)
     sample_rows = df.head(10).to_dict(orient="records")
 
-    df.to_parquet(parquet_path, index=False)
-    return columns, rows, sample_rows, stats
+    with LayoutParquetWriter(parquet_path, table.schema, layout) as writer:
+        writer.write_table(table)
+    return columns, rows, sample_rows, stats.to_dict()
+
+
+class _ExcelTypeConflict(Exception):
+    """Raised when a sheet cannot be streamed with a schema fixed up front."""
+
+
+_EXCEL_KIND_TYPES = {
+    "number": pa.float64() if pa else None,
+    "datetime": pa.timestamp("us") if pa else None,
+    "bool": pa.bool_() if pa else None,
+    "string": pa.string() if pa else None,
+}
+
+
+def _excel_header_names(row: tuple) -> list[str]:
+    # Same naming as pd.read_excel: blank -> "Unnamed: i", duplicates -> "name.1"
+    names = []
+    seen: dict[str, int] = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None or str(value).strip() == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen.setdefault(name, 0)
+        names.append(name)
+    return names
+
+
+def _excel_column_kind(values) -> str:
+    kind = None
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value_kind = "bool"
+        elif isinstance(value, (int, float)):
+            value_kind = "number"
+        elif isinstance(value, datetime):
+            value_kind = "datetime"
+        else:
+            value_kind = "string"
+        if kind is None:
+            kind = value_kind
+        elif kind != value_kind:
+            return "string"
+    # columns empty in the first row group are most often sparse channels
+    return kind or "number"
+
+
+def _excel_column_array(values, kind: str):
+    if kind == "string":
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+    try:
+        return pa.array(values, type=_EXCEL_KIND_TYPES[kind], from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+        raise _ExcelTypeConflict(str(exc)) from exc
+
+
+def _excel_rows(ws, ncols: int, min_row: int = 1):
+    # Yield rows padded to ncols. Blank rows are kept (like pandas) except at
+    # the end of the sheet, so they are only emitted once more data follows.
+    blank = (None,) * ncols
+    pending_blank = 0
+    for row in ws.iter_rows(min_row=min_row, values_only=True):
+        if all(v is None for v in row):
+            pending_blank += 1
+            continue
+        for _ in range(pending_blank):
+            yield blank
+        pending_blank = 0
+        if len(row) < ncols:
+            row = tuple(row) + (None,) * (ncols - len(row))
+        elif len(row) > ncols:
+            if any(v is not None for v in row[ncols:]):
+                raise _ExcelTypeConflict("row is wider than the first row of the sheet")
+            row = row[:ncols]
+        yield row
+
+
+def _rewrite_parquet_columns(parquet_path: str, indices: list[int], names: list[str]):
+    # Keep/rename columns of a local Parquet file one row group at a time.
+    # Column types were already narrowed when the file was first written.
+    tmp_path = f"{parquet_path}.rewrite"
+    with pq.ParquetFile(parquet_path) as src:
+        schema = pa.schema([src.schema_arrow.field(i).with_name(n) for i, n in zip(indices, names)])
+        with LayoutParquetWriter(tmp_path, schema) as writer:
+            for rg in range(src.num_row_groups):
+                table = src.read_row_group(rg)
+                writer.write_table(pa.Table.from_arrays([table.column(i) for i in indices], schema=schema))
+    os.replace(tmp_path, parquet_path)
+
+
+def _excel_to_parquet_stream(
+    xls_path: str,
+    parquet_path: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    row_group_rows: int = EXCEL_ROW_GROUP_ROWS,
+    layout: ParquetLayout | None = None,
+):
+    import openpyxl
+
+    layout = layout or ParquetLayout()
+
+    with open(xls_path, "rb") as fh:
+        wb = openpyxl.load_workbook(fh, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            first = next(ws.iter_rows(values_only=True, max_row=1), None)
+            if first is None:
+                pq.write_table(pa.table({}), parquet_path)
+                return [], 0, [], {}
+
+            ncols = len(first)
+            if header_mode in ("none", "custom"):
+                rows = _excel_rows(ws, ncols)
+                detected = [str(i) for i in range(ncols)]
+                unnamed = [False] * ncols
+            else:
+                rows = _excel_rows(ws, ncols, min_row=2)
+                detected = _excel_header_names(first)
+                unnamed = [name.lower().startswith("unnamed") for name in detected]
+
+            # Assume no column gets dropped; fixed up by a rewrite at the end.
+            try:
+                written = _header_names(detected, header_mode, custom_headers)
+            except ValueError:
+                written = detected
+            has_value = [False] * ncols
+            all_blank = [True] * ncols
+
+            writer = None
+            schema = None
+            kinds = None
+            stats = StatsAccumulator()
+            sample: list = []
+            sample_count = 0
+            row_count = 0
+            with ExitStack() as stack:
+                while True:
+                    block = list(islice(rows, layout.memory.rows("excel_block_rows", row_group_rows)))
+                    if not block:
+                        break
+                    cols = list(zip(*block))
+                    if kinds is None:
+                        kinds = [_excel_column_kind(c) for c in cols]
+                        schema = pa.schema([(n, _EXCEL_KIND_TYPES[k]) for n, k in zip(written, kinds)])
+                        writer = stack.enter_context(LayoutParquetWriter(parquet_path, schema, layout))
+                    batch = pa.RecordBatch.from_arrays(
+                        [_excel_column_array(c, k) for c, k in zip(cols, kinds)], schema=schema
+                    )
+                    writer.write_batch(batch)
+                    layout.memory.observe("excel_block_rows", batch.num_rows, batch.nbytes * PY_OBJECT_OVERHEAD)
+
+                    # track empty / blank columns on the fly, with the rules of _clean_excel_df
+                    for i, values in enumerate(cols):
+                        if not has_value[i] and any(v is not None for v in values):
+                            has_value[i] = True
+                        if unnamed[i] and all_blank[i]:
+                            # an empty cell reads as NaN there, which is not blank
+                            all_blank[i] = all(v is not None and not str(v).strip() for v in values)
+                    stats.update(batch)
+                    if sample_count < 10:
+                        sample.append(batch.slice(0, 10 - sample_count))
+                        sample_count += sample[-1].num_rows
+                    row_count += len(block)
+        finally:
+            wb.close()
+
+    if writer is None:
+        # header only
+        schema = pa.schema([(n, pa.float64()) for n in written])
+        pq.write_table(schema.empty_table(), parquet_path)
+
+    keep = [i for i in range(ncols) if has_value[i] and not (unnamed[i] and all_blank[i])]
+    columns = _header_names([detected[i] for i in keep], header_mode, custom_headers)
+    if keep != list(range(ncols)) or columns != written:
+        _rewrite_parquet_columns(parquet_path, keep, columns)
+        layout.precision.rename({written[i]: name for i, name in zip(keep, columns)})
+
+    raw_stats = stats.to_dict()
+    stats = {name: raw_stats[written[i]] for i, name in zip(keep, columns) if written[i] in raw_stats}
+    # preview the values as stored (numbers are double), not the raw cells
+    sample_rows = []
+    if sample:
+        head = pa.Table.from_batches(sample, schema=schema)
+        values = [head.column(i).to_pylist() for i in keep]
+        sample_rows = [{name: col[r] for name, col in zip(columns, values)} for r in range(head.num_rows)]
+    return columns, row_count, sample_rows, stats
 
 
 @celery_app.task(bind=True, name=f"{settings.celery_task_prefix}.ingest_file")
@@ -174,7 +1029,46 @@ def ingest_file(
     db = get_sync_db()
     minio = get_minio_client()
 
+    # acks_late redelivers a task whose worker died, and may also redeliver
+    # one that is still running; only one worker may own a job at a time
+    lock = _JobLock(redis, job_id)
+    if not lock.acquire():
+        job_doc = db.ingestion_jobs.find_one({"_id": ObjectId(job_id)}, {"status": 1}) or {}
+        if job_doc.get("status") == states.SUCCESS:
+            logger.info("Job %s already processed, ignoring redelivery", job_id)
+            return
+        logger.info("Job %s is being processed by another worker, retrying later", job_id)
+        # The owner renews the lock for as long as it runs and a dead owner's lock
+        # expires after one TTL, so waiting needs no retry limit; Celery's default
+        # of 3 would give up (and fail the job) while the owner is still working.
+        raise self.retry(countdown=settings.ingestion_lock_ttl_seconds, max_retries=None)
+    try:
+        _ingest(
+            redis, db, minio, job_id, bucket, storage_key, processed_key,
+            filename, header_mode, custom_headers, dataset_type, tag_name,
+        )
+    finally:
+        lock.release()
+
+
+def _ingest(
+    redis,
+    db,
+    minio,
+    job_id: str,
+    bucket: str,
+    storage_key: str,
+    processed_key: str,
+    filename: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    dataset_type: str | None,
+    tag_name: str | None,
+):
     job_doc = db.ingestion_jobs.find_one({"_id": ObjectId(job_id)}) or {}
+    if job_doc.get("status") == states.SUCCESS:
+        logger.info("Job %s already processed, ignoring redelivery", job_id)
+        return
     owner_email = job_doc.get("owner_email")
     project_id = job_doc.get("project_id")
     filename = job_doc.get("filename", filename)
@@ -187,85 +1081,74 @@ def ingest_file(
             {"$set": {"status": "stored", "progress": 100, "updated_at": datetime.utcnow()}},
         )
         _publish(job_id, states.SUCCESS, 100, "Stored (non-tabular)")
+        if job_doc.get("batch_id"):
+            record_batch_job(redis, job_doc["batch_id"], job_doc.get("size_bytes"), succeeded=True)
         return
 
-    raw_fd, raw_path = tempfile.mkstemp()
-    os.close(raw_fd)
-
-    parquet_fd, parquet_path = tempfile.mkstemp(suffix=".parquet")
-    os.close(parquet_fd)
+    checkpoint = _IngestCheckpoint(db, job_id, job_doc.get("checkpoint"))
+    if checkpoint.state:
+        logger.info("Resuming job %s from byte %s", job_id, checkpoint.state.get("offset"))
 
     try:
-        _publish(job_id, states.STARTED, 5, "Downloading raw file from MinIO")
-        response = minio.get_object(bucket, storage_key)
-        try:
-            with open(raw_path, "wb") as f:
-                for data in response.stream(1024 * 1024):
-                    f.write(data)
-        finally:
-            try:
-                response.close()
-            except Exception:
-                pass
-            try:
-                response.release_conn()
-            except Exception:
-                pass
-
-        _publish(job_id, states.STARTED, 35, "Materializing Parquet")
+        _publish(job_id, states.STARTED, 5, "Opening raw file in MinIO")
         db.ingestion_jobs.update_one(
             {"_id": ObjectId(job_id)},
-            {"$set": {"status": states.STARTED, "progress": 35, "updated_at": datetime.utcnow()}},
+            {"$set": {"status": states.STARTED, "progress": 5, "updated_at": datetime.utcnow()}},
         )
 
-        # if ext == ".csv":
-        #     columns, row_count, sample_rows, stats = _csv_to_parquet(
-        #         raw_path, parquet_path, header_mode, custom_headers
-        #     )
-        # else:
-        #     columns, row_count, sample_rows, stats = _excel_to_parquet(
-        #         raw_path, parquet_path, header_mode, custom_headers
-        #     )
-        
-        ## add functionlity for the wind tunnel txt also 
-        if dataset_type == "wind" and ext == ".txt":
-            columns, row_count, sample_rows, stats = _wind_txt_to_parquet(
-                raw_path, parquet_path, header_mode, custom_headers
-            )
-        elif ext == ".csv":
-            columns, row_count, sample_rows, stats = _csv_to_parquet(
-                raw_path, parquet_path, header_mode, custom_headers
-            )
-        else:
-            columns, row_count, sample_rows, stats = _excel_to_parquet(
-                raw_path, parquet_path, header_mode, custom_headers
-            )
-
-
-
-        _publish(job_id, states.STARTED, 80, "Uploading processed Parquet")
-        minio.fput_object(bucket, processed_key, parquet_path, content_type="application/octet-stream")
+        layout = ParquetLayout(precision=ColumnPrecision(job_doc.get("precision")))
+        while True:
+            try:
+                if parse_flavor(filename, dataset_type) in ("csv", "wind_txt"):
+                    _publish(job_id, states.STARTED, 35, "Streaming raw file into Parquet")
+                    columns, row_count, sample_rows, stats = _stream_to_parquet(
+                        minio, bucket, storage_key, processed_key, ext, dataset_type, header_mode, custom_headers,
+                        checkpoint=checkpoint, layout=layout,
+                    )
+                else:
+                    columns, row_count, sample_rows, stats = _spill_to_parquet(
+                        minio, bucket, storage_key, processed_key, job_id, header_mode, custom_headers, layout
+                    )
+                break
+            except PrecisionConflict as exc:
+                # types chosen from the first row group were too narrow
+                logger.info("Job %s: %s; converting again with those columns kept", job_id, exc)
+                checkpoint.discard(minio, bucket)
+                layout.precision.keep_columns(exc.columns)
 
         _publish(job_id, states.SUCCESS, 100, "Upload + processing complete")
+        result = {
+            "processed_key": processed_key,
+            "columns": columns,
+            "rows_seen": row_count,
+            "sample_rows": sample_rows,
+            "metadata": {
+                "stats": stats,
+                "column_types": layout.precision.column_types,
+                "precision": layout.precision.describe(),
+                "memory": layout.memory.describe(),
+            },
+            "header_mode": header_mode,
+            "custom_headers": custom_headers,
+        }
         db.ingestion_jobs.update_one(
             {"_id": ObjectId(job_id)},
             {"$set": {
                 "status": states.SUCCESS,
                 "progress": 100,
-                "processed_key": processed_key,
-                "columns": columns,
-                "rows_seen": row_count,
-                "sample_rows": sample_rows,
-                "metadata": {"stats": stats},
+                **result,
                 "dataset_type": dataset_type,
                 "tag_name": tag_name,
-                "header_mode": header_mode,
-                "custom_headers": custom_headers,
                 "updated_at": datetime.utcnow(),
             }},
         )
+        checkpoint.discard(minio, bucket)
+        _register_artifact(db, job_id, job_doc, result)
 
-        if owner_email:
+        if job_doc.get("batch_id"):
+            # batches get one notification from finalize_ingestion_batch
+            record_batch_job(redis, job_doc["batch_id"], job_doc.get("size_bytes"), succeeded=True)
+        elif owner_email:
             create_sync_notification(
                 owner_email,
                 f"File processed for visualization: {filename}",
@@ -281,7 +1164,473 @@ def ingest_file(
             {"_id": ObjectId(job_id)},
             {"$set": {"status": states.FAILURE, "progress": 100, "message": str(exc), "updated_at": datetime.utcnow()}},
         )
+        checkpoint.discard(minio, bucket)
+        if job_doc.get("batch_id"):
+            record_batch_job(redis, job_doc["batch_id"], job_doc.get("size_bytes"), succeeded=False)
         raise
+
+
+# ---------- Batches ----------
+# Files in a batch are queued as their uploads finish, so the set of tasks is
+# not known up front as a chord header needs. Instead every finished job bumps
+# counters in one Redis hash and the job that completes the count queues
+# finalize_ingestion_batch (the chord callback).
+
+def _batch_status_key(batch_id: str) -> str:
+    return f"ingestion:batch:{batch_id}:status"
+
+
+def _batch_events_channel(batch_id: str) -> str:
+    return f"ingestion:batch:{batch_id}:events"
+
+
+def init_batch_progress(redis, batch_id: str, jobs_total: int, bytes_total: int):
+    redis.hset(_batch_status_key(batch_id), mapping={
+        "status": "queued",
+        "progress": 0,
+        "message": "",
+        "jobs_total": jobs_total,
+        "jobs_finished": 0,
+        "jobs_succeeded": 0,
+        "jobs_failed": 0,
+        "bytes_total": bytes_total,
+        "bytes_done": 0,
+    })
+
+
+def _batch_progress(snapshot: dict) -> int:
+    bytes_total = int(snapshot.get("bytes_total") or 0)
+    if bytes_total:
+        return min(100, int(snapshot.get("bytes_done") or 0) * 100 // bytes_total)
+    jobs_total = int(snapshot.get("jobs_total") or 0)
+    return int(snapshot.get("jobs_finished") or 0) * 100 // jobs_total if jobs_total else 100
+
+
+def record_batch_job(redis, batch_id: str, size_bytes: int | None, succeeded: bool):
+    """Count one finished job (processed, stored or failed) towards its batch."""
+    key = _batch_status_key(batch_id)
+    pipe = redis.pipeline()
+    pipe.hincrby(key, "jobs_succeeded" if succeeded else "jobs_failed", 1)
+    pipe.hincrby(key, "bytes_done", size_bytes or 0)
+    pipe.hincrby(key, "jobs_finished", 1)
+    pipe.hgetall(key)
+    *_, finished, snapshot = pipe.execute()
+
+    snapshot["progress"] = _batch_progress(snapshot)
+    snapshot["status"] = states.STARTED
+
+    def write_progress(tx):
+        # a slower job must not overwrite the final status
+        if tx.hget(key, "finalized"):
+            return
+        tx.multi()
+        tx.hset(key, mapping={"progress": snapshot["progress"], "status": snapshot["status"]})
+
+    redis.transaction(write_progress, key)
+    redis.publish(_batch_events_channel(batch_id), json.dumps(snapshot))
+    if finished == int(snapshot.get("jobs_total") or 0):
+        finalize_ingestion_batch.delay(batch_id)
+
+
+@celery_app.task(name=f"{settings.celery_task_prefix}.finalize_ingestion_batch")
+def finalize_ingestion_batch(batch_id: str):
+    redis = get_sync_redis()
+    db = get_sync_db()
+    key = _batch_status_key(batch_id)
+    if not redis.hsetnx(key, "finalized", 1):
+        return
+
+    snapshot = redis.hgetall(key)
+    total = int(snapshot.get("jobs_total") or 0)
+    succeeded = int(snapshot.get("jobs_succeeded") or 0)
+    failed = int(snapshot.get("jobs_failed") or 0)
+    status = states.FAILURE if failed else states.SUCCESS
+    message = f"{succeeded} of {total} files processed" + (f", {failed} failed" if failed else "")
+    redis.hset(key, mapping={"status": status, "progress": 100, "message": message})
+    redis.publish(_batch_events_channel(batch_id), json.dumps({**snapshot, "status": status, "progress": 100, "message": message}))
+
+    now = datetime.utcnow()
+    batch = db.ingestion_batches.find_one_and_update(
+        {"_id": batch_id},
+        {"$set": {
+            "status": status,
+            "progress": 100,
+            "message": message,
+            "jobs_succeeded": succeeded,
+            "jobs_failed": failed,
+            "bytes_done": int(snapshot.get("bytes_done") or 0),
+            "finished_at": now,
+            "updated_at": now,
+        }},
+    )
+    if batch and batch.get("owner_email"):
+        project_id = batch.get("project_id")
+        create_sync_notification(
+            batch["owner_email"],
+            f"Upload batch '{batch.get('tag_name')}' finished: {message}",
+            title="Upload batch processed",
+            category="ingestion",
+            link=f"/app/projects/{project_id}/data" if project_id else None,
+        )
+
+
+def _processed_sink(minio, bucket: str, processed_key: str) -> ObjectUploadStream:
+    return ObjectUploadStream(minio, bucket, processed_key, content_type="application/octet-stream")
+
+
+def _stream_to_parquet(
+    minio,
+    bucket: str,
+    storage_key: str,
+    processed_key: str,
+    ext: str,
+    dataset_type: str | None,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    engine: str | None = None,
+    checkpoint: "_IngestCheckpoint | None" = None,
+    layout: ParquetLayout | None = None,
+):
+    """Parse CSV / wind TXT straight from MinIO into a streamed Parquet upload.
+
+    The raw object is read from the ``get_object`` response (or with ranged
+    GETs for the parallel CSV parser) and the Parquet bytes go out through a
+    multipart upload while they are written, so neither file touches local
+    disk. A failed attempt aborts its upload before the next one starts; the
+    fallback order is the same as ``_csv_to_parquet``. With a ``checkpoint``,
+    CSVs large enough for the parallel parser are written in resumable
+    segments instead.
+    """
+    if dataset_type == "wind" and ext == ".txt":
+        with _processed_sink(minio, bucket, processed_key) as sink, open_object(
+            minio, bucket, storage_key
+        ) as response:
+            return _wind_txt_to_parquet(response, sink, header_mode, custom_headers, layout=layout)
+
+    engine = (engine or settings.ingestion_csv_engine).lower()
+    if engine == "arrow" and pacsv is not None:
+        size = minio.stat_object(bucket, storage_key).size
+        # Checkpoints are written by the byte-range parser, so they only apply
+        # to files large enough for it: it cannot handle quoted newlines and
+        # infers types per range, which smaller files need not put up with.
+        if size >= settings.ingestion_parallel_min_bytes:
+            if checkpoint is not None and size >= settings.ingestion_checkpoint_min_bytes:
+                try:
+                    return _csv_to_parquet_checkpointed(
+                        minio, bucket, storage_key, processed_key, size, header_mode, custom_headers, checkpoint,
+                        layout,
+                    )
+                except pa.ArrowInvalid as exc:
+                    logger.warning("Checkpointed CSV ingest failed for %s, retrying serially: %s", storage_key, exc)
+                    checkpoint.discard(minio, bucket)
+            else:
+                try:
+                    with _processed_sink(minio, bucket, processed_key) as sink:
+                        return _csv_to_parquet_parallel(
+                            object_range_reader(minio, bucket, storage_key), size, sink, header_mode, custom_headers,
+                            layout=layout,
+                        )
+                except pa.ArrowInvalid as exc:
+                    logger.warning("Parallel CSV ingest failed for %s, retrying serially: %s", storage_key, exc)
+        try:
+            with _processed_sink(minio, bucket, processed_key) as sink, open_object(
+                minio, bucket, storage_key
+            ) as response:
+                return _csv_to_parquet_arrow(response, sink, header_mode, custom_headers, layout)
+        except pa.ArrowInvalid as exc:
+            logger.warning("Arrow CSV engine failed for %s, falling back to pandas: %s", storage_key, exc)
+    with _processed_sink(minio, bucket, processed_key) as sink, open_object(
+        minio, bucket, storage_key
+    ) as response:
+        return _csv_to_parquet_pandas(response, sink, header_mode, custom_headers, layout)
+
+
+def _csv_to_parquet_checkpointed(
+    minio,
+    bucket: str,
+    storage_key: str,
+    processed_key: str,
+    size: int,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    checkpoint: "_IngestCheckpoint",
+    layout: ParquetLayout | None = None,
+):
+    """Parse a large CSV in resumable segments straight into ``processed_key``.
+
+    Each segment covers ``ingestion_checkpoint_bytes`` of raw input, is parsed
+    with the parallel byte-range reader and appended to one multipart upload
+    of ``processed_key`` (see ``_SegmentSink``). Once a segment's bytes are
+    uploaded as whole parts, those parts, the byte offset, row count, running
+    stats and sample rows are committed to the checkpoint, so a redelivered
+    task uploads only what follows. Each segment's row-group metadata is kept
+    in a small ``<processed_key>.parts/`` object; after the last segment they
+    are merged into the file's footer and the upload is completed.
+    """
+    read_range = object_range_reader(minio, bucket, storage_key)
+    layout = layout or ParquetLayout()
+    workers = settings.ingestion_parallel_workers or os.cpu_count() or 2
+    part_size = multipart_part_size(size, UPLOAD_PART_SIZE)
+    state = checkpoint.state
+    if state.get("size") == size and state.get("upload"):
+        upload = MultipartUploadWriter(minio, bucket, processed_key, state["upload"], part_size=part_size)
+    else:
+        checkpoint.discard(minio, bucket)
+        probe = _csv_probe(read_range, size, header_mode, custom_headers)
+        upload = MultipartUploadWriter(minio, bucket, processed_key, part_size=part_size)
+        # recorded right away so a failed or resumed job can abort the upload
+        checkpoint.commit(
+            size=size,
+            offset=probe["data_start"],
+            rows=0,
+            sample_rows=[],
+            footers=[],
+            stats=StatsAccumulator().to_state(),
+            raw_names=probe["raw_names"],
+            schema=probe["schema"].serialize().to_pybytes(),
+            precision=layout.precision.to_state(),
+            upload=upload.state,
+        )
+        state = checkpoint.state
+
+    schema = pa.ipc.read_schema(pa.py_buffer(state["schema"]))
+    probe = {"raw_names": state["raw_names"], "columns": schema.names, "schema": schema}
+    offset = state["offset"]
+    rows = state["rows"]
+    sample_rows = list(state["sample_rows"])
+    footers = list(state["footers"])
+    stats = StatsAccumulator.from_state(state["stats"])
+    # segments already written fixed the column types
+    layout.precision = ColumnPrecision.from_state(state["precision"])
+
+    while offset < size:
+        end = size
+        if offset + settings.ingestion_checkpoint_bytes < size:
+            end = _align_to_newline(read_range, offset + settings.ingestion_checkpoint_bytes, size)
+        # as in _csv_to_parquet_parallel; sized per segment, as memory frees up or runs short
+        range_bytes = layout.memory.bytes(
+            "parallel_range_bytes", CSV_MIN_BLOCK_SIZE, settings.ingestion_parallel_range_bytes, share=4 * workers
+        )
+        ranges = _csv_byte_ranges(read_range, offset, end, range_bytes)
+        sink = _SegmentSink(upload)
+        with LayoutParquetWriter(sink.stream, schema, layout) as writer:
+            for table, part_stats, _ in _csv_parse_ranges(read_range, ranges, probe, workers):
+                writer.write_table(table)
+                stats.merge(part_stats)
+                if len(sample_rows) < 10:
+                    sample_rows.extend(table.slice(0, 10 - len(sample_rows)).to_pylist())
+                rows += table.num_rows
+            metadata = sink.finish(writer)
+
+        footer_key = f"{processed_key}.parts/{len(footers):05d}.footer"
+        footer = _metadata_bytes(metadata)
+        minio.put_object(
+            bucket_name=bucket,
+            object_name=footer_key,
+            data=io.BytesIO(footer),
+            length=len(footer),
+            content_type="application/octet-stream",
+        )
+        footers.append(footer_key)
+        offset = end
+        # a segment whose tail is too small for a part is committed with the next one
+        if upload.flush_parts():
+            checkpoint.commit(
+                offset=offset,
+                rows=rows,
+                sample_rows=sample_rows,
+                footers=footers,
+                stats=stats.to_state(),
+                precision=layout.precision.to_state(),
+                upload=upload.state,
+            )
+        _publish(checkpoint.job_id, states.STARTED, 35 + 50 * offset // size, f"Parsed {rows} rows")
+
+    # column types of the file, also when every segment was written before a resume
+    layout.precision.target_schema(schema, schema.empty_table())
+    metadata = None
+    for footer_key in footers:
+        segment = pq.read_metadata(ObjectRangeFile(minio, bucket, footer_key))
+        if metadata is None:
+            metadata = segment
+        else:
+            metadata.append_row_groups(segment)
+    # the file already starts with the magic bytes this copy begins with
+    upload.write(_metadata_bytes(metadata)[4:])
+    upload.complete()
+    # a completed upload can no longer be resumed or aborted
+    checkpoint.commit(upload=None)
+
+    return probe["columns"], rows, sample_rows, stats.to_dict()
+
+
+def _metadata_bytes(metadata) -> bytes:
+    # b"PAR1" + footer, as in a Parquet ``_metadata`` file
+    buf = io.BytesIO()
+    metadata.write_metadata_file(buf)
+    return buf.getvalue()
+
+
+class _SegmentSink:
+    """Where one checkpoint segment's writer puts its bytes: the job's upload.
+
+    Every segment needs a ``pq.ParquetWriter`` of its own (row-group metadata
+    is only available once a writer closes), but all of them append to one
+    Parquet file. A writer takes the byte offsets in its metadata from its
+    own count of bytes written, so for a segment starting at ``base`` that
+    count is first advanced with padding that is never uploaded. The magic
+    bytes the writer starts with are dropped the same way, and so is the
+    footer it ends with.
+    """
+
+    _PAD = 64 * 1024 * 1024
+
+    def __init__(self, upload: MultipartUploadWriter):
+        self.closed = False
+        self._upload = upload
+        self._held: bytearray | None = None
+        base = upload.tell()
+        self._skip = base
+        self.stream = pa.PythonFile(self, mode="w")
+        pad = max(base - 4, 0)
+        if pad:
+            zeros = pa.py_buffer(bytes(min(pad, self._PAD)))
+            while pad:
+                chunk = zeros.slice(0, min(pad, zeros.size))
+                self.stream.write(chunk)
+                pad -= chunk.size
+
+    def write(self, data) -> int:
+        view = memoryview(data).cast("B")
+        if self._skip:
+            skipped = min(self._skip, len(view))
+            self._skip -= skipped
+            view = view[skipped:]
+        if self._held is not None:
+            self._held += view
+        elif len(view):
+            self._upload.write(view)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        # called by pyarrow when self.stream is closed; the upload stays open
+        self.closed = True
+
+    def finish(self, writer: LayoutParquetWriter):
+        """Close ``writer`` without uploading its footer and return its ``FileMetaData``."""
+        self._held = bytearray()
+        writer.close()
+        held, self._held = self._held, None
+        # footer = metadata, its 4-byte length and the magic; any page index before it stays
+        footer_bytes = int.from_bytes(held[-8:-4], "little") + 8
+        self._upload.write(held[:-footer_bytes])
+        return writer.metadata
+
+
+class _IngestCheckpoint:
+    """Resumable progress of one job, kept on ``ingestion_jobs.checkpoint``.
+
+    The state holds the processed file's multipart upload and the keys of the
+    segment footers written under ``<processed_key>.parts/``, so both can be
+    reused on resume and cleaned up once the job ends.
+    """
+
+    def __init__(self, db, job_id: str, state: dict | None = None):
+        self.db = db
+        self.job_id = job_id
+        self.state = dict(state or {})
+
+    def commit(self, **fields):
+        self.state.update(fields)
+        self.db.ingestion_jobs.update_one(
+            {"_id": ObjectId(self.job_id)},
+            {"$set": {"checkpoint": self.state, "updated_at": datetime.utcnow()}},
+        )
+
+    def discard(self, minio, bucket: str):
+        upload = self.state.get("upload")
+        if upload:
+            try:
+                abort_multipart_upload(minio, bucket, upload["object_name"], upload["upload_id"])
+            except Exception:
+                pass
+        for footer_key in self.state.get("footers") or []:
+            try:
+                minio.remove_object(bucket, footer_key)
+            except Exception:
+                pass
+        if self.state:
+            self.db.ingestion_jobs.update_one({"_id": ObjectId(self.job_id)}, {"$unset": {"checkpoint": ""}})
+        self.state = {}
+
+
+class _JobLock:
+    """Per-job Redis lock, renewed from a background thread while held."""
+
+    def __init__(self, redis, job_id: str, ttl: int | None = None):
+        self._lock = redis.lock(
+            f"ingestion:{job_id}:lock",
+            timeout=ttl or settings.ingestion_lock_ttl_seconds,
+            thread_local=False,
+        )
+        self._stop = threading.Event()
+        self._renewer = threading.Thread(target=self._renew, daemon=True)
+
+    def acquire(self) -> bool:
+        if not self._lock.acquire(blocking=False):
+            return False
+        self._renewer.start()
+        return True
+
+    def _renew(self):
+        while not self._stop.wait(self._lock.timeout / 3):
+            try:
+                self._lock.reacquire()
+            except LockError:
+                logger.warning("Lost ingestion lock %s", self._lock.name)
+                return
+
+    def release(self):
+        self._stop.set()
+        if self._renewer.is_alive():
+            self._renewer.join()
+        try:
+            self._lock.release()
+        except LockError:
+            pass
+
+
+def _spill_to_parquet(
+    minio,
+    bucket: str,
+    storage_key: str,
+    processed_key: str,
+    job_id: str,
+    header_mode: str,
+    custom_headers: list[str] | None,
+    layout: ParquetLayout | None = None,
+):
+    # Workbooks need a seekable zip and may be rewritten after writing, so
+    # they are staged in temp files.
+    raw_fd, raw_path = tempfile.mkstemp()
+    os.close(raw_fd)
+    parquet_fd, parquet_path = tempfile.mkstemp(suffix=".parquet")
+    os.close(parquet_fd)
+
+    try:
+        with open_object(minio, bucket, storage_key) as response, open(raw_path, "wb") as f:
+            for data in response.stream(1024 * 1024):
+                f.write(data)
+
+        _publish(job_id, states.STARTED, 35, "Materializing Parquet")
+        result = _excel_to_parquet(raw_path, parquet_path, header_mode, custom_headers, layout=layout)
+
+        _publish(job_id, states.STARTED, 80, "Uploading processed Parquet")
+        minio.fput_object(bucket, processed_key, parquet_path, content_type="application/octet-stream")
+        return result
     finally:
         for p in (raw_path, parquet_path):
             try:
@@ -297,6 +1646,15 @@ def ingest_file(
 import re
 
 _NUM_RE = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+# characters of whitespace separated plain numbers; anything else takes the regex path
+_PLAIN_NUMBERS_RE = re.compile(r"[0-9eE.+\-\s]*")
+
+def _open_text(source):
+    # path on disk, or a binary stream such as a MinIO get_object response
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "r", errors="ignore")
+    return io.TextIOWrapper(source, errors="ignore")
+
 
 def _is_numeric_line(line: str) -> bool:
     return bool(_NUM_RE.search(line))
@@ -304,102 +1662,140 @@ def _is_numeric_line(line: str) -> bool:
 def _extract_numbers(line: str) -> list[float]:
     return [float(x) for x in _NUM_RE.findall(line)]
 
+
+def _wind_block_to_array(lines: list[str], ncols: int) -> np.ndarray:
+    """Parse a block of wind TXT data lines into an ``(rows, ncols)`` float array.
+
+    Lines that are purely whitespace separated numbers (the normal balance
+    output) are converted by pandas' C parser in a single call. Blocks with
+    any other token (text, ``inf``, ``nan``), ragged rows or numbers the C
+    parser rejects fall back to the per-line regex extraction, which is what
+    defines the result: ``1 inf`` is ``[1, NaN]``.
+    """
+    if all(len(ln.split()) == ncols for ln in lines):
+        text = "\n".join(lines)
+        if _PLAIN_NUMBERS_RE.fullmatch(text):
+            try:
+                arr = pd.read_csv(
+                    io.StringIO(text), sep=r"\s+", header=None, dtype=np.float64, engine="c"
+                ).to_numpy()
+            except ValueError:
+                arr = None
+            if arr is not None and arr.shape == (len(lines), ncols):
+                return arr
+
+    out = np.full((len(lines), ncols), np.nan)
+    n = 0
+    for ln in lines:
+        nums = _extract_numbers(ln)
+        if not nums:
+            # ignore text line inside data section
+            continue
+        # align row length to columns count
+        nums = nums[:ncols]
+        out[n, : len(nums)] = nums
+        n += 1
+    return out[:n]
+
+
 def _wind_txt_to_parquet(
     txt_path: str,
     parquet_path: str,
     header_mode: str,
     custom_headers: list[str] | None,
+    chunk_rows: int = WIND_TXT_CHUNK_ROWS,
+    layout: ParquetLayout | None = None,
 ):
     """
     Wind tunnel TXT parsing rules:
     1) Ignore everything until a line that contains '%Dyn'
     2) From there, collect header tokens until the first numeric line (data start)
     3) Data section: ignore non-numeric lines, keep only numeric rows
-    """
-    # 1) Read until %Dyn marker
-    with open(txt_path, "r", errors="ignore") as f:
-        lines = f.readlines()
-
-    start_idx = None
-    for i, ln in enumerate(lines):
-        if "%Dyn" in ln:
-            start_idx = i
-            break
-
-    if start_idx is None:
-        raise ValueError("Wind TXT: '%Dyn' marker not found")
 
-    # 2) Build columns until first numeric row
-    header_tokens: list[str] = []
-    data_start = None
-
-    for i in range(start_idx, len(lines)):
-        ln = lines[i].strip()
-        if not ln:
-            continue
-
-        # first numeric row => stop header capture
-        if _is_numeric_line(ln):
-            data_start = i
-            break
-
-        # collect header tokens (words)
-        toks = ln.split()
-        # keep everything (including %Dyn itself)
-        header_tokens.extend(toks)
-
-    if data_start is None:
-        raise ValueError("Wind TXT: no numeric data found after header")
-
-    # Apply header_mode overrides (same semantics as CSV/Excel)
-    if header_mode == "custom":
-        if not custom_headers:
-            raise ValueError("custom_headers required when header_mode=custom")
-        columns = custom_headers
-    elif header_mode == "none":
-        # number of cols from detected header, else infer from first numeric row length
-        if header_tokens:
-            n = len(header_tokens)
+    The data section is streamed in blocks of lines, starting at
+    ``chunk_rows`` and then sized by the layout's ``MemoryBudget``; each block
+    is parsed into a NumPy array and handed to the Parquet writer, so memory
+    stays bounded by the block size rather than the file size.
+    """
+    if pa is None or pq is None:
+        raise RuntimeError("pyarrow is required to ingest wind tunnel TXT files")
+    layout = layout or ParquetLayout()
+
+    with _open_text(txt_path) as f:
+        # 1) Read until %Dyn marker
+        marker = None
+        for ln in f:
+            if "%Dyn" in ln:
+                marker = ln
+                break
+        if marker is None:
+            raise ValueError("Wind TXT: '%Dyn' marker not found")
+
+        # 2) Build columns until first numeric row
+        header_tokens: list[str] = []
+        first_data = None
+        for raw in chain([marker], f):
+            ln = raw.strip()
+            if not ln:
+                continue
+
+            # first numeric row => stop header capture
+            if _is_numeric_line(ln):
+                first_data = ln
+                break
+
+            # collect header tokens (words), keep everything (including %Dyn itself)
+            header_tokens.extend(ln.split())
+
+        if first_data is None:
+            raise ValueError("Wind TXT: no numeric data found after header")
+
+        # Apply header_mode overrides (same semantics as CSV/Excel)
+        if header_mode == "custom":
+            if not custom_headers:
+                raise ValueError("custom_headers required when header_mode=custom")
+            columns = list(custom_headers)
+        elif header_mode == "none":
+            # number of cols from detected header, else infer from first numeric row length
+            n = len(header_tokens) or len(_extract_numbers(first_data))
+            columns = [f"column_{i+1}" for i in range(n)]
         else:
-            n = len(_extract_numbers(lines[data_start]))
-        columns = [f"column_{i+1}" for i in range(n)]
-    else:
-        # file headers
-        columns = header_tokens if header_tokens else [f"column_{i+1}" for i in range(len(_extract_numbers(lines[data_start])))]
-
-    # 3) Parse numeric rows only
-    rows: list[list[float | None]] = []
-    stats: dict = {}
-
-    for i in range(data_start, len(lines)):
-        ln = lines[i].strip()
-        if not ln:
-            continue
-
-        nums = _extract_numbers(ln)
-        if not nums:
-            # ignore text line inside data section
-            continue
-
-        # align row length to columns count
-        if len(nums) > len(columns):
-            nums = nums[: len(columns)]
-        elif len(nums) < len(columns):
-            nums = nums + [None] * (len(columns) - len(nums))
-
-        rows.append(nums)
-
-    if not rows:
+            # file headers
+            columns = header_tokens or [f"column_{i+1}" for i in range(len(_extract_numbers(first_data)))]
+        ncols = len(columns)
+
+        # 3) Stream numeric rows block by block
+        writer = None
+        stats = StatsAccumulator()
+        sample_rows: list[dict] = []
+        row_count = 0
+        lines = chain([first_data], f)
+        with ExitStack() as stack:
+            while True:
+                block = list(islice(lines, layout.memory.rows("wind_block_rows", chunk_rows)))
+                if not block:
+                    break
+                block = [s for s in map(str.strip, block) if s]
+                arr = _wind_block_to_array(block, ncols)
+                if not len(arr):
+                    continue
+
+                cols = np.ascontiguousarray(arr.T)
+                table = pa.Table.from_arrays(
+                    [pa.array(col, from_pandas=True) for col in cols],
+                    names=columns,
+                )
+                if writer is None:
+                    writer = stack.enter_context(LayoutParquetWriter(parquet_path, table.schema, layout))
+                writer.write_table(table)
+                layout.memory.observe("wind_block_rows", table.num_rows, table.nbytes * PY_OBJECT_OVERHEAD)
+
+                stats.update(table)
+                if len(sample_rows) < 10:
+                    sample_rows.extend(table.slice(0, 10 - len(sample_rows)).to_pylist())
+                row_count += len(arr)
+
+    if not row_count:
         raise ValueError("Wind TXT: no numeric rows parsed")
 
-    df = pd.DataFrame(rows, columns=columns)
-
-    # compute stats (uses your existing helper)
-    _update_numeric_stats(stats, df)
-
-    sample_rows = df.head(10).to_dict(orient="records")
-    row_count = len(df)
-
-    df.to_parquet(parquet_path, index=False)
-
-    return list(df.columns), row_count, sample_rows, stats
+    return columns, row_count, sample_rows, stats.to_dict()
@@ -0,0 +1,161 @@
+"""Single-pass, mergeable per-column statistics for ingested datasets.
+
+Ingestion feeds every Arrow record batch it writes through a
+``StatsAccumulator``; the result is stored in
+``ingestion_jobs.metadata.stats`` so visualization and preview code can read
+ranges, moments and sort order without rescanning the Parquet data.
+"""
+
+import math
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def _is_numeric(data_type) -> bool:
+    return pa.types.is_integer(data_type) or pa.types.is_floating(data_type)
+
+
+def _finite_or_none(value) -> float | None:
+    # stats are stored in Mongo and returned as JSON, which has no inf/NaN
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+class ColumnStats:
+    """Running statistics for one column.
+
+    Batch moments come from ``pyarrow.compute`` kernels and are folded into
+    the running mean / M2 with the parallel form of Welford's algorithm, so
+    two accumulators built over consecutive parts of a dataset merge exactly.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.null_count = 0
+        self.numeric = False
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.increasing = True
+        self.decreasing = True
+        self.first = None
+        self.last = None
+
+    def update(self, values):
+        self.null_count += values.null_count
+        if not _is_numeric(values.type):
+            self.count += len(values) - values.null_count
+            return
+
+        self.numeric = True
+        valid = pc.drop_null(values)
+        if pa.types.is_floating(values.type):
+            nan_mask = pc.is_nan(valid)
+            nan_count = pc.sum(nan_mask).as_py() or 0
+            if nan_count:
+                self.null_count += nan_count
+                valid = pc.filter(valid, pc.invert(nan_mask))
+        n = len(valid)
+        if not n:
+            return
+
+        batch = ColumnStats()
+        batch.numeric = True
+        batch.count = n
+        min_max = pc.min_max(valid)
+        batch.min = min_max["min"].as_py()
+        batch.max = min_max["max"].as_py()
+        batch.mean = pc.mean(valid).as_py()
+        batch.m2 = pc.variance(valid, ddof=0).as_py() * n
+        batch.first = valid[0].as_py()
+        batch.last = valid[n - 1].as_py()
+        if n > 1:
+            head = valid.slice(0, n - 1)
+            tail = valid.slice(1)
+            batch.increasing = bool(pc.all(pc.greater_equal(tail, head)).as_py())
+            batch.decreasing = bool(pc.all(pc.less_equal(tail, head)).as_py())
+        self.merge(batch, nulls=False)
+
+    def merge(self, other: "ColumnStats", nulls: bool = True):
+        """Fold in statistics of rows that come *after* the ones seen so far."""
+        if nulls:
+            self.null_count += other.null_count
+        self.numeric = self.numeric or other.numeric
+        if other.min is None:
+            # nothing numeric to fold in (non-numeric column or all nulls)
+            self.count += other.count
+            return
+        if self.min is None:
+            for attr in ("count", "min", "max", "mean", "m2", "increasing", "decreasing", "first", "last"):
+                setattr(self, attr, getattr(other, attr))
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.increasing = self.increasing and other.increasing and self.last <= other.first
+        self.decreasing = self.decreasing and other.decreasing and self.last >= other.first
+        self.last = other.last
+
+    _STATE = ("count", "null_count", "numeric", "min", "max", "mean", "m2",
+              "increasing", "decreasing", "first", "last")
+
+    def to_state(self) -> dict:
+        """Full internal state, for persisting an accumulator between runs."""
+        return {attr: getattr(self, attr) for attr in self._STATE}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ColumnStats":
+        column = cls()
+        for attr in cls._STATE:
+            setattr(column, attr, state[attr])
+        return column
+
+    def to_dict(self) -> dict:
+        out = {"count": self.count, "null_count": self.null_count}
+        if self.numeric and self.min is not None:
+            # a column holding +-inf has an infinite or undefined mean and variance
+            out |= {
+                "min": _finite_or_none(self.min),
+                "max": _finite_or_none(self.max),
+                "mean": _finite_or_none(self.mean),
+                "variance": _finite_or_none(self.m2 / self.count),
+                "monotonic_increasing": self.increasing,
+                "monotonic_decreasing": self.decreasing,
+            }
+        return out
+
+
+class StatsAccumulator:
+    """Per-column ``ColumnStats`` for a stream of Arrow batches or tables."""
+
+    def __init__(self):
+        self.columns: dict[str, ColumnStats] = {}
+
+    def update(self, data):
+        """Accumulate a ``pa.RecordBatch`` or ``pa.Table``."""
+        for name, values in zip(data.schema.names, data.columns):
+            self.columns.setdefault(name, ColumnStats()).update(values)
+
+    def merge(self, other: "StatsAccumulator"):
+        for name, column in other.columns.items():
+            self.columns.setdefault(name, ColumnStats()).merge(column)
+
+    def to_state(self) -> list:
+        # list of pairs: column names may not be valid document keys
+        return [[name, column.to_state()] for name, column in self.columns.items()]
+
+    @classmethod
+    def from_state(cls, state: list) -> "StatsAccumulator":
+        acc = cls()
+        acc.columns = {name: ColumnStats.from_state(column) for name, column in state}
+        return acc
+
+    def to_dict(self) -> dict:
+        return {name: column.to_dict() for name, column in self.columns.items()}
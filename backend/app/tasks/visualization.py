@@ -1,24 +1,36 @@
 import io
+import logging
+import math
+import numbers
 import os
 import tempfile
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.io as pio
 from bson import ObjectId
-from celery import states
+from celery import chord, states
 
-from app.core.celery_app import celery_app
+from app.core.celery_app import celery_app, queue_for
 from app.core.config import settings
 from app.core.minio_client import get_minio_client
+from app.core.minio_streams import ObjectRangeFile, open_object
 from app.core.redis_client import get_sync_redis
+from app.core.system_info import MemoryBudget, estimate_task_memory
 from app.db.sync_mongo import get_sync_db
 from app.repositories.notifications import create_sync_notification
 
-CHUNK_SIZE = 250_000
-LOD_LEVELS = (256, 1024, 4096)
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 250_000  # starting size; MemoryBudget adjusts it per chunk
+LOD_LEVELS = tuple(sorted(settings.visualization_lod_levels))
+OVERVIEW_BINS = 256  # bins in the figure's initial trace
 
 
 def _set_status(redis, viz_id: str, status: str, progress: int, message: str):
@@ -37,54 +49,171 @@ def _update_db_status(db, viz_id: str, **fields):
     )
 
 
-def _iter_parquet_batches(url: str, columns: list[str]):
-    try:
+class DatasetObject:
+    """A dataset object in MinIO, read by the visualization task without presigned URLs.
+
+    Parquet is opened over ``ObjectRangeFile``, so pyarrow fetches the footer
+    and then only the selected column chunks with ranged GETs; the footer is
+    parsed once per task. CSV/TXT are parsed from one streamed ``get_object``
+    response. Every read records its path (``ranged``, ``stream`` or
+    ``full``), and ``describe()`` goes into the series stats so a whole-object
+    fallback is visible in the visualization document.
+    """
+
+    def __init__(self, minio, bucket_name: str, object_name: str, ext: str, size: int | None = None, metadata=None):
+        self.minio = minio
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.ext = ext
+        self.size = size
+        self.paths: list[str] = []
+        self.fallback_error: str | None = None
+        self._metadata = metadata
+        self._files: list[ObjectRangeFile] = []
+
+    def record(self, path: str):
+        if path not in self.paths:
+            self.paths.append(path)
+
+    def ranged_file(self) -> ObjectRangeFile:
+        if self.size is None:
+            self.size = self.minio.stat_object(self.bucket_name, self.object_name).size
+        file = ObjectRangeFile(self.minio, self.bucket_name, self.object_name, size=self.size)
+        self._files.append(file)
+        return file
+
+    def parquet_file(self):
         import pyarrow.parquet as pq
 
-        parquet_file = pq.ParquetFile(url)
-        for batch in parquet_file.iter_batches(columns=columns, batch_size=CHUNK_SIZE):
-            yield batch.to_pandas()
-    except Exception:
-        frame = pd.read_parquet(url, columns=columns)
-        yield frame
+        parquet_file = pq.ParquetFile(self.ranged_file(), metadata=self._metadata)
+        self._metadata = parquet_file.metadata
+        self.record("ranged")
+        return parquet_file
+
+    def stream(self):
+        self.record("stream")
+        return open_object(self.minio, self.bucket_name, self.object_name)
+
+    def read_all(self, reason: Exception | None = None) -> io.BytesIO:
+        """The whole object in memory; only for formats or files the ranged path cannot read."""
+        self.record("full")
+        if reason is not None:
+            self.fallback_error = str(reason)
+        with open_object(self.minio, self.bucket_name, self.object_name) as response:
+            return io.BytesIO(response.read())
+
+    def describe(self) -> dict:
+        info = {
+            "object": self.object_name,
+            "size": self.size,
+            "paths": self.paths,
+            "ranged_requests": sum(file.requests for file in self._files),
+            "ranged_bytes": sum(file.bytes_read for file in self._files),
+        }
+        if self.fallback_error:
+            info["fallback_error"] = self.fallback_error
+        return info
+
+
+def _batch_to_pandas(batch) -> pd.DataFrame:
+    # Keep the storage types chosen at ingestion (metadata.column_types):
+    # float32 stays float32, and small integer columns with nulls become
+    # float32 rather than pandas' default float64.
+    import pyarrow as pa
 
+    columns = [
+        column.cast(pa.float32())
+        if column.null_count and pa.types.is_integer(column.type) and column.type.bit_width <= 16
+        else column
+        for column in batch.columns
+    ]
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names).to_pandas()
 
-def _iter_chunks(url: str, ext: str, x_axis: str, y_axis: str | None):
-    columns = [col for col in [x_axis, y_axis] if col]
+
+def _parquet_bytes_per_row(metadata, columns: list[str]) -> float:
+    # uncompressed size of the selected columns, from the footer
+    names = set(columns)
+    nbytes = sum(
+        group.column(i).total_uncompressed_size
+        for group in (metadata.row_group(g) for g in range(metadata.num_row_groups))
+        for i in range(group.num_columns)
+        if group.column(i).path_in_schema in names
+    )
+    return nbytes / max(metadata.num_rows, 1)
+
+
+def _iter_parquet_batches(source: DatasetObject, columns: list[str], memory: MemoryBudget):
+    yielded = False
+    try:
+        parquet_file = source.parquet_file()
+        metadata = parquet_file.metadata
+        # encoded size; close to the decoded size for plain numeric columns
+        memory.observe("batch_rows", 1, _parquet_bytes_per_row(metadata, columns))
+        for group in range(metadata.num_row_groups):
+            batch_size = memory.rows("batch_rows", CHUNK_SIZE)
+            for batch in parquet_file.iter_batches(columns=columns, batch_size=batch_size, row_groups=[group]):
+                yielded = True
+                yield _batch_to_pandas(batch)
+    except Exception as exc:
+        if yielded:
+            raise
+        logger.warning("Ranged Parquet read failed for %s, reading the whole object: %s", source.object_name, exc)
+        yield pd.read_parquet(source.read_all(reason=exc), columns=columns)
+
+
+def _sized_chunks(reader, memory: MemoryBudget):
+    # TextFileReader.get_chunk takes a new size on every call
+    with reader:
+        while True:
+            try:
+                chunk = reader.get_chunk(memory.rows("batch_rows", CHUNK_SIZE))
+            except StopIteration:
+                return
+            memory.observe("batch_rows", len(chunk), chunk.memory_usage(index=False, deep=True).sum())
+            yield chunk
+
+
+def _iter_chunks(source: DatasetObject, columns: list[str], memory: MemoryBudget | None = None):
+    columns = list(dict.fromkeys(columns))
     read_kwargs = {"usecols": columns, "on_bad_lines": "skip"}
+    memory = memory or MemoryBudget()
+    ext = source.ext
 
     if ext in {".csv"}:
-        iterator = pd.read_csv(
-            url, chunksize=CHUNK_SIZE, low_memory=False, **read_kwargs
-        )
+        with source.stream() as response:
+            yield from _sized_chunks(
+                pd.read_csv(response, chunksize=CHUNK_SIZE, low_memory=False, **read_kwargs), memory
+            )
     elif ext in {".txt", ".dat"}:
-        iterator = pd.read_csv(
-            url,
-            chunksize=CHUNK_SIZE,
-            low_memory=False,
-            delim_whitespace=True,
-            engine="python",
-            **read_kwargs,
-        )
+        with source.stream() as response:
+            yield from _sized_chunks(
+                pd.read_csv(
+                    response,
+                    chunksize=CHUNK_SIZE,
+                    low_memory=False,
+                    delim_whitespace=True,
+                    engine="python",
+                    **read_kwargs,
+                ),
+                memory,
+            )
     elif ext in {".parquet", ".pq", ".feather", ".arrow"}:
-        iterator = _iter_parquet_batches(url, columns)
+        yield from _iter_parquet_batches(source, columns, memory)
     elif ext in {".xlsx", ".xls", ".xlsm"}:
         # pandas does not support streaming Excel reads; fall back to a single frame.
-        frame = pd.read_excel(url, usecols=columns, engine="openpyxl")
-        yield frame
-        return
+        yield pd.read_excel(source.read_all(), usecols=columns, engine="openpyxl")
     else:
         raise ValueError("File type not supported for visualization")
 
-    yield from iterator
-
 
-def _scan_axis_bounds(url: str, ext: str, x_axis: str) -> tuple[float, float, int]:
+def _scan_axis_bounds(
+    source: DatasetObject, x_axis: str, memory: MemoryBudget | None = None
+) -> tuple[float, float, int]:
     x_min = np.inf
     x_max = -np.inf
     rows = 0
 
-    for chunk in _iter_chunks(url, ext, x_axis, None):
+    for chunk in _iter_chunks(source, [x_axis], memory):
         series = chunk[x_axis].dropna()
         if series.empty:
             continue
@@ -100,7 +229,82 @@ def _scan_axis_bounds(url: str, ext: str, x_axis: str) -> tuple[float, float, in
     return float(x_min), float(x_max), rows
 
 
+def _finite_number(value) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _parquet_axis_bounds(source: DatasetObject, x_axis: str) -> tuple[float, float] | None:
+    # min/max of every row group, from the footer alone
+    try:
+        metadata = source.parquet_file().metadata
+        index = metadata.schema.to_arrow_schema().get_field_index(x_axis)
+    except Exception:
+        return None
+    if index < 0:
+        return None
+    lows, highs = [], []
+    for group in range(metadata.num_row_groups):
+        column = metadata.row_group(group).column(index)
+        stats = column.statistics
+        if stats is not None and stats.null_count == column.num_values:
+            continue  # only nulls
+        if stats is None or not stats.has_min_max or not (_finite_number(stats.min) and _finite_number(stats.max)):
+            return None
+        lows.append(stats.min)
+        highs.append(stats.max)
+    if not lows:
+        return None
+    return float(min(lows)), float(max(highs))
+
+
+def _known_axis_bounds(
+    source: DatasetObject, x_axis: str, axis_stats: dict | None
+) -> tuple[float, float, str] | None:
+    """x-axis bounds without reading the data: Parquet statistics, else ingestion ``metadata.stats``."""
+    if source.ext in {".parquet", ".pq"}:
+        bounds = _parquet_axis_bounds(source, x_axis)
+        if bounds:
+            return (*bounds, "parquet_statistics")
+    axis_stats = axis_stats or {}
+    if _finite_number(axis_stats.get("min")) and _finite_number(axis_stats.get("max")):
+        return float(axis_stats["min"]), float(axis_stats["max"]), "ingestion_stats"
+    return None
+
+
+def bin_indices(x: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Bin of each ``x`` for evenly spaced ``edges``, or -1 outside them (and for NaN).
+
+    The bin is computed arithmetically rather than by binary search
+    (``np.digitize``); the last edge is inclusive. A point within rounding
+    error of an inner edge may land on either side of it.
+    """
+    bins = len(edges) - 1
+    low, high = edges[0], edges[-1]
+    if not len(x):
+        return np.empty(0, dtype=np.intp)
+    # NaN fails this check too
+    all_inside = bool(low <= x.min() and x.max() <= high)
+    if not all_inside:
+        inside = (x >= low) & (x <= high)
+        x = np.where(inside, x, low)
+    scaled = x - low
+    scaled *= bins / (high - low)
+    index = scaled.astype(np.intp)
+    np.minimum(index, bins - 1, out=index)
+    if not all_inside:
+        index[~inside] = -1
+    return index
+
+
 class LevelAccumulator:
+    """count/sum/min/max of y per x bin, over a stream of chunks.
+
+    ``ingest`` works on NumPy buffers, so no per-chunk DataFrame is built:
+    ``np.bincount`` for counts and sums and ``np.minimum.at``/``np.maximum.at``
+    for extremes, or one ``reduceat`` per statistic when x is sorted and
+    every bin is a contiguous run.
+    """
+
     def __init__(self, bins: int, x_min: float, x_max: float):
         self.bins = bins
         self.edges = np.linspace(x_min, x_max, num=bins + 1)
@@ -109,19 +313,47 @@ class LevelAccumulator:
         self.mins = np.full(bins, np.inf)
         self.maxs = np.full(bins, -np.inf)
 
-    def ingest(self, x: pd.Series, y: pd.Series):
-        bin_index = np.digitize(x.to_numpy(), self.edges) - 1
-        valid = (bin_index >= 0) & (bin_index < self.bins)
-        if not np.any(valid):
+    def ingest(self, x, y):
+        """Add points; ``x``/``y`` are NumPy arrays, Series or Arrow arrays without nulls."""
+        # aggregate in float64 even when the column is stored narrower
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        bin_index = bin_indices(x, self.edges)
+        valid = bin_index >= 0
+        if not valid.all():
+            bin_index, y = bin_index[valid], y[valid]
+        if not len(bin_index):
+            return
+        steps = np.diff(bin_index)
+        if (steps >= 0).all():
+            # sorted x (e.g. time): each bin is one contiguous run
+            starts = np.flatnonzero(steps)
+            starts += 1
+            starts = np.concatenate(([0], starts))
+            ids = bin_index[starts]
+            self.counts[ids] += np.diff(np.append(starts, len(bin_index)))
+            self.sums[ids] += np.add.reduceat(y, starts)
+            self.mins[ids] = np.minimum(self.mins[ids], np.minimum.reduceat(y, starts))
+            self.maxs[ids] = np.maximum(self.maxs[ids], np.maximum.reduceat(y, starts))
             return
-        df = pd.DataFrame({"bin": bin_index[valid], "y": y.to_numpy()[valid]})
-        grouped = df.groupby("bin")["y"].agg(["count", "sum", "min", "max"])
+        self.counts += np.bincount(bin_index, minlength=self.bins)
+        self.sums += np.bincount(bin_index, weights=y, minlength=self.bins)
+        np.minimum.at(self.mins, bin_index, y)
+        np.maximum.at(self.maxs, bin_index, y)
+
+    def merge(self, other: "LevelAccumulator"):
+        """Add the bins of ``other``, which must have the same edges."""
+        self.counts += other.counts
+        self.sums += other.sums
+        np.minimum(self.mins, other.mins, out=self.mins)
+        np.maximum(self.maxs, other.maxs, out=self.maxs)
 
-        bin_ids = grouped.index.to_numpy()
-        self.counts[bin_ids] += grouped["count"].to_numpy()
-        self.sums[bin_ids] += grouped["sum"].to_numpy()
-        self.mins[bin_ids] = np.minimum(self.mins[bin_ids], grouped["min"].to_numpy())
-        self.maxs[bin_ids] = np.maximum(self.maxs[bin_ids], grouped["max"].to_numpy())
+    @classmethod
+    def from_arrays(cls, edges, counts, sums, mins, maxs) -> "LevelAccumulator":
+        acc = cls.__new__(cls)
+        acc.bins = len(counts)
+        acc.edges, acc.counts, acc.sums, acc.mins, acc.maxs = edges, counts, sums, mins, maxs
+        return acc
 
     def to_frame(self, x_axis: str, y_axis: str) -> pd.DataFrame:
         centers = (self.edges[:-1] + self.edges[1:]) / 2
@@ -144,39 +376,125 @@ class LevelAccumulator:
         return df
 
 
-def _materialize_tiles(
-    minio,
-    bucket: str,
-    base_key: str,
-    url: str,
-    ext: str,
-    x_axis: str,
-    y_axis: str,
-    levels: tuple[int, ...] = LOD_LEVELS,
-):
-    x_min, x_max, rows = _scan_axis_bounds(url, ext, x_axis)
-    if x_min == x_max:
-        x_max = x_min + 1e-9
-    accumulators = {bins: LevelAccumulator(bins, x_min, x_max) for bins in levels}
+class GrowingLevelAccumulator(LevelAccumulator):
+    """``LevelAccumulator`` for a single pass when the x range is unknown.
 
-    tiles = []
-    partitions = 0
+    The range starts at the first chunk's values. When a chunk falls outside
+    it, the range doubles towards those values: neighbouring bins are merged
+    pairwise into one half and the other half starts empty, so the bin count
+    stays fixed and earlier aggregates stay exact. Bins end up between one
+    and two times wider than with known bounds.
+    """
 
-    for chunk in _iter_chunks(url, ext, x_axis, y_axis):
-        chunk = chunk.dropna(subset=[x_axis, y_axis])
-        if chunk.empty:
-            continue
-        partitions += 1
-        for acc in accumulators.values():
-            acc.ingest(chunk[x_axis], chunk[y_axis])
+    def __init__(self, bins: int):
+        if bins % 2:
+            raise ValueError("growable levels need an even number of bins")
+        self.bins = bins
+        self.edges = None
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.sums = np.zeros(bins, dtype=float)
+        self.mins = np.full(bins, np.inf)
+        self.maxs = np.full(bins, -np.inf)
 
-    os.makedirs(tempfile.gettempdir(), exist_ok=True)
-    for level, acc in accumulators.items():
+    def ingest(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        if not len(x):
+            return
+        low, high = float(x.min()), float(x.max())
+        if self.edges is None:
+            span = high - low or max(abs(low) * 1e-9, 1e-9)
+            self.edges = np.linspace(low, low + span, num=self.bins + 1)
+        # the last bin is closed (see bin_indices), so a value on the upper edge fits
+        while low < self.edges[0] or high > self.edges[-1]:
+            self._double(towards_low=low < self.edges[0])
+        super().ingest(x, y)
+
+    def _double(self, towards_low: bool):
+        half = self.bins // 2
+        span = self.edges[-1] - self.edges[0]
+        start = self.edges[0] - span if towards_low else self.edges[0]
+        for name, merge, empty in (
+            ("counts", np.add, 0),
+            ("sums", np.add, 0.0),
+            ("mins", np.minimum, np.inf),
+            ("maxs", np.maximum, -np.inf),
+        ):
+            values = getattr(self, name)
+            merged = merge(values[0::2], values[1::2])
+            padding = np.full(half, empty, dtype=values.dtype)
+            setattr(self, name, np.concatenate([padding, merged] if towards_low else [merged, padding]))
+        self.edges = np.linspace(start, start + 2 * span, num=self.bins + 1)
+
+
+class LevelPyramid:
+    """Every LOD level from one binning pass at the finest level.
+
+    Chunks are binned once, at the finest level. Coarser levels merge runs of
+    adjacent bins afterwards; count and sum add up, min and max take the
+    extreme. Extra levels cost only that final merge, which is proportional to
+    the finest bin count. Every level must divide the finest one.
+    """
+
+    def __init__(self, levels, x_min: float | None = None, x_max: float | None = None):
+        self.levels = sorted(set(levels))
+        finest = self.levels[-1]
+        uneven = [bins for bins in self.levels if finest % bins]
+        if uneven:
+            raise ValueError(f"LOD levels {uneven} do not divide the finest level {finest}")
+        if x_min is None:
+            self.finest = GrowingLevelAccumulator(finest)
+        else:
+            self.finest = LevelAccumulator(finest, x_min, x_max)
+
+    def ingest(self, x, y):
+        self.finest.ingest(x, y)
+
+    def merge(self, other: "LevelPyramid"):
+        self.finest.merge(other.finest)
+
+    def settle(self, x_min: float, x_max: float):
+        """Use ``x_min``..``x_max`` for growable bins that never saw a point."""
+        if self.finest.edges is None:
+            if x_max == x_min:
+                x_max = x_min + 1e-9
+            self.finest.edges = np.linspace(x_min, x_max, num=self.finest.bins + 1)
+
+    def level(self, bins: int) -> LevelAccumulator:
+        finest = self.finest
+        if bins == finest.bins:
+            return finest
+        factor = finest.bins // bins
+        return LevelAccumulator.from_arrays(
+            finest.edges[::factor],
+            finest.counts.reshape(bins, factor).sum(axis=1),
+            finest.sums.reshape(bins, factor).sum(axis=1),
+            finest.mins.reshape(bins, factor).min(axis=1),
+            finest.maxs.reshape(bins, factor).max(axis=1),
+        )
+
+    def __iter__(self):
+        for bins in self.levels:
+            yield bins, self.level(bins)
+
+
+def overview_level(levels) -> int:
+    """Level shown first: the coarsest with at least ``OVERVIEW_BINS`` bins, else the finest."""
+    levels = sorted(levels)
+    return next((bins for bins in levels if bins >= OVERVIEW_BINS), levels[-1])
+
+
+def _write_tiles(minio, bucket: str, base_key: str, pyramid: LevelPyramid, x_axis: str, y_axis: str, x_min, x_max):
+    tiles = []
+    overview = overview_level(pyramid.levels)
+    overview_object = None
+    for level, acc in pyramid:
         frame = acc.to_frame(x_axis, y_axis)
         buffer = io.BytesIO()
         frame.to_parquet(buffer, index=False)
         buffer.seek(0)
         object_name = f"{base_key}/level_{level}.parquet"
+        if level == overview:
+            overview_object = object_name
         minio.put_object(
             bucket_name=bucket,
             object_name=object_name,
@@ -193,11 +511,305 @@ def _materialize_tiles(
                 "x_max": x_max,
             }
         )
+    return overview_object, tiles
+
+
+class _TileScan:
+    """Pyramids and counters for one stream of batches.
+
+    Scans over disjoint parts of a dataset with the same x bounds ``merge``
+    exactly, so row groups can be binned on separate threads.
+    """
+
+    def __init__(self, x_axis: str, y_axes, levels, x_min: float | None, x_max: float | None):
+        self.x_axis = x_axis
+        self.pyramids = {y_axis: LevelPyramid(levels, x_min, x_max) for y_axis in y_axes}
+        self.partitions = dict.fromkeys(y_axes, 0)
+        self.rows = 0
+        self.seen_min, self.seen_max = np.inf, -np.inf
+
+    @staticmethod
+    def footprint(y_axes, levels) -> int:
+        """Bytes held by one scan: counts/sums/mins/maxs at the finest level per y column."""
+        return len(y_axes) * max(levels) * 4 * 8
+
+    def add(self, chunk: pd.DataFrame):
+        x_values = chunk[self.x_axis].to_numpy(dtype=np.float64, na_value=np.nan)
+        x_present = ~np.isnan(x_values)
+        present = int(np.count_nonzero(x_present))
+        if not present:
+            return
+        self.rows += present
+        present_x = x_values if present == len(x_values) else x_values[x_present]
+        self.seen_min = min(self.seen_min, present_x.min())
+        self.seen_max = max(self.seen_max, present_x.max())
+        for y_axis, pyramid in self.pyramids.items():
+            y_values = chunk[y_axis].to_numpy(dtype=np.float64, na_value=np.nan)
+            keep = x_present & ~np.isnan(y_values)
+            if keep.all():
+                xs, ys = x_values, y_values
+            else:
+                xs, ys = x_values[keep], y_values[keep]
+            if not len(xs):
+                continue
+            self.partitions[y_axis] += 1
+            pyramid.ingest(xs, ys)
+
+    def merge(self, other: "_TileScan"):
+        for y_axis, pyramid in self.pyramids.items():
+            pyramid.merge(other.pyramids[y_axis])
+            self.partitions[y_axis] += other.partitions[y_axis]
+        self.rows += other.rows
+        self.seen_min = min(self.seen_min, other.seen_min)
+        self.seen_max = max(self.seen_max, other.seen_max)
+
+
+def _scan_row_groups_parallel(
+    source: DatasetObject, columns: list[str], new_scan, memory: MemoryBudget, workers: int, scan_bytes: int
+) -> tuple["_TileScan | None", int]:
+    """Bin a Parquet file's row groups on ``workers`` threads, each into its own ``_TileScan``.
+
+    Arrow decoding and the NumPy binning kernel release the GIL, so the
+    threads run on separate cores. Every thread opens its own ranged file
+    (the footer is parsed once) and takes every ``workers``-th row group.
+    Each thread's scan holds ``scan_bytes``, which is reserved from
+    ``memory`` before batches are sized. Returns ``(None, 1)`` when the file
+    cannot be split, so the caller falls back to the serial reader.
+    """
+    try:
+        metadata = source.parquet_file().metadata
+    except Exception:
+        return None, 1
+    workers = min(workers, metadata.num_row_groups)
+    if workers < 2:
+        return None, 1
+    columns = list(dict.fromkeys(columns))
+    memory.reserve(workers * scan_bytes)
+    memory.observe("batch_rows", 1, _parquet_bytes_per_row(metadata, columns))
+    # every thread has a batch in flight
+    batch_size = memory.rows("batch_rows", CHUNK_SIZE, share=MemoryBudget.CHUNK_SHARE * workers)
+    groups = list(range(metadata.num_row_groups))
+
+    def scan(row_groups: list[int]) -> _TileScan:
+        part = new_scan()
+        parquet_file = source.parquet_file()
+        for batch in parquet_file.iter_batches(
+            columns=columns, batch_size=batch_size, row_groups=row_groups, use_threads=False
+        ):
+            part.add(_batch_to_pandas(batch))
+        return part
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(scan, [groups[i::workers] for i in range(workers)]))
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    return merged, workers
+
+
+def _materialize_tiles(
+    minio,
+    bucket: str,
+    source: DatasetObject,
+    x_axis: str,
+    targets: dict[str, str],
+    levels: tuple[int, ...] = LOD_LEVELS,
+    axis_stats: dict | None = None,
+) -> dict[str, tuple]:
+    """Bin every y column of ``targets`` against ``x_axis`` in one shared pass.
+
+    ``targets`` maps each y column to the key prefix of its tiles. The x
+    column and all y columns are read together, and each batch feeds one
+    ``LevelPyramid`` per y column, so N series from the same dataset cost
+    about one scan. Parquet row groups are binned on several threads when
+    the x bounds are known up front (``_scan_row_groups_parallel``).
+    Returns ``{y_axis: (overview_object, tiles, stats)}``; the overview
+    object is the tile level used for the figure's initial trace.
+
+    The x range comes from ``_known_axis_bounds`` when possible (``axis_stats``
+    is the ingestion ``metadata.stats`` entry for ``x_axis``). Otherwise
+    ``VISUALIZATION_BOUNDS_FALLBACK`` picks an extra bounds scan or growable
+    bins.
+    """
+    memory = MemoryBudget()
+    known = _known_axis_bounds(source, x_axis, axis_stats)
+    if known:
+        x_min, x_max, bounds_source = known
+    elif settings.visualization_bounds_fallback == "grow":
+        x_min = x_max = None
+        bounds_source = "grown"
+    else:
+        x_min, x_max, _rows = _scan_axis_bounds(source, x_axis, memory)
+        bounds_source = "scan"
+    if x_min is not None and x_min == x_max:
+        x_max = x_min + 1e-9
+    columns = [x_axis, *targets]
+
+    def new_scan() -> _TileScan:
+        return _TileScan(x_axis, targets, levels, x_min, x_max)
+
+    scan, workers = None, 1
+    scan_bytes = _TileScan.footprint(targets, levels)
+    # growable bins differ per thread, so only known bounds can be split
+    if x_min is not None and source.ext in {".parquet", ".pq"}:
+        # the CPUs are shared with the other tasks that can run on this host
+        workers = settings.visualization_scan_workers or max(1, (os.cpu_count() or 2) // memory.tasks)
+        scan, workers = _scan_row_groups_parallel(source, columns, new_scan, memory, workers, scan_bytes)
+    if scan is None:
+        memory.reserve(scan_bytes)
+        scan = new_scan()
+        for chunk in _iter_chunks(source, columns, memory):
+            scan.add(chunk)
 
-    overview_level = min(levels)
-    overview_frame = accumulators[overview_level].to_frame(x_axis, y_axis)
+    if x_min is None:
+        if not np.isfinite(scan.seen_min) or not np.isfinite(scan.seen_max):
+            raise ValueError("Unable to detect range for x-axis")
+        x_min, x_max = float(scan.seen_min), float(scan.seen_max)
+        for pyramid in scan.pyramids.values():
+            # a y column with no value where x is present never got a range;
+            # give it the one seen so it writes empty tiles
+            pyramid.settle(x_min, x_max)
 
-    return overview_frame, tiles, {"x_min": x_min, "x_max": x_max, "rows": rows, "partitions": partitions}
+    os.makedirs(tempfile.gettempdir(), exist_ok=True)
+    results = {}
+    for y_axis, pyramid in scan.pyramids.items():
+        overview_object, tiles = _write_tiles(minio, bucket, targets[y_axis], pyramid, x_axis, y_axis, x_min, x_max)
+        results[y_axis] = overview_object, tiles, {
+            "x_min": x_min,
+            "x_max": x_max,
+            "rows": scan.rows,
+            "partitions": scan.partitions[y_axis],
+            "bounds_source": bounds_source,
+            "shared_scan_columns": len(targets),
+            "scan_workers": workers,
+            "memory": memory.describe(),
+            "read": source.describe(),
+        }
+    return results
+
+
+# Parquet footers of processed objects for zoom requests, keyed by (object, etag)
+_ZOOM_FOOTERS: OrderedDict = OrderedDict()
+_ZOOM_FOOTERS_SIZE = 32
+_zoom_footers_lock = threading.Lock()
+
+
+def _zoom_source(minio, job: dict) -> tuple[DatasetObject, tuple]:
+    if not job.get("processed_key"):
+        raise ValueError("Dataset has no processed Parquet to zoom into")
+    stat = minio.stat_object(settings.ingestion_bucket, job["processed_key"])
+    key = (job["processed_key"], stat.etag)
+    with _zoom_footers_lock:
+        metadata = _ZOOM_FOOTERS.get(key)
+        if metadata is not None:
+            _ZOOM_FOOTERS.move_to_end(key)
+    source = DatasetObject(
+        minio, settings.ingestion_bucket, job["processed_key"], ".parquet", size=stat.size, metadata=metadata
+    )
+    return source, key
+
+
+def _remember_footer(key: tuple, metadata):
+    with _zoom_footers_lock:
+        _ZOOM_FOOTERS[key] = metadata
+        _ZOOM_FOOTERS.move_to_end(key)
+        while len(_ZOOM_FOOTERS) > _ZOOM_FOOTERS_SIZE:
+            _ZOOM_FOOTERS.popitem(last=False)
+
+
+def _sorted_by(group_meta, column_index: int, values: np.ndarray) -> bool:
+    # a declared sort key without nulls is trusted; anything else is checked
+    sorting = getattr(group_meta, "sorting_columns", None) or ()
+    stats = group_meta.column(column_index).statistics
+    if (
+        sorting
+        and sorting[0].column_index == column_index
+        and not sorting[0].descending
+        and stats is not None
+        and stats.null_count == 0
+    ):
+        return True
+    return bool(np.all(values[1:] >= values[:-1]))
+
+
+def rebin_window(minio, job: dict, x_axis: str, y_axis: str, x_min: float, x_max: float, bins: int):
+    """Bin ``y_axis`` over ``x_min <= x <= x_max`` of a job's processed Parquet at ``bins`` bins.
+
+    Unlike the precomputed LOD levels, a zoom reads the file itself, so a
+    narrow window keeps full detail. Row groups whose x statistics miss the
+    window are skipped without being fetched. In row groups sorted by x
+    (declared ``sorting_columns`` or checked) the window is found by binary
+    search and sliced; other row groups are masked. A window holding at most
+    ``bins`` points returns the points themselves (``mode`` ``"points"``).
+    Points whose y is NaN or infinite are left out.
+    Returns ``(frame, info)``; the frame has the same columns as a tile.
+    """
+    started = time.perf_counter()
+    source, footer_key = _zoom_source(minio, job)
+    parquet_file = source.parquet_file()
+    _remember_footer(footer_key, parquet_file.metadata)
+    metadata = parquet_file.metadata
+    schema = metadata.schema.to_arrow_schema()
+    x_index = schema.get_field_index(x_axis)
+    missing = [name for name in (x_axis, y_axis) if schema.get_field_index(name) < 0]
+    if missing:
+        raise KeyError(f"Column(s) not in dataset: {', '.join(missing)}")
+
+    acc = LevelAccumulator(bins, x_min, x_max)
+    points_x, points_y, points = [], [], 0
+    groups_read = sorted_groups = 0
+    for group in range(metadata.num_row_groups):
+        group_meta = metadata.row_group(group)
+        stats = group_meta.column(x_index).statistics
+        if stats is not None and stats.has_min_max and _finite_number(stats.min) and _finite_number(stats.max):
+            if stats.max < x_min or stats.min > x_max:
+                continue
+        table = parquet_file.read_row_group(group, columns=[x_axis, y_axis], use_threads=False)
+        groups_read += 1
+        x = table.column(x_axis).to_numpy().astype(np.float64, copy=False)
+        y = table.column(y_axis).to_numpy().astype(np.float64, copy=False)
+        if _sorted_by(group_meta, x_index, x):
+            sorted_groups += 1
+            low = np.searchsorted(x, x_min, side="left")
+            high = np.searchsorted(x, x_max, side="right")
+            x, y = x[low:high], y[low:high]
+        else:
+            inside = (x >= x_min) & (x <= x_max)
+            x, y = x[inside], y[inside]
+        # +-inf would make the response invalid JSON, as NaN would
+        present = np.isfinite(y)
+        if not present.all():
+            x, y = x[present], y[present]
+        if not len(x):
+            continue
+        acc.ingest(x, y)
+        points += len(x)
+        if points <= bins:
+            points_x.append(x)
+            points_y.append(y)
+
+    if points <= bins:
+        x = np.concatenate(points_x) if points_x else np.empty(0)
+        y = np.concatenate(points_y) if points_y else np.empty(0)
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+        frame = pd.DataFrame(
+            {x_axis: x, "count": np.ones(len(x), dtype=np.int64), "y_mean": y, "y_min": y, "y_max": y}
+        )
+        mode = "points"
+    else:
+        frame = acc.to_frame(x_axis, y_axis)
+        mode = "bins"
+
+    return frame, {
+        "mode": mode,
+        "points": points,
+        "row_groups": metadata.num_row_groups,
+        "row_groups_read": groups_read,
+        "sorted_row_groups": sorted_groups,
+        "read": source.describe(),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
 
 
 def _build_figure(series_frames: list[dict], x_axis: str, chart_type: str):
@@ -249,25 +861,172 @@ def _build_figure(series_frames: list[dict], x_axis: str, chart_type: str):
     return fig
 
 
+def _series_list(doc: dict) -> list[dict]:
+    series_list = doc.get("series") or []
+    if not series_list and doc.get("y_axis"):
+        series_list = [
+            {
+                "job_id": doc.get("job_id"),
+                "y_axis": doc.get("y_axis"),
+                "label": doc.get("y_axis"),
+                "filename": doc.get("filename", "dataset"),
+            }
+        ]
+    return series_list
+
+
+def _dataset_source(minio, job: dict) -> DatasetObject:
+    # ✅ Prefer processed parquet if available
+    if job.get("processed_key"):
+        return DatasetObject(minio, settings.ingestion_bucket, job["processed_key"], ".parquet")
+    # fallback only if processed not available
+    ext = os.path.splitext(job.get("filename", "").lower())[-1]
+    return DatasetObject(minio, settings.ingestion_bucket, job["storage_key"], ext)
+
+
+def _tile_dataset(minio, doc: dict, viz_id: str, job: dict, indexes: list[int]) -> list[dict]:
+    """Tiles for the series at ``indexes`` (1-based), which all plot columns of ``job``.
+
+    Returns one JSON-safe entry per series, so the result can travel through
+    the Celery result backend.
+    """
+    series_list = _series_list(doc)
+    targets = {}
+    for idx in indexes:
+        targets.setdefault(
+            series_list[idx - 1]["y_axis"], f"projects/{doc['project_id']}/visualizations/{viz_id}/series_{idx}"
+        )
+    per_axis = _materialize_tiles(
+        minio,
+        settings.visualization_bucket,
+        _dataset_source(minio, job),
+        doc["x_axis"],
+        targets,
+        axis_stats=((job.get("metadata") or {}).get("stats") or {}).get(doc["x_axis"]),
+    )
+    entries = []
+    for idx in indexes:
+        overview_object, tiles, stats = per_axis[series_list[idx - 1]["y_axis"]]
+        entries.append({"index": idx, "overview_object": overview_object, "tiles": tiles, "stats": stats})
+    return entries
+
+
+def _record_dataset(redis, db, viz_id: str, indexes: list[int], total: int, succeeded: bool):
+    """Publish one finished dataset: its series' states and the overall tiling progress."""
+    name = f"visualization:{viz_id}:status"
+    pipe = redis.pipeline()
+    for idx in indexes:
+        pipe.hset(name, f"series_{idx}", states.SUCCESS if succeeded else states.FAILURE)
+    pipe.hincrby(name, "datasets_done", 1)
+    *_, done = pipe.execute()
+    progress = 20 + 40 * done // total
+    message = f"Tiled {done} of {total} datasets"
+    _set_status(redis, viz_id, states.STARTED, progress, message)
+    _update_db_status(db, viz_id, status=states.STARTED, progress=progress, message=message)
+
+
+def _fail_visualization(redis, db, viz_id: str, doc: dict | None, message: str):
+    _set_status(redis, viz_id, states.FAILURE, 100, message)
+    _update_db_status(db, viz_id, status=states.FAILURE, progress=100, message=message)
+    owner_email = (doc or {}).get("owner_email")
+    if owner_email:
+        create_sync_notification(
+            owner_email,
+            f"Visualization failed: {message}",
+            title="Visualization error",
+            category="visualization",
+            link=f"/app/projects/{doc.get('project_id')}/visualisation" if doc.get("project_id") else None,
+        )
+
+
+def _read_overview(minio, object_name: str) -> pd.DataFrame:
+    response = minio.get_object(settings.visualization_bucket, object_name)
+    try:
+        return pd.read_parquet(io.BytesIO(response.read()))
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def _finish_visualization(redis, db, viz_id: str, doc: dict, entries: list[dict]):
+    """Build and store the figure once every series has its tiles."""
+    minio = get_minio_client()
+    bucket = settings.visualization_bucket
+    series_list = _series_list(doc)
+    series_frames = []
+    tile_metadata = []
+    stats_metadata = []
+
+    for entry in sorted(entries, key=lambda item: item["index"]):
+        series = series_list[entry["index"] - 1]
+        display_frame = _read_overview(minio, entry["overview_object"]).rename(
+            columns=
+            {
+                "y_mean": series["y_axis"],
+                "y_min": f"{series['y_axis']}_min",
+                "y_max": f"{series['y_axis']}_max",
+            }
+        )
+
+        series_frames.append({"series": series, "frame": display_frame})
+        tile_metadata.append({"series": series, "tiles": entry["tiles"]})
+        stats_metadata.append({"series": series, "stats": entry["stats"]})
+
+    _set_status(redis, viz_id, states.STARTED, 60, "Building Plotly figure")
+    fig = _build_figure(series_frames, doc["x_axis"], doc.get("chart_type", "scatter"))
+    html = pio.to_html(fig, include_plotlyjs="cdn", full_html=True)
+
+    _set_status(redis, viz_id, states.STARTED, 85, "Saving visualization")
+    html_bytes = html.encode("utf-8")
+    html_key = f"projects/{doc['project_id']}/visualizations/{viz_id}.html"
+    minio.put_object(
+        bucket_name=bucket,
+        object_name=html_key,
+        data=io.BytesIO(html_bytes),
+        length=len(html_bytes),
+        content_type="text/html",
+    )
+
+    _set_status(redis, viz_id, states.SUCCESS, 100, "Visualization ready")
+    _update_db_status(
+        db,
+        viz_id,
+        status=states.SUCCESS,
+        progress=100,
+        message="Visualization ready",
+        html=html,
+        html_key=html_key,
+        tiles=tile_metadata,
+        series_stats=stats_metadata,
+    )
+    owner_email = doc.get("owner_email")
+    if owner_email:
+        create_sync_notification(
+            owner_email,
+            f"Visualization ready for {doc.get('chart_type', 'chart')} on {doc.get('x_axis')}",
+            title="Visualization complete",
+            category="visualization",
+            link=f"/app/projects/{doc.get('project_id')}/visualisation" if doc.get("project_id") else None,
+        )
+
+
 @celery_app.task(bind=True, name=f"{settings.celery_task_prefix}.generate_visualization")
 def generate_visualization(self, viz_id: str):
+    """Validate the series, then tile each dataset and build the figure.
+
+    Series are grouped by dataset. A single dataset is tiled in this task;
+    several are fanned out as one ``tile_visualization_dataset`` subtask
+    each (routed by that dataset's size), and the ``finish_visualization``
+    chord callback builds the figure once all of them are done.
+    """
     redis = get_sync_redis()
     db = get_sync_db()
+    doc = None
     try:
         doc = db.visualizations.find_one({"_id": ObjectId(viz_id)})
         if not doc:
             return
-        owner_email = doc.get("owner_email")
-        series_list = doc.get("series") or []
-        if not series_list and doc.get("y_axis"):
-            series_list = [
-                {
-                    "job_id": doc.get("job_id"),
-                    "y_axis": doc.get("y_axis"),
-                    "label": doc.get("y_axis"),
-                    "filename": doc.get("filename", "dataset"),
-                }
-            ]
+        series_list = _series_list(doc)
 
         if not series_list:
             _update_db_status(
@@ -279,8 +1038,9 @@ def generate_visualization(self, viz_id: str):
             )
             return
 
-        series_jobs: list[dict] = []
-        for series in series_list:
+        # series on the same dataset share one scan; the same y column twice shares its tiles
+        datasets: dict[str, dict] = {}
+        for idx, series in enumerate(series_list, start=1):
             job_id = series.get("job_id")
             y_axis = series.get("y_axis")
             if not job_id or not y_axis:
@@ -293,120 +1053,87 @@ def generate_visualization(self, viz_id: str):
                 )
                 return
 
-            job = db.ingestion_jobs.find_one({"_id": ObjectId(job_id)})
-            if not job:
-                _update_db_status(
-                    db,
-                    viz_id,
-                    status=states.FAILURE,
-                    progress=100,
-                    message="Dataset not found",
-                )
-                return
-
-            series_jobs.append({"series": series, "job": job})
+            if str(job_id) not in datasets:
+                job = db.ingestion_jobs.find_one({"_id": ObjectId(job_id)})
+                if not job:
+                    _update_db_status(
+                        db,
+                        viz_id,
+                        status=states.FAILURE,
+                        progress=100,
+                        message="Dataset not found",
+                    )
+                    return
+                datasets[str(job_id)] = {"job": job, "indexes": []}
+            datasets[str(job_id)]["indexes"].append(idx)
 
         _set_status(redis, viz_id, states.STARTED, 10, "Preparing visualization")
         _update_db_status(db, viz_id, status=states.STARTED, progress=10, message="Preparing visualization")
+        redis.hset(f"visualization:{viz_id}:status", mapping={"datasets_total": len(datasets), "datasets_done": 0})
 
         minio = get_minio_client()
         bucket = settings.visualization_bucket
         if not minio.bucket_exists(bucket):
             minio.make_bucket(bucket)
-        series_frames = []
-        tile_metadata = []
-        stats_metadata = []
-
-        for idx, item in enumerate(series_jobs, start=1):
-            job = item["job"]
-
-            # ✅ Prefer processed parquet if available
-            if job.get("processed_key"):
-                data_url = minio.presigned_get_object(
-                    bucket_name=settings.ingestion_bucket,
-                    object_name=job["processed_key"],
-                    expires=timedelta(hours=6),
-                )
-                ext = ".parquet"
-            else:
-                # fallback only if processed not available
-                data_url = minio.presigned_get_object(
-                    bucket_name=settings.ingestion_bucket,
-                    object_name=job["storage_key"],
-                    expires=timedelta(hours=6),
-                )
-                ext = os.path.splitext(job.get("filename", "").lower())[-1]
-
-
-            _set_status(redis, viz_id, states.STARTED, 30, f"Profiling series {idx}")
-            base_key = f"projects/{doc['project_id']}/visualizations/{viz_id}/series_{idx}"
-            overview, tiles, stats = _materialize_tiles(
-                minio,
-                bucket,
-                base_key,
-                data_url,
-                ext,
-                doc["x_axis"],
-                item["series"]["y_axis"],
-            )
 
-            display_frame = overview.rename(
-                columns=
-                {
-                    "y_mean": item["series"]["y_axis"],
-                    "y_min": f"{item['series']['y_axis']}_min",
-                    "y_max": f"{item['series']['y_axis']}_max",
-                }
+        if len(datasets) == 1:
+            (dataset,) = datasets.values()
+            _set_status(redis, viz_id, states.STARTED, 30, "Profiling dataset")
+            entries = _tile_dataset(minio, doc, viz_id, dataset["job"], dataset["indexes"])
+            _record_dataset(redis, db, viz_id, dataset["indexes"], 1, succeeded=True)
+            _finish_visualization(redis, db, viz_id, doc, entries)
+            return
+
+        header = [
+            tile_visualization_dataset.s(viz_id, job_id, dataset["indexes"], len(datasets)).set(
+                queue=queue_for(dataset["job"].get("size_bytes"), dataset["job"].get("rows_seen")),
+                headers={"memory_estimate": estimate_task_memory(dataset["job"].get("size_bytes"))},
             )
+            for job_id, dataset in datasets.items()
+        ]
+        _set_status(redis, viz_id, states.STARTED, 20, f"Tiling {len(datasets)} datasets")
+        chord(header)(finish_visualization.s(viz_id).set(queue=settings.celery_light_queue))
+    except Exception as exc:  # noqa: BLE001
+        _fail_visualization(redis, db, viz_id, doc, str(exc))
+        raise
 
-            series_frames.append({"series": item["series"], "frame": display_frame})
-            tile_metadata.append({"series": item["series"], "tiles": tiles})
-            stats_metadata.append({"series": item["series"], "stats": stats})
 
-        _set_status(redis, viz_id, states.STARTED, 60, "Building Plotly figure")
-        fig = _build_figure(series_frames, doc["x_axis"], doc.get("chart_type", "scatter"))
-        html = pio.to_html(fig, include_plotlyjs="cdn", full_html=True)
+@celery_app.task(name=f"{settings.celery_task_prefix}.tile_visualization_dataset")
+def tile_visualization_dataset(viz_id: str, job_id: str, indexes: list[int], total: int) -> dict:
+    """Tile one dataset of a multi-dataset visualization (a ``finish_visualization`` chord member).
 
-        _set_status(redis, viz_id, states.STARTED, 85, "Saving visualization")
-        html_bytes = html.encode("utf-8")
-        html_key = f"projects/{doc['project_id']}/visualizations/{viz_id}.html"
-        minio.put_object(
-            bucket_name=bucket,
-            object_name=html_key,
-            data=io.BytesIO(html_bytes),
-            length=len(html_bytes),
-            content_type="text/html",
-        )
+    Failures are returned rather than raised, so the chord callback still
+    runs and can report them.
+    """
+    redis = get_sync_redis()
+    db = get_sync_db()
+    try:
+        doc = db.visualizations.find_one({"_id": ObjectId(viz_id)})
+        job = db.ingestion_jobs.find_one({"_id": ObjectId(job_id)})
+        if not doc or not job:
+            raise ValueError("Dataset not found")
+        result = {"entries": _tile_dataset(get_minio_client(), doc, viz_id, job, indexes)}
+    except Exception as exc:  # noqa: BLE001 - reported by finish_visualization
+        logger.exception("Tiling dataset %s of visualization %s failed", job_id, viz_id)
+        result = {"error": str(exc)}
+    _record_dataset(redis, db, viz_id, indexes, total, succeeded="error" not in result)
+    return result
 
-        _set_status(redis, viz_id, states.SUCCESS, 100, "Visualization ready")
-        _update_db_status(
-            db,
-            viz_id,
-            status=states.SUCCESS,
-            progress=100,
-            message="Visualization ready",
-            html=html,
-            html_key=html_key,
-            tiles=tile_metadata,
-            series_stats=stats_metadata,
-        )
-        if owner_email:
-            create_sync_notification(
-                owner_email,
-                f"Visualization ready for {doc.get('chart_type', 'chart')} on {doc.get('x_axis')}",
-                title="Visualization complete",
-                category="visualization",
-                link=f"/app/projects/{doc.get('project_id')}/visualisation" if doc.get("project_id") else None,
-            )
+
+@celery_app.task(name=f"{settings.celery_task_prefix}.finish_visualization")
+def finish_visualization(results: list[dict], viz_id: str):
+    redis = get_sync_redis()
+    db = get_sync_db()
+    doc = None
+    try:
+        doc = db.visualizations.find_one({"_id": ObjectId(viz_id)})
+        if not doc:
+            return
+        errors = [result["error"] for result in results if "error" in result]
+        if errors:
+            _fail_visualization(redis, db, viz_id, doc, "; ".join(errors))
+            return
+        _finish_visualization(redis, db, viz_id, doc, [entry for result in results for entry in result["entries"]])
     except Exception as exc:  # noqa: BLE001
-        _set_status(redis, viz_id, states.FAILURE, 100, str(exc))
-        _update_db_status(db, viz_id, status=states.FAILURE, progress=100, message=str(exc))
-        if owner_email:
-            create_sync_notification(
-                owner_email,
-                f"Visualization failed: {str(exc)}",
-                title="Visualization error",
-                category="visualization",
-                link=f"/app/projects/{doc.get('project_id')}/visualisation" if doc.get("project_id") else None,
-            )
+        _fail_visualization(redis, db, viz_id, doc, str(exc))
         raise
@@ -0,0 +1,4 @@
+"""Ingestion benchmarks: synthetic data generators and a JSON-reporting runner.
+
+Run from the ``backend`` folder with ``python -m benchmarks.ingestion --help``.
+"""
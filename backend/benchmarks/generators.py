@@ -0,0 +1,147 @@
+"""Deterministic synthetic datasets shaped like the files users upload.
+
+Every generator takes an output path, a row count and a seed, and writes the
+same bytes for the same arguments so benchmark runs are comparable.
+``rows_for_size`` converts a target file size into a row count for any of
+them.
+"""
+
+import io
+import os
+import tempfile
+
+import numpy as np
+
+FLIGHT_PHASES = ["taxi", "takeoff", "climb", "cruise", "descent", "approach", "landing"]
+WIND_COLUMNS = ["Alpha", "Beta", "q", "CL", "CD", "CY", "Cl", "Cm", "Cn", "Re", "Mach", "T"]
+_BLOCK_ROWS = 50_000
+
+
+def _blocks(rows: int, block_rows: int = _BLOCK_ROWS):
+    for start in range(0, rows, block_rows):
+        yield start, min(block_rows, rows - start)
+
+
+def _flight_block(rng, start: int, n: int, channels: int, null_fraction: float) -> dict:
+    t = (start + np.arange(n)) * 0.05
+    block = {
+        "time": t,
+        "latitude": 47.45 + np.cumsum(rng.normal(0, 1e-4, n)),
+        "longitude": -122.31 + np.cumsum(rng.normal(0, 1e-4, n)),
+        "altitude_ft": np.abs(35_000 * np.sin(t / 4_000) + rng.normal(0, 15, n)),
+        "airspeed_kt": 250 + 200 * np.sin(t / 5_000) + rng.normal(0, 2, n),
+        "heading_deg": np.mod(90 + np.cumsum(rng.normal(0, 0.05, n)), 360),
+        "pitch_deg": rng.normal(2, 1.5, n),
+        "roll_deg": rng.normal(0, 3, n),
+    }
+    for i in range(channels):
+        block[f"sensor_{i:02d}"] = np.sin(t / (i + 3)) * (i + 1) + rng.normal(0, 0.02, n)
+    if null_fraction:
+        for name in ("airspeed_kt", "pitch_deg"):
+            values = block[name]
+            values[rng.random(n) < null_fraction] = np.nan
+    block["phase"] = np.asarray(FLIGHT_PHASES, dtype=object)[rng.integers(0, len(FLIGHT_PHASES), n)]
+    block["gear_down"] = rng.integers(0, 2, n)
+    return block
+
+
+def flight_csv(path: str, rows: int, channels: int = 16, seed: int = 0, null_fraction: float = 0.001) -> str:
+    """Flight-recorder style CSV: float channels, a text phase and an int flag."""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    with open(path, "w", newline="") as f:
+        for start, n in _blocks(rows):
+            frame = pd.DataFrame(_flight_block(rng, start, n, channels, null_fraction))
+            frame.to_csv(f, index=False, header=start == 0, float_format="%.6g")
+    return path
+
+
+def excel_workbook(path: str, rows: int, channels: int = 8, sheets: int = 3, seed: int = 0) -> str:
+    """Multi-sheet .xlsx; the first sheet holds the flight data that gets ingested.
+
+    The remaining sheets (run notes and a smaller copy of the data) are there
+    so readers are measured on realistic workbooks, not single-sheet ones.
+    """
+    from openpyxl import Workbook
+
+    rng = np.random.default_rng(seed)
+    wb = Workbook(write_only=True)
+    data = wb.create_sheet("data")
+    header_written = False
+    for start, n in _blocks(rows):
+        block = _flight_block(rng, start, n, channels, null_fraction=0)
+        names = list(block)
+        if not header_written:
+            data.append(names)
+            header_written = True
+        columns = [block[name].tolist() for name in names]
+        for row in zip(*columns):
+            data.append(row)
+
+    for i in range(1, sheets):
+        sheet = wb.create_sheet(f"sheet_{i + 1}")
+        if i == 1:
+            sheet.append(["key", "value"])
+            for key, value in (("aircraft", "TEST-01"), ("seed", seed), ("rows", rows)):
+                sheet.append([key, value])
+            continue
+        extra = _flight_block(rng, 0, min(rows, 1_000), channels, null_fraction=0)
+        sheet.append(list(extra))
+        for row in zip(*(values.tolist() for values in extra.values())):
+            sheet.append(row)
+
+    wb.save(path)
+    return path
+
+
+def wind_txt(path: str, rows: int, seed: int = 0, text_every: int = 0) -> str:
+    """Balance output in the ``%Dyn`` layout read by ``_wind_txt_to_parquet``.
+
+    ``text_every`` > 0 inserts a non-numeric note line every that many rows,
+    which pushes the parser onto its slower per-line path for those blocks.
+    """
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as f:
+        f.write("Wind tunnel balance export\n")
+        f.write("Model: synthetic    Configuration: clean\n\n")
+        # the parser keeps "%Dyn" as the first column name (the test point)
+        f.write("%Dyn " + " ".join(WIND_COLUMNS) + "\n")
+        for start, n in _blocks(rows):
+            alpha = -5 + 20 * ((start + np.arange(n)) % 1_000) / 1_000
+            values = np.column_stack([
+                start + np.arange(n),
+                alpha,
+                rng.normal(0, 0.5, n),
+                rng.normal(1_500, 5, n),
+                0.1 * alpha + rng.normal(0, 0.01, n),
+                0.02 + 0.001 * alpha ** 2 + rng.normal(0, 0.001, n),
+                *(rng.normal(0, 0.01, (4, n))),
+                rng.normal(1.2e6, 1e3, n),
+                rng.normal(0.15, 0.001, n),
+                rng.normal(293, 0.2, n),
+            ])
+            if not text_every:
+                np.savetxt(f, values, fmt="%.6g")
+                continue
+            buffer = io.StringIO()
+            np.savetxt(buffer, values, fmt="%.6g")
+            lines = buffer.getvalue().splitlines()
+            for i in range(len(lines) - 1, 0, -1):
+                if (start + i) % text_every == 0:
+                    lines.insert(i, "-- balance re-zero --")
+            f.write("\n".join(lines) + "\n")
+    return path
+
+
+def rows_for_size(generator, target_bytes: int, sample_rows: int = 5_000, **kwargs) -> int:
+    """Estimate the row count at which ``generator`` writes ``target_bytes``."""
+    suffix = {excel_workbook: ".xlsx", wind_txt: ".txt"}.get(generator, ".csv")
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        generator(path, sample_rows, **kwargs)
+        per_row = os.path.getsize(path) / sample_rows
+    finally:
+        os.remove(path)
+    return max(1, int(target_bytes / per_row))
@@ -0,0 +1,210 @@
+"""Measure ingestion throughput on synthetic files, without Mongo, Redis or MinIO.
+
+Generates flight CSVs, multi-sheet Excel workbooks and ``%Dyn`` wind TXT
+files (see ``benchmarks.generators``), converts each one with the same
+functions the Celery task uses, and prints JSON with rows/s, MB/s, peak RSS
+and output size per case. Every case runs in a fresh process so its peak RSS
+is not inflated by the previous one. Run from the ``backend`` folder:
+
+    python -m benchmarks.ingestion --csv-mb 200 --excel-rows 100000 --wind-mb 100
+    python -m benchmarks.ingestion --cases csv-arrow,csv-pandas --out before.json
+    python -m benchmarks.ingestion --out after.json --baseline before.json
+
+With ``--baseline`` the run fails (exit code 1) when a case is slower than
+the baseline by more than ``--tolerance``.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import generators
+
+# case -> (input format, converter name in app.tasks.ingestion, engine)
+CASES = {
+    "csv-arrow": ("csv", "_csv_to_parquet", "arrow"),
+    "csv-pandas": ("csv", "_csv_to_parquet", "pandas"),
+    "excel-stream": ("excel", "_excel_to_parquet", "stream"),
+    "excel-pandas": ("excel", "_excel_to_parquet", "pandas"),
+    "wind": ("wind", "_wind_txt_to_parquet", None),
+}
+FORMATS = {
+    "csv": (generators.flight_csv, ".csv"),
+    "excel": (generators.excel_workbook, ".xlsx"),
+    "wind": (generators.wind_txt, ".txt"),
+}
+MB = 1024 * 1024
+
+
+def _rss_mb() -> float:
+    import psutil
+
+    return psutil.Process().memory_info().rss / MB
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / MB
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(case: str, input_path: str, output_path: str) -> dict:
+    # Runs in a child process; imports happen before the baseline RSS sample.
+    from app.tasks import ingestion
+
+    _fmt, converter, engine = CASES[case]
+    convert = getattr(ingestion, converter)
+    kwargs = {"engine": engine} if engine else {}
+    baseline_rss = _rss_mb()
+
+    start = time.perf_counter()
+    columns, rows, _sample, _stats = convert(input_path, output_path, "file", None, **kwargs)
+    seconds = time.perf_counter() - start
+
+    input_bytes = os.path.getsize(input_path)
+    return {
+        "case": case,
+        "rows": rows,
+        "columns": len(columns),
+        "input_bytes": input_bytes,
+        "output_bytes": os.path.getsize(output_path),
+        "seconds": round(seconds, 4),
+        "rows_per_s": round(rows / seconds, 1),
+        "mb_per_s": round(input_bytes / MB / seconds, 2),
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def run_isolated(case: str, input_path: str, output_path: str) -> dict:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_case, case, input_path, output_path).result()
+
+
+def generate_inputs(args: argparse.Namespace, formats: set[str], data_dir: str) -> dict[str, str]:
+    row_counts = {
+        "csv": args.csv_rows or generators.rows_for_size(generators.flight_csv, int(args.csv_mb * MB)),
+        "excel": args.excel_rows,
+        "wind": args.wind_rows or generators.rows_for_size(generators.wind_txt, int(args.wind_mb * MB)),
+    }
+    paths = {}
+    for fmt in sorted(formats):
+        generator, suffix = FORMATS[fmt]
+        path = os.path.join(data_dir, f"{fmt}_{row_counts[fmt]}_{args.seed}{suffix}")
+        if not os.path.exists(path):
+            print(f"[bench] generating {fmt}: {row_counts[fmt]} rows", file=sys.stderr)
+            generator(path, row_counts[fmt], seed=args.seed)
+        paths[fmt] = path
+    return paths
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    previous = {r["case"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result["case"])
+        if not before or before.get("input_bytes") != result["input_bytes"]:
+            continue
+        ratio = result["rows_per_s"] / before["rows_per_s"]
+        result["vs_baseline"] = round(ratio, 3)
+        if ratio < 1 - tolerance:
+            regressions.append(f"{result['case']}: {ratio:.2f}x baseline rows/s")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ingestion converters on synthetic data.")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated cases (default: all of {', '.join(CASES)})")
+    parser.add_argument("--csv-mb", type=float, default=100, help="Size of the generated CSV (default: 100)")
+    parser.add_argument("--csv-rows", type=int, default=None, help="Row count for the CSV; overrides --csv-mb")
+    parser.add_argument("--excel-rows", type=int, default=50_000, help="Rows on the first Excel sheet (default: 50000)")
+    parser.add_argument("--wind-mb", type=float, default=50, help="Size of the generated wind TXT (default: 50)")
+    parser.add_argument("--wind-rows", type=int, default=None, help="Row count for the wind TXT; overrides --wind-mb")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest is reported")
+    parser.add_argument("--data-dir", default=None, help="Keep generated inputs here and reuse them across runs")
+    parser.add_argument("--out", default=None, help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to compare rows/s against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed rows/s drop vs --baseline (default: 0.2)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        raise SystemExit(f"unknown case(s): {', '.join(unknown)}")
+
+    import pandas as pd
+    import pyarrow as pa
+
+    from app.core.config import settings
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "pandas": pd.__version__,
+            "pyarrow": pa.__version__,
+            "parquet_compression": settings.ingestion_parquet_compression,
+            "parquet_row_group_rows": settings.ingestion_parquet_row_group_rows,
+        },
+        "inputs": {},
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        inputs = generate_inputs(args, {CASES[c][0] for c in cases}, data_dir)
+        report["inputs"] = {fmt: {"path": os.path.basename(p), "bytes": os.path.getsize(p)} for fmt, p in inputs.items()}
+
+        for case in cases:
+            runs = []
+            for _ in range(max(1, args.repeat)):
+                output_path = os.path.join(tmp, f"{case}.parquet")
+                runs.append(run_isolated(case, inputs[CASES[case][0]], output_path))
+                os.remove(output_path)
+            best = min(runs, key=lambda r: r["seconds"])
+            best["peak_rss_mb"] = max(r["peak_rss_mb"] for r in runs)
+            print(f"[bench] {case}: {best['rows_per_s']:.0f} rows/s, {best['mb_per_s']} MB/s", file=sys.stderr)
+            report["results"].append(best)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report["results"], json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    if regressions:
+        print("[bench] regressions: " + "; ".join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare the processed Parquet layout against the previous writer settings.
+
+Writes the same data twice -- once the way ingestion used to (snappy, one row
+group per parser chunk, no page index) and once through
+``LayoutParquetWriter`` -- then reports file size, write time, full scan
+time, single-column scan time and a 1% time-range query that can skip row
+groups using their statistics. Run from the ``backend`` folder:
+
+    python -m benchmarks.parquet_layout
+    python -m benchmarks.parquet_layout --rows 5000000 --out layout.json
+    python -m benchmarks.parquet_layout --csv sample_data/flight.csv --sort-column auto
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.tasks.ingestion import CSV_CHUNK_ROWS, LayoutParquetWriter, ParquetLayout
+
+
+def synthetic_flight_table(rows: int, channels: int = 12, seed: int = 0) -> pa.Table:
+    rng = np.random.default_rng(seed)
+    t = np.arange(rows) * 0.01
+    columns = {"time": t}
+    for i in range(channels):
+        columns[f"ch_{i}"] = np.sin(t / (i + 1)) + rng.normal(0, 0.05, rows)
+    columns["phase"] = rng.choice(["taxi", "climb", "cruise", "descent"], rows)
+    columns["valid"] = rng.integers(0, 2, rows)
+    return pa.table(columns)
+
+
+def write_baseline(table: pa.Table, path: str):
+    with pq.ParquetWriter(path, table.schema, compression="snappy") as writer:
+        for offset in range(0, table.num_rows, CSV_CHUNK_ROWS):
+            writer.write_table(table.slice(offset, CSV_CHUNK_ROWS))
+
+
+def write_layout(table: pa.Table, path: str, layout: ParquetLayout):
+    with LayoutParquetWriter(path, table.schema, layout) as writer:
+        for batch in table.to_batches(max_chunksize=64 * 1024):
+            writer.write_batch(batch)
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(path: str, key: str, lo, hi, value_column: str) -> dict:
+    pf = pq.ParquetFile(path)
+    key_index = pf.schema_arrow.get_field_index(key)
+    groups_hit = 0
+    for i in range(pf.metadata.num_row_groups):
+        stats = pf.metadata.row_group(i).column(key_index).statistics
+        if stats is None or not stats.has_min_max or (stats.max >= lo and stats.min < hi):
+            groups_hit += 1
+    return {
+        "size_mb": round(os.path.getsize(path) / 1e6, 2),
+        "row_groups": pf.metadata.num_row_groups,
+        "full_scan_s": round(timed(lambda: pq.read_table(path)), 4),
+        "column_scan_s": round(timed(lambda: pq.read_table(path, columns=[value_column])), 4),
+        "range_query_s": round(
+            timed(lambda: pq.read_table(path, columns=[key, value_column], filters=[(key, ">=", lo), (key, "<", hi)])),
+            4,
+        ),
+        "range_row_groups_read": groups_hit,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark processed Parquet layouts.")
+    parser.add_argument("--csv", help="CSV file to convert (default: synthetic flight data)")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic rows when --csv is not given")
+    parser.add_argument("--row-group-rows", type=int, default=None)
+    parser.add_argument("--compression", default=None)
+    parser.add_argument("--compression-level", type=int, default=None)
+    parser.add_argument("--sort-column", default=None, help='Column to sort row groups by, or "auto"')
+    parser.add_argument("--out", default=None, help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    table = pacsv.read_csv(args.csv) if args.csv else synthetic_flight_table(args.rows)
+    layout = ParquetLayout(
+        row_group_rows=args.row_group_rows,
+        compression=args.compression,
+        compression_level=args.compression_level,
+        sort_column=args.sort_column,
+    )
+
+    numeric = [f.name for f in table.schema if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)]
+    if not numeric:
+        raise SystemExit("benchmark needs at least one numeric column")
+    key = numeric[0]
+    value_column = numeric[1] if len(numeric) > 1 else key
+    key_values = table.column(key).drop_null()
+    lo = np.quantile(key_values, 0.50).item()
+    hi = np.quantile(key_values, 0.51).item()
+
+    results = {"rows": table.num_rows, "columns": table.num_columns, "key": key}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, write in (
+            ("baseline", lambda path: write_baseline(table, path)),
+            ("layout", lambda path: write_layout(table, path, layout)),
+        ):
+            path = os.path.join(tmp, f"{name}.parquet")
+            write_s = timed(lambda: write(path), repeat=1)
+            results[name] = {"write_s": round(write_s, 4), **measure(path, key, lo, hi, value_column)}
+            print(f"[bench] {name}: {results[name]['size_mb']} MB, written in {results[name]['write_s']}s", file=sys.stderr)
+    results["size_ratio"] = round(results["layout"]["size_mb"] / results["baseline"]["size_mb"], 3)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
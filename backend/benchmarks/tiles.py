@@ -0,0 +1,144 @@
+"""Compare the tile binning kernel with the pandas groupby it replaced.
+
+Feeds ``--rows`` synthetic (x, y) points in chunks of ``--chunk-rows`` to
+every LOD level, once through a ``LevelPyramid`` the way ``_materialize_tiles``
+does (the NumPy kernel at the finest level, coarser levels merged from it) and
+once with the previous ``np.digitize`` + ``DataFrame.groupby`` code on a
+``LevelAccumulator`` per level. Chunks are generated on the fly,
+so 100M rows need no more memory than one chunk. ``sorted`` x (a time axis)
+takes the kernel's contiguous-run path, and ``random`` x the
+bincount/``ufunc.at`` path. Run from the ``backend`` folder:
+
+    python -m benchmarks.tiles
+    python -m benchmarks.tiles --rows 10000000 --x-order random --out tiles.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.tasks.visualization import CHUNK_SIZE, LOD_LEVELS, LevelAccumulator, LevelPyramid
+
+
+def groupby_ingest(acc: LevelAccumulator, x: np.ndarray, y: np.ndarray):
+    # The previous LevelAccumulator.ingest, kept as the baseline.
+    bin_index = np.digitize(x, acc.edges) - 1
+    bin_index[x == acc.edges[-1]] = acc.bins - 1
+    valid = (bin_index >= 0) & (bin_index < acc.bins)
+    if not np.any(valid):
+        return
+    df = pd.DataFrame({"bin": bin_index[valid], "y": y[valid]})
+    grouped = df.groupby("bin")["y"].agg(["count", "sum", "min", "max"])
+
+    bin_ids = grouped.index.to_numpy()
+    acc.counts[bin_ids] += grouped["count"].to_numpy()
+    acc.sums[bin_ids] += grouped["sum"].to_numpy()
+    acc.mins[bin_ids] = np.minimum(acc.mins[bin_ids], grouped["min"].to_numpy())
+    acc.maxs[bin_ids] = np.maximum(acc.maxs[bin_ids], grouped["max"].to_numpy())
+
+
+KERNELS = ("numpy", "groupby")
+
+
+def _chunks(rows: int, chunk_rows: int, seed: int, x_order: str):
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        if x_order == "sorted":
+            x = (start + np.arange(n)) * 0.05
+        else:
+            x = rng.uniform(0, rows * 0.05, n)
+        yield x, np.sin(x / 500) + rng.normal(0, 0.1, n)
+
+
+def run(kernel: str, rows: int, chunk_rows: int, levels: list[int], seed: int, x_order: str) -> dict:
+    x_max = rows * 0.05
+    binning = 0.0
+    if kernel == "numpy":
+        pyramid = LevelPyramid(levels, 0.0, x_max)
+        for x, y in _chunks(rows, chunk_rows, seed, x_order):
+            start = time.perf_counter()
+            pyramid.ingest(x, y)
+            binning += time.perf_counter() - start
+        start = time.perf_counter()
+        accumulators = [acc for _bins, acc in pyramid]
+        binning += time.perf_counter() - start
+    else:
+        accumulators = [LevelAccumulator(bins, 0.0, x_max) for bins in levels]
+        for x, y in _chunks(rows, chunk_rows, seed, x_order):
+            start = time.perf_counter()
+            for acc in accumulators:
+                groupby_ingest(acc, x, y)
+            binning += time.perf_counter() - start
+    return {
+        "kernel": kernel,
+        "rows": rows,
+        "x_order": x_order,
+        "seconds": round(binning, 3),
+        "rows_per_s": round(rows / binning, 1),
+        "accumulators": accumulators,
+    }
+
+
+def same_result(a: list[LevelAccumulator], b: list[LevelAccumulator]) -> bool:
+    return all(
+        np.array_equal(x.counts, y.counts)
+        and np.allclose(x.sums, y.sums)
+        and np.array_equal(x.mins, y.mins)
+        and np.array_equal(x.maxs, y.maxs)
+        for x, y in zip(a, b)
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the tile binning kernel.")
+    parser.add_argument("--rows", default="10000000,100000000", help="Comma-separated row counts (default: 10M,100M)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_SIZE, help=f"Rows per chunk (default: {CHUNK_SIZE})")
+    parser.add_argument("--levels", default=",".join(map(str, LOD_LEVELS)), help="Comma-separated bin counts")
+    parser.add_argument("--kernels", default=",".join(KERNELS), help=f"Comma-separated kernels (default: {', '.join(KERNELS)})")
+    parser.add_argument("--x-order", default="sorted,random", help="Comma-separated x orders (default: sorted,random)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    row_counts = [int(float(r)) for r in args.rows.split(",") if r.strip()]
+    levels = sorted({int(l) for l in args.levels.split(",") if l.strip()})
+    kernels = [k.strip() for k in args.kernels.split(",") if k.strip()]
+    unknown = [k for k in kernels if k not in KERNELS]
+    if unknown:
+        raise SystemExit(f"unknown kernel(s): {', '.join(unknown)}")
+
+    report = {"chunk_rows": args.chunk_rows, "levels": levels, "results": []}
+    cases = [(rows, order.strip()) for rows in row_counts for order in args.x_order.split(",") if order.strip()]
+    for rows, x_order in cases:
+        runs = {}
+        for kernel in kernels:
+            runs[kernel] = run(kernel, rows, args.chunk_rows, levels, args.seed, x_order)
+            print(f"[bench] {kernel} @ {rows} rows, {x_order} x: {runs[kernel]['seconds']}s", file=sys.stderr)
+        entry = {"rows": rows, "x_order": x_order, "kernels": {k: {key: v for key, v in r.items() if key != "accumulators"} for k, r in runs.items()}}
+        if {"numpy", "groupby"} <= runs.keys():
+            entry["speedup"] = round(runs["groupby"]["seconds"] / runs["numpy"]["seconds"], 2)
+            entry["same_result"] = same_result(runs["numpy"]["accumulators"], runs["groupby"]["accumulators"])
+        report["results"].append(entry)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ folder:
 
     python scripts/run_stack.py --host 0.0.0.0 --port 8000
 
+Pass ``--queues split`` to start separate workers for the light and heavy
+task queues (see ``queue_for`` in ``app.core.celery_app``).
+
 Press ``Ctrl+C`` to stop the API and Celery processes. Docker containers are
 left running so they can be reused across runs.
 """
@@ -25,6 +28,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from app.core.config import settings
 from app.core.system_info import describe_autoscale
 DATA_ROOT = PROJECT_ROOT / "data"
 
@@ -117,6 +121,41 @@ def start_process(label: str, args: List[str]) -> subprocess.Popen:
 
 
 
+def celery_worker_cmd(
+    autoscale: Dict[str, int],
+    *,
+    queues: Optional[str] = None,
+    name: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    prefetch: Optional[int] = None,
+) -> List[str]:
+    cmd: List[str] = [
+        sys.executable,
+        "-m",
+        "celery",
+        "-A",
+        "app.core.celery_app.celery_app",
+        "worker",
+        "--loglevel=info",
+    ]
+    if queues:
+        cmd.extend(["-Q", queues])
+    if name:
+        cmd.extend(["-n", f"{name}@%h"])
+    if prefetch:
+        cmd.append(f"--prefetch-multiplier={prefetch}")
+
+    if sys.platform.startswith("win"):
+        # Celery's prefork pool is unsupported on Windows; use solo to avoid
+        # spawn/unpack errors like "not enough values to unpack".
+        cmd.extend(["-P", "solo"])
+    elif concurrency:
+        cmd.append(f"--concurrency={concurrency}")
+    else:
+        cmd.append(f"--autoscale={autoscale['autoscale_max']},{autoscale['autoscale_min']}")
+    return cmd
+
+
 def stop_processes(processes: List[subprocess.Popen]) -> None:
     for proc in processes:
         if proc.poll() is None:
@@ -138,6 +177,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--minio-api-port", type=int, default=9000, help="MinIO API port (default: 9000)")
     parser.add_argument("--mongo-port", type=int, default=27017, help="MongoDB port (default: 27017)")
     parser.add_argument("--redis-port", type=int, default=6379, help="Redis port (default: 6379)")
+    parser.add_argument(
+        "--queues",
+        choices=["all", "split"],
+        default="all",
+        help="'all': one worker for every queue; 'split': separate light and heavy workers (default: all)",
+    )
     return parser.parse_args()
 
 
@@ -170,11 +215,14 @@ def main() -> None:
 
     autoscale = describe_autoscale()
     print(
-        "[autoscale] RAM: {ram} GB, CPU: {cpu}, Celery autoscale min={amin} max={amax}".format(
+        "[autoscale] RAM: {ram} GB, CPU: {cpu}, Celery autoscale min={amin} max={amax} "
+        "(memory allows {cap} x {child} MB)".format(
             ram=autoscale["ram_gb"],
             cpu=autoscale["cpus"],
             amin=autoscale["autoscale_min"],
             amax=autoscale["autoscale_max"],
+            cap=autoscale["memory_worker_cap"],
+            child=autoscale["max_memory_per_child_mb"],
         )
     )
 
@@ -196,27 +244,35 @@ def main() -> None:
             ],
         )
     )
-    celery_cmd: List[str] = [
-        sys.executable,
-        "-m",
-        "celery",
-        "-A",
-        "app.core.celery_app.celery_app",
-        "worker",
-        "--loglevel=info",
-    ]
-
     if sys.platform.startswith("win"):
-        # Celery's prefork pool is unsupported on Windows; use solo to avoid
-        # spawn/unpack errors like "not enough values to unpack".
-        celery_cmd.extend(["-P", "solo"])
         print("[celery] Windows detected; using solo pool (autoscale disabled)")
-    else:
-        celery_cmd.append(
-            f"--autoscale={autoscale['autoscale_max']},{autoscale['autoscale_min']}"
-        )
 
-    processes.append(start_process("celery", celery_cmd))
+    if args.queues == "split":
+        processes.append(
+            start_process(
+                f"celery ({settings.celery_light_queue})",
+                celery_worker_cmd(
+                    autoscale,
+                    queues=settings.celery_light_queue,
+                    name=settings.celery_light_queue,
+                    prefetch=settings.celery_light_prefetch,
+                ),
+            )
+        )
+        processes.append(
+            start_process(
+                f"celery ({settings.celery_heavy_queue})",
+                celery_worker_cmd(
+                    autoscale,
+                    queues=settings.celery_heavy_queue,
+                    name=settings.celery_heavy_queue,
+                    concurrency=settings.celery_heavy_concurrency,
+                    prefetch=settings.celery_heavy_prefetch,
+                ),
+            )
+        )
+    else:
+        processes.append(start_process("celery", celery_worker_cmd(autoscale)))
 
     def handle_signal(signum, frame):
         print("\n[proc] stopping processes...")
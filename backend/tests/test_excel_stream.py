@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from app.tasks.ingestion import _excel_to_parquet_pandas, _excel_to_parquet_stream
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    # "Unnamed: 2" holds blanks and empty cells, "Unnamed: 3" only blanks,
+    # "Unnamed: 4" nothing at all
+    ws.append(["x", "y", None, None, None, "label"])
+    for i in range(1, 6):
+        ws.append([i, i / 4, " " if i % 2 else None, " ", None, f"row {i}"])
+    path = tmp_path / "sheet.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+def test_stream_matches_pandas_reader(workbook, tmp_path):
+    expected = _excel_to_parquet_pandas(workbook, str(tmp_path / "pandas.parquet"), "file", None)
+    streamed = _excel_to_parquet_stream(workbook, str(tmp_path / "stream.parquet"), "file", None)
+
+    assert streamed[0] == expected[0] == ["x", "y", "Unnamed: 2", "label"]
+    assert streamed[1] == expected[1] == 5
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(tmp_path / "stream.parquet"),
+        pd.read_parquet(tmp_path / "pandas.parquet"),
+        check_dtype=False,
+    )
+
+
+def test_stream_sample_rows_use_stored_types(workbook, tmp_path):
+    _, _, sample_rows, _ = _excel_to_parquet_stream(workbook, str(tmp_path / "stream.parquet"), "file", None)
+
+    assert len(sample_rows) == 5
+    assert sample_rows[0] == {"x": 1.0, "y": 0.25, "Unnamed: 2": " ", "label": "row 1"}
+    assert isinstance(sample_rows[0]["x"], float)
+    assert sample_rows[1]["Unnamed: 2"] is None
@@ -0,0 +1,83 @@
+import asyncio
+import io
+from types import SimpleNamespace
+
+from fastapi import UploadFile
+
+from app.routers import ingestion as router
+
+
+class FakeMinio:
+    def bucket_exists(self, bucket):
+        return True
+
+    def put_object(self, bucket_name, object_name, data, **kwargs):
+        if object_name.endswith("_bad.csv"):
+            raise OSError("connection reset")
+
+
+class FakeJobs:
+    def __init__(self):
+        self.created = []
+        self.updates = []
+
+    async def create_job(self, **fields):
+        self.created.append(fields)
+        return f"job-{len(self.created)}"
+
+    async def update_job(self, job_id, **fields):
+        self.updates.append((job_id, fields))
+
+
+class FakeBatches:
+    job_ids = None
+
+    async def create_batch(self, *args):
+        pass
+
+    async def set_job_ids(self, batch_id, job_ids):
+        self.job_ids = job_ids
+
+
+async def _project(project_id, user):
+    return {"project_name": "Demo"}
+
+
+def _upload(name: str) -> UploadFile:
+    data = b"a,b\n1,2\n"
+    return UploadFile(io.BytesIO(data), filename=name, size=len(data))
+
+
+def test_failed_upload_is_counted_and_batch_keeps_other_jobs(monkeypatch):
+    recorded = []
+    jobs, batches = FakeJobs(), FakeBatches()
+    monkeypatch.setattr(router, "_ensure_project_member", _project)
+    monkeypatch.setattr(router, "get_minio_client", FakeMinio)
+    monkeypatch.setattr(router, "get_sync_redis", lambda: None)
+    monkeypatch.setattr(router, "init_batch_progress", lambda *args: None)
+    monkeypatch.setattr(
+        router, "record_batch_job", lambda redis, batch_id, size, succeeded: recorded.append(succeeded)
+    )
+    monkeypatch.setattr(router, "describe_autoscale", lambda: {})
+    monkeypatch.setattr(router, "repo", jobs)
+    monkeypatch.setattr(router, "batches", batches)
+
+    response = asyncio.run(
+        router.start_ingestion_batch(
+            "project-1",
+            files=[_upload("good.csv"), _upload("bad.csv")],
+            dataset_type="flight",
+            tag_name="run",
+            header_mode="file",
+            custom_headers=None,
+            manifest=None,
+            precision=None,
+            user=SimpleNamespace(email="user@example.com"),
+        )
+    )
+
+    # one finished job per file, so finalize_ingestion_batch still runs
+    assert sorted(recorded) == [False, True]
+    assert batches.job_ids == ["job-1"]
+    assert [job.filename for job in response.jobs] == ["good.csv"]
+    assert [(f.filename, f.error) for f in response.failed] == [("bad.csv", "connection reset")]
@@ -0,0 +1,140 @@
+import copy
+import io
+from types import SimpleNamespace
+
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import pytest
+
+from app.core import minio_streams
+from app.core.config import settings
+from app.tasks import ingestion
+
+JOB_ID = "0" * 24
+
+
+class FakeMinio:
+    def __init__(self, objects):
+        self.objects = dict(objects)
+        self.uploads = {}
+        self.part_uploads = []
+
+    def stat_object(self, bucket_name, object_name):
+        return SimpleNamespace(size=len(self.objects[object_name]))
+
+    def get_object(self, bucket_name, object_name, offset=0, length=0):
+        data = self.objects[object_name]
+        return io.BytesIO(data[offset : offset + length] if length else data[offset:])
+
+    def put_object(self, bucket_name, object_name, data, length, **kwargs):
+        self.objects[object_name] = data.read(length)
+
+    def remove_object(self, bucket_name, object_name):
+        self.objects.pop(object_name, None)
+
+    def _create_multipart_upload(self, bucket_name, object_name, headers):
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return upload_id
+
+    def _upload_part(self, bucket_name, object_name, data, headers, upload_id, part_number):
+        self.uploads[upload_id][part_number] = data
+        self.part_uploads.append(part_number)
+        return f"etag-{part_number}"
+
+    def _complete_multipart_upload(self, bucket_name, object_name, upload_id, parts):
+        received = self.uploads.pop(upload_id)
+        self.objects[object_name] = b"".join(received[part.part_number] for part in parts)
+
+    def _abort_multipart_upload(self, bucket_name, object_name, upload_id):
+        self.uploads.pop(upload_id, None)
+
+
+class FakeJobs:
+    checkpoint = None
+
+    def update_one(self, query, update):
+        if "$set" in update:
+            self.checkpoint = copy.deepcopy(update["$set"]["checkpoint"])
+        else:
+            self.checkpoint = None
+
+
+class WorkerLost(Exception):
+    pass
+
+
+class DyingCheckpoint(ingestion._IngestCheckpoint):
+    # commits the initial state and the first segment, then the worker dies
+    commits_left = 2
+
+    def commit(self, **fields):
+        if not self.commits_left:
+            raise WorkerLost()
+        self.commits_left -= 1
+        super().commit(**fields)
+
+
+@pytest.fixture
+def small_segments(monkeypatch):
+    monkeypatch.setattr(settings, "ingestion_checkpoint_bytes", 20_000)
+    monkeypatch.setattr(settings, "ingestion_parallel_range_bytes", 8_000)
+    monkeypatch.setattr(minio_streams, "MIN_PART_SIZE", 1)
+    monkeypatch.setattr(ingestion, "_publish", lambda *args: None)
+
+
+def _ingest(minio, checkpoint, size):
+    return ingestion._csv_to_parquet_checkpointed(
+        minio, "bucket", "raw.csv", "out.parquet", size, "file", None, checkpoint
+    )
+
+
+def test_resumed_ingest_uploads_only_the_missing_parts(small_segments):
+    data = b"t,v,label\n" + b"".join(f"{i},{i * 0.25},row{i % 7}\n".encode() for i in range(6000))
+    minio = FakeMinio({"raw.csv": data})
+    db = SimpleNamespace(ingestion_jobs=FakeJobs())
+
+    with pytest.raises(WorkerLost):
+        _ingest(minio, DyingCheckpoint(db, JOB_ID), len(data))
+    assert "out.parquet" not in minio.objects
+    uploaded_before = len(minio.part_uploads)
+
+    columns, rows, sample_rows, stats = _ingest(
+        minio, ingestion._IngestCheckpoint(db, JOB_ID, db.ingestion_jobs.checkpoint), len(data)
+    )
+
+    # the first segment's part survived the crash and was not uploaded again
+    assert minio.part_uploads.count(1) == 1
+    assert 1 not in minio.part_uploads[uploaded_before:]
+    assert not minio.uploads
+    assert columns == ["t", "v", "label"]
+    assert rows == 6000
+    assert sample_rows[0] == {"t": 0, "v": 0.0, "label": "row0"}
+    assert stats["t"]["max"] == 5999
+
+    result = pq.ParquetFile(io.BytesIO(minio.objects["out.parquet"]))
+    assert result.metadata.num_row_groups > 1
+    assert result.read().to_pydict() == pacsv.read_csv(io.BytesIO(data)).to_pydict()
+
+
+def test_segments_share_the_memory_budget_and_worker_count(small_segments, monkeypatch):
+    data = b"t,v\n" + b"".join(f"{i},{i * 0.5}\n".encode() for i in range(3000))
+    minio = FakeMinio({"raw.csv": data})
+    db = SimpleNamespace(ingestion_jobs=FakeJobs())
+    workers = []
+    parse_ranges = ingestion._csv_parse_ranges
+
+    def spy(read_range, ranges, probe, workers_arg=None):
+        workers.append(workers_arg)
+        return parse_ranges(read_range, ranges, probe, workers_arg)
+
+    monkeypatch.setattr(settings, "ingestion_parallel_workers", 3)
+    monkeypatch.setattr(ingestion, "_csv_parse_ranges", spy)
+    layout = ingestion.ParquetLayout()
+    ingestion._csv_to_parquet_checkpointed(
+        minio, "bucket", "raw.csv", "out.parquet", len(data), "file", None,
+        ingestion._IngestCheckpoint(db, JOB_ID), layout,
+    )
+
+    assert workers and set(workers) == {3}
+    assert layout.memory.chosen["parallel_range_bytes"]
@@ -0,0 +1,28 @@
+import json
+
+import pyarrow as pa
+import pytest
+
+from app.tasks.stats import StatsAccumulator
+
+
+def test_infinite_values_give_json_safe_stats():
+    acc = StatsAccumulator()
+    acc.update(pa.table({"x": [1.0, float("inf"), 2.0], "y": [1.0, 2.0, 3.0]}))
+    stats = acc.to_dict()
+
+    assert stats["x"]["min"] == 1.0
+    assert stats["x"]["max"] is None
+    assert stats["x"]["mean"] is None
+    assert stats["x"]["variance"] is None
+    assert stats["y"] == {
+        "count": 3,
+        "null_count": 0,
+        "min": 1.0,
+        "max": 3.0,
+        "mean": 2.0,
+        "variance": pytest.approx(2 / 3),
+        "monotonic_increasing": True,
+        "monotonic_decreasing": False,
+    }
+    json.dumps(stats, allow_nan=False)
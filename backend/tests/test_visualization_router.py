@@ -0,0 +1,106 @@
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.routers import visualizations as router
+from app.tasks.visualization import OVERVIEW_BINS
+
+LEVELS = [64, 256, 1024, 4096]
+
+
+class FakeObject(io.BytesIO):
+    def release_conn(self):
+        pass
+
+
+class FakeMinio:
+    def bucket_exists(self, bucket):
+        return True
+
+    def presigned_get_object(self, bucket_name, object_name, expires):
+        return f"http://minio/{object_name}"
+
+    def get_object(self, bucket, object_name):
+        bins = int(object_name.rsplit("_", 1)[1].split(".")[0])
+        buffer = io.BytesIO()
+        pd.DataFrame({"time": range(bins), "count": 1, "y_mean": 0.0, "y_min": 0.0, "y_max": 0.0}).to_parquet(
+            buffer, index=False
+        )
+        return FakeObject(buffer.getvalue())
+
+
+class FakeRepo:
+    async def get(self, viz_id):
+        return {
+            "project_id": "project-1",
+            "x_axis": "time",
+            "series": [{"job_id": "job-1", "y_axis": "alt", "label": "alt"}],
+            "tiles": [
+                {
+                    "series": {"y_axis": "alt"},
+                    "tiles": [{"level": bins, "object_name": f"series_1/level_{bins}.parquet"} for bins in LEVELS],
+                }
+            ],
+        }
+
+
+async def _member(project_id, user):
+    return None
+
+
+def test_tiles_default_to_the_overview_level(monkeypatch):
+    monkeypatch.setattr(router, "repo", FakeRepo())
+    monkeypatch.setattr(router, "_ensure_member", _member)
+    monkeypatch.setattr(router, "get_minio_client", FakeMinio)
+
+    result = asyncio.run(
+        router.get_visualization_tile(
+            "viz-1", user=SimpleNamespace(email="user@example.com"), series=0, level=None, x_min=None, x_max=None
+        )
+    )
+
+    assert result["level"] == OVERVIEW_BINS == 256
+    assert result["rows"] == 256
+
+
+class ZoomMinio:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def stat_object(self, bucket_name, object_name):
+        return SimpleNamespace(size=len(self.data), etag="etag-1")
+
+    def get_object(self, bucket_name, object_name, offset=0, length=0):
+        return FakeObject(self.data[offset : offset + length] if length else self.data[offset:])
+
+
+class FakeIngestions:
+    async def get_job(self, job_id):
+        return {"_id": job_id, "processed_key": "processed/job-1.parquet"}
+
+
+@pytest.mark.parametrize("bins, mode", [(1000, "points"), (10, "bins")])
+def test_zoom_drops_non_finite_values(monkeypatch, bins, mode):
+    y = np.arange(100, dtype=np.float64)
+    y[[3, 40, 77]] = [np.inf, -np.inf, np.nan]
+    buffer = io.BytesIO()
+    pd.DataFrame({"time": np.arange(100, dtype=np.float64), "alt": y}).to_parquet(buffer, index=False)
+    monkeypatch.setattr(router, "repo", FakeRepo())
+    monkeypatch.setattr(router, "ingestions", FakeIngestions())
+    monkeypatch.setattr(router, "_ensure_member", _member)
+    monkeypatch.setattr(router, "get_minio_client", lambda: ZoomMinio(buffer.getvalue()))
+
+    result = asyncio.run(
+        router.get_visualization_zoom(
+            "viz-1", user=SimpleNamespace(email="user@example.com"), series=0, x_min=0.0, x_max=99.0, bins=bins
+        )
+    )
+
+    assert result["mode"] == mode
+    assert result["points"] == 97
+    json.dumps(result, allow_nan=False)
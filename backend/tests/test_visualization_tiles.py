@@ -0,0 +1,94 @@
+import io
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.config import settings
+from app.tasks.visualization import DatasetObject, GrowingLevelAccumulator, _materialize_tiles
+
+
+class FakeObject(io.BytesIO):
+    def release_conn(self):
+        pass
+
+
+class FakeMinio:
+    def __init__(self, objects):
+        self.objects = dict(objects)
+
+    def stat_object(self, bucket_name, object_name):
+        return SimpleNamespace(size=len(self.objects[object_name]))
+
+    def get_object(self, bucket_name, object_name, offset=0, length=0):
+        data = self.objects[object_name]
+        return FakeObject(data[offset : offset + length] if length else data[offset:])
+
+    def put_object(self, bucket_name, object_name, data, length, **kwargs):
+        self.objects[object_name] = data.read(length)
+
+
+def _parquet(columns: dict, row_group_size: int) -> bytes:
+    buffer = io.BytesIO()
+    pq.write_table(pa.table(columns), buffer, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+
+def _tiles(monkeypatch, data: bytes, targets: dict, workers: int = 1):
+    monkeypatch.setattr(settings, "visualization_scan_workers", workers)
+    minio = FakeMinio({"data.parquet": data})
+    source = DatasetObject(minio, "bucket", "data.parquet", ".parquet")
+    results = _materialize_tiles(minio, "bucket", source, "x", targets, levels=(16, 64))
+    frames = {name: pd.read_parquet(io.BytesIO(blob)) for name, blob in minio.objects.items() if name != "data.parquet"}
+    return results, frames
+
+
+def test_growing_level_fills_every_bin_for_uniform_x():
+    x = np.linspace(0.0, 1.0, 64 * 100)
+    y = np.ones_like(x)
+    acc = GrowingLevelAccumulator(64)
+    acc.ingest(x, y)
+
+    assert acc.edges[0] == 0.0 and acc.edges[-1] == 1.0
+    assert np.count_nonzero(acc.counts) == 64
+    assert acc.counts.sum() == len(x)
+
+
+def test_parallel_scan_matches_serial_scan(monkeypatch):
+    rng = np.random.default_rng(0)
+    n = 10_000
+    # whole-number y keeps sums exact whatever order the threads add them in
+    a = rng.integers(-50, 50, n).astype(np.float64)
+    a[rng.random(n) < 0.1] = np.nan
+    data = _parquet(
+        {"x": rng.uniform(0, 100, n), "a": a, "b": rng.integers(0, 9, n).astype(np.float64)}, row_group_size=1_000
+    )
+    targets = {"a": "series_a", "b": "series_b"}
+
+    serial, serial_tiles = _tiles(monkeypatch, data, targets, workers=1)
+    parallel, parallel_tiles = _tiles(monkeypatch, data, targets, workers=4)
+
+    assert serial["a"][2]["scan_workers"] == 1
+    assert parallel["a"][2]["scan_workers"] == 4
+    assert parallel["a"][2]["memory"]["reserved_bytes"] == 4 * 2 * 64 * 32
+    assert serial_tiles.keys() == parallel_tiles.keys()
+    for name, frame in serial_tiles.items():
+        pd.testing.assert_frame_equal(parallel_tiles[name], frame, check_exact=True)
+
+
+def test_grown_bounds_write_empty_tiles_for_an_all_nan_column(monkeypatch):
+    monkeypatch.setattr(settings, "visualization_bounds_fallback", "grow")
+    csv = "x,a,empty\n" + "".join(f"{i},{i % 5},\n" for i in range(200))
+    minio = FakeMinio({"data.csv": csv.encode()})
+    source = DatasetObject(minio, "bucket", "data.csv", ".csv")
+
+    results = _materialize_tiles(minio, "bucket", source, "x", {"a": "series_a", "empty": "series_empty"}, levels=(16, 64))
+
+    _, tiles, stats = results["empty"]
+    assert stats["bounds_source"] == "grown"
+    assert (stats["x_min"], stats["x_max"]) == (0.0, 199.0)
+    assert [tile["rows"] for tile in tiles] == [0, 0]
+    assert all(len(pd.read_parquet(io.BytesIO(minio.objects[tile["object_name"]]))) == 0 for tile in tiles)
+    assert [tile["rows"] for tile in results["a"][1]] == [16, 64]
@@ -0,0 +1,29 @@
+import numpy as np
+
+from app.tasks.ingestion import _extract_numbers, _wind_block_to_array
+
+
+def _per_line(lines, ncols):
+    # the regex parser the wind ingest was built on
+    out = np.full((len(lines), ncols), np.nan)
+    for row, line in enumerate(lines):
+        nums = _extract_numbers(line)[:ncols]
+        out[row, : len(nums)] = nums
+    return out
+
+
+def test_plain_numeric_block():
+    lines = ["1 2.5 -3e-2", "+4 .5 6."]
+    np.testing.assert_allclose(_wind_block_to_array(lines, 3), [[1, 2.5, -0.03], [4, 0.5, 6]])
+
+
+def test_inf_and_nan_tokens_are_missing_values():
+    lines = ["1 inf", "2 nan", "3 -inf"]
+    result = _wind_block_to_array(lines, 2)
+    np.testing.assert_array_equal(result, [[1, np.nan], [2, np.nan], [3, np.nan]])
+    np.testing.assert_array_equal(result, _per_line(lines, 2))
+
+
+def test_malformed_numbers_match_the_regex_parser():
+    lines = ["1 2", "3 4.5.6", "7 1e", "-- 8"]
+    np.testing.assert_array_equal(_wind_block_to_array(lines, 2), _per_line(lines, 2))
@@ -31,8 +31,9 @@ export const ingestionApi = {
 
     if (options.headerMode) form.append('header_mode', options.headerMode)
     if (options.customHeaders?.length) form.append('custom_headers', JSON.stringify(options.customHeaders))
+    if (options.precision) form.append('precision', options.precision) // off | int | float32
 
-    // manifest = array aligned with files order: [{ visualize: true/false }]
+    // manifest = array aligned with files order: [{ visualize: true/false, precision? }]
     form.append('manifest', JSON.stringify(options.manifest || files.map(() => ({ visualize: false }))))
 
     const { data } = await axiosClient.post(`/api/ingestion/${projectId}/batch`, form, {
@@ -44,6 +45,55 @@ export const ingestionApi = {
     return data
   },
 
+  // Direct-to-MinIO multipart upload: init -> PUT parts to presigned URLs -> complete
+  initUpload: async (projectId, payload) => {
+    const { data } = await axiosClient.post(`/api/ingestion/${projectId}/uploads/init`, payload)
+    return data // { upload_id, storage_key, part_size, parts: [{ part_number, url }], expires_in }
+  },
+  completeUpload: async (projectId, uploadId) => {
+    const { data } = await axiosClient.post(`/api/ingestion/${projectId}/uploads/${uploadId}/complete`)
+    return data // same shape as one job of startBatch
+  },
+  abortUpload: async (projectId, uploadId) => {
+    await axiosClient.delete(`/api/ingestion/${projectId}/uploads/${uploadId}`)
+  },
+  uploadDirect: async (projectId, file, options = {}) => {
+    const init = await ingestionApi.initUpload(projectId, {
+      filename: file.name,
+      size_bytes: file.size,
+      content_type: file.type || null,
+      dataset_type: options.datasetType,
+      tag_name: options.tagName,
+      header_mode: options.headerMode || 'file',
+      custom_headers: options.customHeaders?.length ? options.customHeaders : null,
+      visualize: Boolean(options.visualize),
+      precision: options.precision || null,
+    })
+
+    let next = 0
+    let loaded = 0
+    const uploadParts = async () => {
+      while (next < init.parts.length) {
+        const part = init.parts[next++]
+        const start = (part.part_number - 1) * init.part_size
+        const blob = file.slice(start, start + init.part_size)
+        const res = await fetch(part.url, { method: 'PUT', body: blob })
+        if (!res.ok) throw new Error(`Upload of part ${part.part_number} failed (${res.status})`)
+        loaded += blob.size
+        options.onUploadProgress?.({ loaded, total: file.size })
+      }
+    }
+
+    const concurrency = Math.min(options.concurrency || 4, init.parts.length)
+    try {
+      await Promise.all(Array.from({ length: concurrency }, uploadParts))
+    } catch (err) {
+      await ingestionApi.abortUpload(projectId, init.upload_id).catch(() => {})
+      throw err
+    }
+    return ingestionApi.completeUpload(projectId, init.upload_id)
+  },
+
   list: async (projectId) => {
     const { data } = await axiosClient.get(`/api/ingestion/project/${projectId}`)
     return data
@@ -52,6 +102,10 @@ export const ingestionApi = {
     const { data } = await axiosClient.get(`/api/ingestion/jobs/${jobId}/status`)
     return data
   },
+  batchStatus: async (batchId) => {
+    const { data } = await axiosClient.get(`/api/ingestion/batches/${batchId}`)
+    return data
+  },
   detail: async (jobId) => {
     const { data } = await axiosClient.get(`/api/ingestion/jobs/${jobId}`)
     return data